@@ -1,6 +1,7 @@
 # -*- mode: python ; coding: utf-8 -*-
 
 from pathlib import Path
+import json
 import os
 import sys
 from PyInstaller.utils.hooks import copy_metadata
@@ -25,6 +26,21 @@ datas = [
     (str(BASE_DIR / "openapi.json"), "."),
 ]
 
+# 功能清单：运行时据此挂载路由、注册模型（桌面版没有源码目录，无法扫描）
+FEATURE_MANIFEST = BASE_DIR / "src" / "features" / "manifest.json"
+if not FEATURE_MANIFEST.exists():
+    print("Error: Feature manifest not found. Please run 'pnpm features:manifest' first.")
+    sys.exit(1)
+datas.append((str(FEATURE_MANIFEST), "src/features"))
+
+# 功能模块的路由与模型在运行时按清单动态导入，需要显式加入隐藏导入
+feature_modules = [
+    module
+    for feature in json.loads(FEATURE_MANIFEST.read_text(encoding="utf-8"))["features"]
+    for module in (feature["router"], feature["models"])
+    if module
+]
+
 # 修复: 显式复制 tortoise-orm 的元数据，解决 importlib.metadata.PackageNotFoundError
 datas += copy_metadata("tortoise-orm")
 
@@ -40,6 +56,8 @@ else:
 
 # 隐藏导入：Tortoise ORM 和其他动态加载的库可能需要
 hiddenimports = [
+    # server.py 以导入字符串加载应用（多进程模式下 worker 需要重新导入）
+    "src.backend.main",
     "tortoise.backends.sqlite",
     "uvicorn.logging",
     "uvicorn.loops",
@@ -51,9 +69,6 @@ hiddenimports = [
     "uvicorn.protocols.websockets.auto",
     "uvicorn.lifespan",
     "uvicorn.lifespan.on",
-    "src.features.user.backend.models",
-    "src.features.dashboard.backend.models",
-    "src.features.monitor.backend.models",
     # 手动添加 tortoise 模块依赖
     "tortoise.backends.asyncpg",
     "tortoise.backends.mysql",
@@ -65,6 +80,7 @@ hiddenimports = [
     "aerich.ddl.sqlite",
     "aerich.ddl.mysql",
     "aerich.ddl.postgres",
+    *feature_modules,
 ]
 
 a = Analysis(
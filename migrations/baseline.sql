@@ -0,0 +1,29 @@
+CREATE TABLE "users" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL /* 用户ID */,
+    "username" VARCHAR(50) NOT NULL UNIQUE /* 用户名 */,
+    "hashed_password" VARCHAR(128) NOT NULL /* 加密后的密码 */,
+    "email" VARCHAR(100) NOT NULL UNIQUE /* 邮箱 */,
+    "nickname" VARCHAR(50) /* 昵称 */,
+    "role" VARCHAR(20) NOT NULL DEFAULT 'user' /* 角色 */,
+    "is_active" INT NOT NULL DEFAULT 1 /* 是否激活 */,
+    "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP /* 创建时间 */,
+    "updated_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP /* 更新时间 */
+, "last_login_at" TIMESTAMP /* 最后登录时间 */);
+CREATE TABLE "aerich" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "version" VARCHAR(255) NOT NULL,
+    "app" VARCHAR(100) NOT NULL,
+    "content" JSON NOT NULL
+);
+CREATE INDEX "idx_users_is_acti_7a996a" ON "users" ("is_active", "id");
+CREATE INDEX "idx_users_role_c06e20" ON "users" ("role", "is_active", "id");
+CREATE TABLE "login_audits" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL /* 记录ID */,
+    "user_id" INT /* 用户ID（登录失败且用户不存在时为空） */,
+    "username" VARCHAR(50) NOT NULL /* 登录使用的用户名 */,
+    "success" INT NOT NULL /* 是否登录成功 */,
+    "ip" VARCHAR(45) /* 客户端IP */,
+    "user_agent" VARCHAR(255) /* 客户端UA */,
+    "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP /* 登录时间 */
+);
+CREATE INDEX "idx_login_audit_user_id_accdfc" ON "login_audits" ("user_id", "created_at");
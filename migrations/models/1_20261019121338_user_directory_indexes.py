@@ -0,0 +1,38 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE INDEX "idx_users_is_acti_7a996a" ON "users" ("is_active", "id");
+        CREATE INDEX "idx_users_role_c06e20" ON "users" ("role", "is_active", "id");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_users_role_c06e20";
+        DROP INDEX IF EXISTS "idx_users_is_acti_7a996a";"""
+
+
+MODELS_STATE = (
+    "eJzll21vmzAQx79KxKtO6ibiBkL3Lmk7LdPaTFu6TX0QMtgkqGAyMO2qqd99dw6EACGl0f"
+    "qw7Q2Cu//B+XfG9v3SwojxIHlzmvBYe9v5pQkacrgp2Xc7Gp3PCysaJHUCJUxBoSzUSWRM"
+    "XQlGjwYJBxPjiRv7c+lHAqUXad8g1kVqkr3+RWpZpoVxLHIh0BfTusSkpHuRGn3LQWEq/B"
+    "8pt2U05XKm0j2/BLMvGP/JE3w81+IIskJjYkMq/vXigWkgPK8bMXx+ZXs+D1hp9OAEl7Lb"
+    "8naubCMh3ykh5uzYbhSkoSjE81s5i8RS7QuJ1ikXPKaS4+tlnCIUkQZBBi/ntBhZIVkMaS"
+    "WGcY+mAaLF6M1kR4dVqlmMGwmsEGSWqMFO8YuvSbfX71l7Zs8CicpqaenfLYZacFgEKhon"
+    "E+1O+amkC4UqQcEQJ4a6r5E8mNF4PcrVmApQSL0KNMf32ERhCvZ01pJqSH/aARdTOYNHQ9"
+    "+A8Ovg88H7wecdQ3+F747g51n8UieZhygXUi6ozmgy48ye0yS5ieI107QZ7prQP8M4NxSQ"
+    "iwXgPsoGoTpcHddUlDlwN61ebulbencb7l1itQAPqkbyyldGz0PqBw8Bvgx47qm8r1ME6z"
+    "jbwdTbzGJQNcPUa/NY+O7VQ1eH1ZitkGbA/sjENc09A5jue/rLWBjyna8tzFz/dEuAWt21"
+    "dSytfUbgSvpkG5akDUvSzJLUWJYOCmWgwwi4UdFwEliNq4B1IPCxyC4XgtocJR4uqwSWUt"
+    "NzYaE12Z7TjvEGpsPx+CO+JEySH4EyjCYVuKfHwyNYExRzEPmSrx4aCtJuzJGFTWUd9SF4"
+    "pB/y9azLkRXYLAt9k988/bbWdeAKOmBueMB/3/B6LWc3jIyNRXCbVXZDJSaj46Mvk8Hxp1"
+    "I5DgeTI/Sovym8rVh3zMqfsHxJ59to8r6Dj52z8cmR4holchqrLxa6yZmGOdFURraIbmzK"
+    "Vnaj3JrjKpU7nbMty12OfGnlNk2vh4V29P+43Cp5bKm8q5WGAA0Oda9uaMzsmiciUZO27g"
+    "pJWLVQQaeqVsgWs8z61gGPfXemreloM8/upp6WFpr7mtp8RtTLfH+7+q+0n80MnrjlvOZx"
+    "gik94Bi0EvLMzVB7iuXTj2G0Of4YRvP5B33lbRl/jQdAzOR/J8BHaW/gi5KLNbvchy/jk4"
+    "YDTRFSAXkqYIDnzHflbifwE3n5MrFuoIijLu1ZObyd48H3KteDj+NhdTPCFwyB8bNuL3e/"
+    "ASetsvw="
+)
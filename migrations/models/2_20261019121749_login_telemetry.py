@@ -0,0 +1,53 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "login_audits" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL /* 记录ID */,
+    "user_id" INT /* 用户ID（登录失败且用户不存在时为空） */,
+    "username" VARCHAR(50) NOT NULL /* 登录使用的用户名 */,
+    "success" INT NOT NULL /* 是否登录成功 */,
+    "ip" VARCHAR(45) /* 客户端IP */,
+    "user_agent" VARCHAR(255) /* 客户端UA */,
+    "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP /* 登录时间 */
+) /* 登录审计表 */;
+CREATE INDEX IF NOT EXISTS "idx_login_audit_user_id_accdfc" ON "login_audits" ("user_id", "created_at");
+        ALTER TABLE "users" ADD "last_login_at" TIMESTAMP /* 最后登录时间 */;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "users" DROP COLUMN "last_login_at";
+        DROP TABLE IF EXISTS "login_audits";"""
+
+
+MODELS_STATE = (
+    "eJzlmW1vozgQgP9KlE89qbcCBwzct/TlbnPaNqtuenfatkIGmwSVQBbMdqtV//t5TAhvIS"
+    "W5bpO9fomS8Ywxz4zHM873/jyiLEjefYimfjhMqc/7v/W+90MyZ+LLmtHjXp8sFsUYCDhx"
+    "AqkegJ5NQFEOECfhMXFhTo8ECRMiyhI39hfcj0KwuE0NbDi3qe7puvh0iHqbmtmniU2Yg0"
+    "aumMQPp8+oO46Syz1PMW9TS1GJkHuuIeSqZYlPTJmYwVMHIHHQbYqRIeSW6norHRVnM1jw"
+    "8DT0v6TM5tGU8RmLxRJu7oTYDyn7xhL4edNPExbbPgV1N2aEM2oT3r8DvcW97fksoBWmma"
+    "qU2/xxIWUn/nQU8t+lLryzY7tRkM7DQn/xyGdRuDLwQ+mKKQtZDI8UMh6nADhMg2Dpj5x5"
+    "9haFSrb8kg1lHkkDcBNYr/NSgXd0VvfK0saNQvC2WFki33cKT/zVQmgwMJAywKauGYZuKq"
+    "bQlctrDhlP2csXcLKpJKLRH6PLCTw7EiGVxRsInqQN4SSzkk4pYJecUyXeirtk8TzznHAJ"
+    "+hLpinmuUkAvtsJz1A0dmRCkA2N0lod1ZQNYAwh9isR3jala2QIkCoVNoguJbki57mGQD8"
+    "TGMIhBikDv7E+kaoZmDrC2cuNKssl7uaeqnpHfG645nZG43Te5Tc05YqkdnNPYEf/JOyVP"
+    "aJ7h5fQNbNY8oWsK7Uh5Tr7ZAQunfCZ+6soGpH8Nr07fD6+OdOWX6q64XI4gOVSlnqSuy5"
+    "JkTQaKooCRcD33klUNuyPMXps7xgjStYZw1QcYqZCjkOV1Y70p2YzHH2CSeZJ8CbLsU0s9"
+    "l9cXJ+dXR6pkL5R8XslIpXS/2CbCM+2dYvslE484WVEevAZh3ujjLuGr6R3CV9NbwxeGmk"
+    "nDJgIE3zZtFFYHB/d6uAtcpHehK7Ra8cqxKt9SAdPgeyZGuD9n6xlXLWuM6dL0Xf5ln6k6"
+    "OwQt3dM6YhdvRsdh8LgMgw3UJ6OL80+T4cXHSu44G07OYQRJ6WNNeoRrDlpN0vt7NHnfg5"
+    "+9z+PLc8k1Svg0lk8s9Caf+7AmkvLIDqMHm9BSaZdLc1xPUJd696ViCQQOce8fSEztxkiE"
+    "ojbd5tAczesSEoqNR5dwYZnLluI6keV0o9WQ8o1NBuzm7t1F6RRu6yhKKpggFYol0+la/c"
+    "fi2ARdP7HFUvyv2Q/aF4o3TeFWTcFhdwTl2vQ1K8jNtf7+K8qXIHpIFeOMJDOR1xckSR6i"
+    "eE2YtsNdY7r/ql1HBKpEx8WSMsvr9UximIq6C3cVmR3AC61W8nKsip7NiR9sA3xlsO9Qth"
+    "QCYB1nN5hKlygWWu0wlUYch757v212KNvsvWzEeCCqF8PylMNIDPnJ1xVmrv96KUBm9/46"
+    "lqZFRQluIgPtVHp3YYnaWaIGy0qhsEVjXrF7xdZ8lQg2tObYc0WixXTgHFI7HpCE28t76q"
+    "2bnIbxC/Q5L5oiDEUpTrXdW56fpMXJwTR6nLfQ0upIBf8KvTff0lZuiBZ0R3dXLQ/N3Rh7"
+    "Gjga/oZ5s+6Wiz+QC4whi3131l9zhbEcOd50iUEKneduMfKIaLr5+fuJ/8t9QzuDV75j+M"
+    "riBJa0Rd1bMtlz99ud4o+/aYatsQXEpfrPCfCH9LPiiXzt/yB/fhpfthQ0hUkN5HUoXvCG"
+    "+i4/7gV+wu8OE+sGivDWlTMrh3d0MfynzvX0w/ikfhjBBCeC8V6Pl6d/AR+8OSQ="
+)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+SQLite 在线备份
+
+应用运行中也可以直接执行：使用 SQLite 在线备份 API 在一致的快照上逐步复制，
+不会阻塞应用的读写，也不会得到撕裂的副本。
+
+用法:
+    uv run python scripts/backup-db.py [--database ./data/db.sqlite3] [--output ./data/backups]
+                                       [--pages 1024] [--sleep 0.005] [--gzip] [--keep 7]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backend.config.settings import settings
+from src.backend.core.sqlite_backup import (
+    backup_sqlite,
+    get_sqlite_path,
+    gzip_file,
+    prune_snapshots,
+    snapshot_path,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite 在线备份")
+    parser.add_argument("--database", type=Path, help="源数据库文件（默认取 DATABASE_URL）")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path(settings.BACKUP_DIR),
+        help="快照目录",
+    )
+    parser.add_argument(
+        "--pages",
+        type=int,
+        default=settings.BACKUP_PAGES_PER_STEP,
+        help="每步复制的页数",
+    )
+    parser.add_argument(
+        "--sleep",
+        type=float,
+        default=settings.BACKUP_STEP_SLEEP,
+        help="步与步之间的休眠（秒）",
+    )
+    parser.add_argument("--gzip", action="store_true", help="完成后压缩为 .gz")
+    parser.add_argument(
+        "--keep",
+        type=int,
+        default=settings.BACKUP_RETENTION,
+        help="保留的快照份数（0 表示不清理）",
+    )
+    args = parser.parse_args()
+
+    source = args.database or get_sqlite_path()
+    if source is None:
+        print("❌ 当前 DATABASE_URL 不是 SQLite 文件数据库，请通过 --database 指定")
+        sys.exit(1)
+    if not source.exists():
+        print(f"❌ 数据库文件不存在: {source}")
+        sys.exit(1)
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    target = snapshot_path(args.output)
+
+    def progress(done: int, total: int) -> None:
+        percent = done / total * 100 if total else 100
+        print(f"\r💾 {done}/{total} 页 ({percent:5.1f}%)", end="", flush=True)
+
+    started = time.perf_counter()
+    backup_sqlite(source, target, pages=args.pages, sleep=args.sleep, progress=progress)
+    print()
+    if args.gzip:
+        target = gzip_file(target)
+
+    removed = prune_snapshots(args.output, args.keep)
+    size = target.stat().st_size / 1024 / 1024
+    print(f"✅ 已生成 {target} ({size:.1f} MiB, {time.perf_counter() - started:.2f}s)")
+    if removed:
+        print(f"🧹 已清理 {len(removed)} 份旧快照")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+响应压缩基准测试
+
+对典型的 API 负载（当前用户、用户目录分页、NDJSON 流式导出）分别用各编码与级别压缩，
+记录每次压缩的 CPU 耗时、压缩后大小与每毫秒 CPU 节省的字节数；
+再通过 CompressionMiddleware 直接驱动 ASGI 应用，对比开启压缩前后的 req/s。
+
+未安装 brotli / zstandard 时只测试 gzip（uv add brotli zstandard）。
+
+用法:
+    uv run python scripts/bench-compression.py [--seconds 2]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+
+from src.backend.core.compression import (
+    BrotliCodec,
+    Codec,
+    CompressionMiddleware,
+    GzipCodec,
+    ZstdCodec,
+    brotli,
+    zstandard,
+)
+
+ROLES = ("user", "editor", "admin")
+NDJSON_CHUNK_ROWS = 100
+
+
+def make_user(i: int, rng: random.Random) -> dict:
+    """与 UserResponse 字段一致的模拟用户"""
+    return {
+        "id": i,
+        "username": f"user{i:06d}",
+        "email": f"user{i:06d}@example.com",
+        "nickname": f"User {rng.randint(1, 99999)}",
+        "avatar": None,
+        "role": rng.choice(ROLES),
+        "is_active": rng.random() > 0.1,
+        "created_at": f"2026-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}T08:{rng.randint(10, 59)}:00",
+        "last_login_at": None,
+    }
+
+
+def payloads() -> dict[str, bytes | list[bytes]]:
+    rng = random.Random(42)
+    users = [make_user(i, rng) for i in range(1000)]
+    page = {"items": users[:50], "next_cursor": "eyJpZCI6NTB9", "has_more": True}
+    large_page = {"items": users[:500], "next_cursor": "eyJpZCI6NTAwfQ", "has_more": True}
+    rows = [json.dumps(user, ensure_ascii=False) + "\n" for user in users]
+    ndjson = [
+        "".join(rows[i : i + NDJSON_CHUNK_ROWS]).encode()
+        for i in range(0, len(rows), NDJSON_CHUNK_ROWS)
+    ]
+    return {
+        "/auth/me": json.dumps(users[0]).encode(),
+        "users page (50)": json.dumps(page).encode(),
+        "users page (500)": json.dumps(large_page).encode(),
+        "ndjson stream": ndjson,
+    }
+
+
+def codecs() -> list[tuple[str, Codec]]:
+    result: list[tuple[str, Codec]] = [(f"gzip-{level}", GzipCodec(level)) for level in (1, 6, 9)]
+    if brotli is not None:
+        result += [(f"br-{quality}", BrotliCodec(quality)) for quality in (4, 11)]
+    if zstandard is not None:
+        result += [(f"zstd-{level}", ZstdCodec(level)) for level in (3, 19)]
+    return result
+
+
+def compress_once(codec: Codec, payload: bytes | list[bytes]) -> int:
+    """压缩一次，返回压缩后字节数；列表按流式压缩（逐块 flush）"""
+    if isinstance(payload, bytes):
+        return len(codec.compress(payload))
+    stream = codec.stream()
+    size = sum(len(stream.compress(chunk)) for chunk in payload)
+    return size + len(stream.finish())
+
+
+def bench_codecs() -> None:
+    print(
+        f"{'payload':<18}{'codec':<10}{'bytes':>9}{'out':>9}{'ratio':>8}"
+        f"{'µs/op':>10}{'KiB saved/ms':>14}",
+    )
+    for name, payload in payloads().items():
+        size = len(payload) if isinstance(payload, bytes) else sum(map(len, payload))
+        for label, codec in codecs():
+            out = compress_once(codec, payload)
+            iterations = 0
+            started = time.perf_counter()
+            while time.perf_counter() - started < 0.3:
+                compress_once(codec, payload)
+                iterations += 1
+            per_op = (time.perf_counter() - started) / iterations
+            saved = (size - out) / 1024 / (per_op * 1000)
+            print(
+                f"{name:<18}{label:<10}{size:>9}{out:>9}{out / size:>8.2f}"
+                f"{per_op * 1e6:>10.0f}{saved:>14.0f}",
+            )
+        print()
+
+
+async def requests_per_second(app, seconds: float) -> float:
+    """直接驱动 ASGI 应用，丢弃响应体，返回 req/s"""
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "raw_path": b"/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"accept-encoding", b"gzip, br, zstd")],
+        "scheme": "http",
+        "server": ("bench", 80),
+        "http_version": "1.1",
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(_message):
+        return None
+
+    requests = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        await app(dict(scope), receive, send)
+        requests += 1
+    return requests / (time.perf_counter() - started)
+
+
+async def bench_middleware(seconds: float) -> None:
+    print(f"{'payload':<18}{'plain req/s':>14}{'compressed req/s':>18}")
+    for name, payload in payloads().items():
+        if not isinstance(payload, bytes):
+            continue
+
+        async def endpoint(_request, body=payload):
+            return Response(body, media_type="application/json")
+
+        plain = Starlette(routes=[Route("/", endpoint)])
+        compressed = CompressionMiddleware(plain, minimum_size=1024)
+        plain_rps = await requests_per_second(plain, seconds)
+        compressed_rps = await requests_per_second(compressed, seconds)
+        print(f"{name:<18}{plain_rps:>14.0f}{compressed_rps:>18.0f}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="响应压缩基准测试")
+    parser.add_argument("--seconds", type=float, default=2.0, help="每组中间件测试的时长")
+    args = parser.parse_args()
+
+    bench_codecs()
+    await bench_middleware(args.seconds)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
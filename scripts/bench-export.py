@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+流式导出基准测试
+
+分别在不同行数的用户表上完整消费一次流式导出（NDJSON / CSV，可选 gzip），
+记录吞吐与 Python 堆内存峰值（tracemalloc），用于确认内存占用与总行数无关。
+
+用法:
+    uv run python scripts/bench-export.py [--rows 1000 100000 500000] [--gzip]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tortoise import Tortoise
+from tortoise.transactions import in_transaction
+
+from src.backend.config.database import get_sqlite_pragmas
+from src.backend.core.export import stream_export
+from src.features.user.backend.bulk import EXPORT_FIELDS
+from src.features.user.backend.models import User
+
+SEED_CHUNK_SIZE = 10000
+ROLES = ("user", "user", "user", "editor", "admin")
+# 基准数据不需要真实密码，使用固定的哈希占位
+DUMMY_HASH = "$2b$10$" + "x" * 53
+
+
+async def seed(start: int, stop: int) -> None:
+    """批量写入 [start, stop) 区间的测试数据"""
+    table = User._meta.db_table  # noqa: SLF001
+    sql = (
+        f'INSERT INTO "{table}" ("username", "hashed_password", "email", "nickname", '
+        f'"role", "is_active", "created_at", "updated_at") '
+        f"VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+    )
+    rng = random.Random(start)
+    for chunk in range(start, stop, SEED_CHUNK_SIZE):
+        values = [
+            [
+                f"user{i:07d}",
+                DUMMY_HASH,
+                f"user{i:07d}@example.com",
+                f"User {i}",
+                rng.choice(ROLES),
+                int(rng.random() > 0.1),
+            ]
+            for i in range(chunk, min(chunk + SEED_CHUNK_SIZE, stop))
+        ]
+        async with in_transaction() as conn:
+            await conn.execute_many(sql, values)
+
+
+async def consume(fmt: str, compress: bool, trace: bool) -> tuple[int, float, int]:
+    """完整消费一次导出，返回 (字节数, 耗时秒, 内存峰值字节)"""
+    if trace:
+        tracemalloc.start()
+    started = time.perf_counter()
+    total = 0
+    async for data in stream_export(User, EXPORT_FIELDS, fmt, compress=compress):
+        total += len(data)
+    elapsed = time.perf_counter() - started
+    peak = 0
+    if trace:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return total, elapsed, peak
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="流式导出基准测试")
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[1000, 100_000, 500_000],
+        help="依次测试的表行数",
+    )
+    parser.add_argument("--gzip", action="store_true", help="同时测试 gzip 压缩")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        await Tortoise.init(
+            config={
+                "connections": {
+                    "default": {
+                        "engine": "tortoise.backends.sqlite",
+                        "credentials": {
+                            "file_path": str(Path(tmp) / "export.sqlite3"),
+                            **get_sqlite_pragmas("performance"),
+                        },
+                    },
+                },
+                "apps": {"models": {"models": ["src.features.user.backend.models"]}},
+            },
+        )
+        await Tortoise.generate_schemas()
+
+        variants = [(fmt, False) for fmt in ("ndjson", "csv")]
+        if args.gzip:
+            variants += [(fmt, True) for fmt in ("ndjson", "csv")]
+
+        print(
+            f"{'rows':>10}{'format':>14}{'MiB':>10}{'seconds':>10}"
+            f"{'rows/s':>12}{'peak KiB':>12}",
+        )
+        seeded = 0
+        for rows in sorted(args.rows):
+            await seed(seeded, rows)
+            seeded = rows
+            for fmt, compress in variants:
+                # tracemalloc 会显著拖慢执行，耗时与内存峰值分两次测量
+                size, elapsed, _ = await consume(fmt, compress, trace=False)
+                _, _, peak = await consume(fmt, compress, trace=True)
+                label = f"{fmt}{'+gzip' if compress else ''}"
+                print(
+                    f"{rows:>10}{label:>14}{size / 2**20:>10.1f}{elapsed:>10.2f}"
+                    f"{rows / elapsed:>12.0f}{peak / 1024:>12.0f}",
+                )
+
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+大文件下发基准测试
+
+在临时目录生成一个大文件，分别用 Starlette FileResponse（线程池逐块 read）与
+RangeFileResponse（线程中 pread 分块）下发整文件、单段 Range 与多段 Range，
+直接调用 ASGI 应用并丢弃响应体，只统计服务端的吞吐；再单独测量一次 Python 堆内存峰值
+（tracemalloc），确认内存占用与文件大小无关。
+
+uvicorn 目前没有声明 http.response.zerocopysend 扩展，因此这里测到的是 pread 路径；
+支持该扩展的服务器会直接 sendfile，文件内容不经过 Python。
+
+用法:
+    uv run python scripts/bench-file-delivery.py [--size-mb 512] [--repeat 3] [--concurrency 4]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from starlette.responses import FileResponse
+
+from src.backend.core.file_delivery import RangeFileResponse
+
+WRITE_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def build_file(path: Path, size: int) -> None:
+    """生成指定大小的测试文件（内容重复即可，不影响读取开销）"""
+    block = bytes(range(256)) * (WRITE_CHUNK_SIZE // 256)
+    with path.open("wb") as f:
+        written = 0
+        while written < size:
+            f.write(block[: size - written])
+            written += len(block)
+
+
+def scenarios(size: int) -> list[tuple[str, bytes | None]]:
+    """(名称, Range 头)"""
+    quarter = size // 4
+    parts = [(i * quarter, i * quarter + quarter // 2) for i in range(4)]
+    multi = ",".join(f"{start}-{end - 1}" for start, end in parts)
+    return [
+        ("full", None),
+        ("single range", f"bytes={quarter}-{quarter * 3 - 1}".encode()),
+        ("4 ranges", f"bytes={multi}".encode()),
+    ]
+
+
+async def deliver(response_class: type[FileResponse], path: Path, http_range: bytes | None) -> int:
+    """直接驱动一次 ASGI 响应，返回响应体字节数"""
+    headers = [(b"range", http_range)] if http_range else []
+    scope = {"type": "http", "method": "GET", "headers": headers, "extensions": {}}
+    sent = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal sent
+        if message["type"] == "http.response.body":
+            sent += len(message["body"])
+
+    await response_class(path)(scope, receive, send)
+    return sent
+
+
+async def measure(
+    response_class: type[FileResponse],
+    path: Path,
+    http_range: bytes | None,
+    repeat: int,
+    concurrency: int,
+) -> float:
+    """返回吞吐（MiB/s）"""
+    started = time.perf_counter()
+    total = 0
+    for _ in range(repeat):
+        sizes = await asyncio.gather(
+            *(deliver(response_class, path, http_range) for _ in range(concurrency)),
+        )
+        total += sum(sizes)
+    elapsed = time.perf_counter() - started
+    return total / elapsed / 2**20
+
+
+async def heap_peak(response_class: type[FileResponse], path: Path) -> int:
+    """下发一次整文件的 Python 堆内存峰值（字节）"""
+    tracemalloc.start()
+    await deliver(response_class, path, None)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="大文件下发基准测试")
+    parser.add_argument("--size-mb", type=int, default=512, help="测试文件大小（MiB）")
+    parser.add_argument("--repeat", type=int, default=3, help="每个场景的轮数")
+    parser.add_argument("--concurrency", type=int, default=4, help="每轮并发的下载数")
+    args = parser.parse_args()
+
+    implementations = (("FileResponse", FileResponse), ("RangeFileResponse", RangeFileResponse))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "artefact.bin"
+        size = args.size_mb * 2**20
+        build_file(path, size)
+
+        print(f"{'scenario':<16}{'implementation':<20}{'MiB/s':>10}")
+        for name, http_range in scenarios(size):
+            for label, response_class in implementations:
+                # 先完整读一遍，让两种实现都从页缓存读取
+                await deliver(response_class, path, http_range)
+                throughput = await measure(
+                    response_class,
+                    path,
+                    http_range,
+                    args.repeat,
+                    args.concurrency,
+                )
+                print(f"{name:<16}{label:<20}{throughput:>10.0f}")
+
+        print()
+        for label, response_class in implementations:
+            peak = await heap_peak(response_class, path)
+            print(f"{label:<20}heap peak {peak / 1024:>8.0f} KiB ({args.size_mb} MiB file)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
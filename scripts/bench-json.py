@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+JSON 响应编码基准测试
+
+对现有接口的响应模型（UserResponse、SystemInfoResponse、AppOverviewResponse、
+用户目录分页）与错误响应，比较标准库 json（Starlette JSONResponse）与
+src/backend/core/serialization.py（orjson / pydantic_core）：
+- 编码：每次编码的耗时与内存分配峰值（tracemalloc）
+- 端到端：以两种 default_response_class 构建同样的 FastAPI 应用，直接驱动 ASGI，对比 req/s
+
+用法:
+    uv run python scripts/bench-json.py [--seconds 2]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from src.backend.core.exceptions import APIError, ResourceNotFoundError
+from src.backend.core.serialization import FastJSONResponse, orjson
+from src.features.dashboard.backend.schemas import (
+    AppOverviewResponse,
+    SystemInfoResponse,
+    SystemResource,
+)
+from src.features.user.backend.schemas import UserDirectoryPage, UserResponse
+
+ROLES = ("user", "editor", "admin")
+
+
+def make_user(i: int, rng: random.Random) -> dict[str, Any]:
+    """用户目录分页中的一行（与 /auth/users 默认字段一致）"""
+    return {
+        "id": i,
+        "username": f"user{i:06d}",
+        "email": f"user{i:06d}@example.com",
+        "nickname": f"用户 {rng.randint(1, 99999)}",
+        "role": rng.choice(ROLES),
+        "is_active": rng.random() > 0.1,
+        "created_at": f"2026-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}T08:{rng.randint(10, 59)}:00",
+    }
+
+
+def responses() -> dict[str, BaseModel]:
+    rng = random.Random(42)
+    resource = SystemResource(name="CPU", usage=12.5, total="8 核", used="1 核")
+    return {
+        "/auth/me": UserResponse(id=1, username="admin", email="admin@example.com", nickname="管理员", role="admin"),
+        "/dashboard/overview": AppOverviewResponse(
+            api_count=27,
+            feature_count=4,
+            db_status="Connected",
+            environment="production",
+        ),
+        "/dashboard/system": SystemInfoResponse(
+            cpu=resource,
+            memory=resource.model_copy(update={"name": "内存"}),
+            disk=resource.model_copy(update={"name": "磁盘"}),
+            uptime="3 天 4 小时",
+            uptime_seconds=273600.0,
+            version="0.1.0",
+            os="Linux 6.1",
+        ),
+        "/auth/users/50": UserDirectoryPage(
+            items=[make_user(i, rng) for i in range(50)],
+            next_cursor="eyJpZCI6NTB9",
+        ),
+        "/auth/users/500": UserDirectoryPage(
+            items=[make_user(i, rng) for i in range(500)],
+            next_cursor="eyJpZCI6NTAwfQ",
+        ),
+    }
+
+
+def measure(render: Callable[[], bytes], seconds: float = 0.3) -> tuple[float, int]:
+    """返回 (每次耗时 µs, 单次编码的内存分配峰值字节)"""
+    render()
+    iterations = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        render()
+        iterations += 1
+    per_op = (time.perf_counter() - started) / iterations
+
+    # 峰值包括编码过程中的中间对象（标准库 json 先拼接 str 再编码为 bytes）
+    tracemalloc.start()
+    render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return per_op * 1e6, peak
+
+
+def bench_encoding() -> None:
+    """FastAPI 先把响应模型转为 JSON 兼容的 Python 对象（dump_python），再由响应类编码为字节"""
+    print(f"编码器: {'orjson' if orjson is not None else 'pydantic_core.to_json'}（对比标准库 json）\n")
+    print(f"{'payload':<22}{'encoder':<10}{'µs/op':>9}{'peak KiB':>10}{'speedup':>9}")
+    stdlib = JSONResponse(None)
+    fast = FastJSONResponse(None)
+    for name, model in responses().items():
+        content = TypeAdapter(type(model)).dump_python(model, mode="json")
+        stdlib_us, stdlib_peak = measure(lambda content=content: stdlib.render(content))
+        fast_us, fast_peak = measure(lambda content=content: fast.render(content))
+        assert stdlib.render(content) == fast.render(content), name
+        print(f"{name:<22}{'json':<10}{stdlib_us:>9.1f}{stdlib_peak / 1024:>10.1f}")
+        print(
+            f"{'':<22}{'fast':<10}{fast_us:>9.1f}{fast_peak / 1024:>10.1f}"
+            f"{stdlib_us / fast_us:>8.1f}x",
+        )
+    print()
+
+
+def make_endpoint(model: BaseModel) -> Callable[[], Any]:
+    async def endpoint():
+        return model
+
+    return endpoint
+
+
+def build_app(response_class: type[JSONResponse]) -> FastAPI:
+    """与真实接口同样的响应模型，数据预先构造好，只测量校验 + 序列化 + 编码"""
+    app = FastAPI(default_response_class=response_class)
+    for path, model in responses().items():
+        app.add_api_route(path, make_endpoint(model), response_model=type(model))
+
+    async def not_found():
+        raise ResourceNotFoundError("用户")
+
+    async def api_error_handler(_request, exc: APIError):
+        return response_class(status_code=exc.status_code, content=exc.detail)
+
+    app.add_api_route("/error", not_found)
+    app.add_exception_handler(APIError, api_error_handler)
+    return app
+
+
+async def requests_per_second(app: FastAPI, path: str, seconds: float) -> float:
+    """直接驱动 ASGI 应用，丢弃响应体，返回 req/s"""
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "scheme": "http",
+        "server": ("bench", 80),
+        "http_version": "1.1",
+        "app": app,
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(_message):
+        return None
+
+    requests = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        await app(dict(scope), receive, send)
+        requests += 1
+    return requests / (time.perf_counter() - started)
+
+
+async def bench_endpoints(seconds: float) -> None:
+    stdlib_app = build_app(JSONResponse)
+    fast_app = build_app(FastJSONResponse)
+    paths = [*responses(), "/error"]
+    print(f"{'endpoint':<22}{'json req/s':>12}{'fast req/s':>12}{'change':>9}")
+    for path in paths:
+        stdlib_rps = await requests_per_second(stdlib_app, path, seconds)
+        fast_rps = await requests_per_second(fast_app, path, seconds)
+        print(f"{path:<22}{stdlib_rps:>12.0f}{fast_rps:>12.0f}{(fast_rps / stdlib_rps - 1) * 100:>+8.0f}%")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="JSON 响应编码基准测试")
+    parser.add_argument("--seconds", type=float, default=2.0, help="每个接口的端到端测试时长")
+    args = parser.parse_args()
+
+    bench_encoding()
+    await bench_endpoints(args.seconds)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+SQLite 调优配置基准测试
+
+对比不同 PRAGMA 配置下通过 Tortoise-ORM 的并发读写吞吐：
+- sqlite-default:   回滚日志 + synchronous=FULL（SQLite 原生默认）
+- tortoise-default: Tortoise 默认（WAL + synchronous=FULL）
+- performance:      SQLITE_* 配置项组成的调优配置
+
+用法:
+    uv run python scripts/bench-sqlite.py [--writes 2000] [--readers 4] [--writers 4]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tortoise import Tortoise, fields
+from tortoise.models import Model
+
+from src.backend.config.database import get_sqlite_pragmas
+
+
+class BenchRow(Model):
+    """基准测试用表"""
+
+    id = fields.IntField(pk=True)
+    name = fields.CharField(max_length=50)
+    payload = fields.TextField()
+
+    class Meta:
+        table = "bench_rows"
+
+
+def get_profiles() -> dict[str, dict]:
+    """各配置对应的 PRAGMA"""
+    return {
+        "sqlite-default": {"journal_mode": "DELETE", "synchronous": "FULL"},
+        "tortoise-default": {},
+        "performance": get_sqlite_pragmas("performance"),
+    }
+
+
+async def run_profile(
+    pragmas: dict,
+    db_path: Path,
+    writes: int,
+    writers: int,
+    readers: int,
+) -> dict[str, float]:
+    """运行单个配置的读写负载"""
+    await Tortoise.init(
+        config={
+            "connections": {
+                "default": {
+                    "engine": "tortoise.backends.sqlite",
+                    "credentials": {"file_path": str(db_path), **pragmas},
+                },
+            },
+            "apps": {"models": {"models": ["__main__"]}},
+        },
+    )
+    await Tortoise.generate_schemas()
+
+    # 预置数据供读取
+    await BenchRow.bulk_create(
+        [BenchRow(name=f"seed-{i}", payload="x" * 200) for i in range(1000)],
+    )
+
+    payload = "y" * 200
+    per_writer = writes // writers
+    stop = asyncio.Event()
+    read_count = 0
+
+    async def writer(index: int) -> None:
+        for i in range(per_writer):
+            await BenchRow.create(name=f"w{index}-{i}", payload=payload)
+
+    async def reader() -> None:
+        nonlocal read_count
+        while not stop.is_set():
+            await BenchRow.filter(id=random.randint(1, 1000)).first()
+            read_count += 1
+
+    start = time.perf_counter()
+    reader_tasks = [asyncio.create_task(reader()) for _ in range(readers)]
+    await asyncio.gather(*(writer(i) for i in range(writers)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await asyncio.gather(*reader_tasks)
+
+    await Tortoise.close_connections()
+
+    return {
+        "writes_per_sec": per_writer * writers / elapsed,
+        "reads_per_sec": read_count / elapsed,
+        "elapsed": elapsed,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite PRAGMA 配置基准测试")
+    parser.add_argument("--writes", type=int, default=2000, help="写入总行数")
+    parser.add_argument("--writers", type=int, default=4, help="并发写协程数")
+    parser.add_argument("--readers", type=int, default=4, help="并发读协程数")
+    args = parser.parse_args()
+
+    print(
+        f"📊 SQLite 基准测试: {args.writes} 次写入, {args.writers} 写 / {args.readers} 读并发",
+    )
+    print(f"{'profile':<18}{'writes/s':>12}{'reads/s':>12}{'elapsed':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, pragmas in get_profiles().items():
+            result = await run_profile(
+                pragmas,
+                Path(tmp) / f"{name}.sqlite3",
+                args.writes,
+                args.writers,
+                args.readers,
+            )
+            print(
+                f"{name:<18}{result['writes_per_sec']:>12.0f}"
+                f"{result['reads_per_sec']:>12.0f}{result['elapsed']:>9.2f}s",
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
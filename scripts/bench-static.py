@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+静态资源服务基准测试
+
+在临时目录生成一份模拟的 Vite 构建产物（index.html + 带哈希的 JS / CSS），
+分别用原先的磁盘读取方式（StaticFiles 挂载 + FileResponse）与内存缓存
+（CachedStaticFiles + StaticCache）构造 ASGI 应用，在进程内并发请求，对比 req/s
+与传输字节数。静态资源请求带 Accept-Encoding: gzip, br。
+
+用法:
+    uv run python scripts/bench-static.py [--seconds 3] [--concurrency 32] [--js-kb 400]
+"""
+
+import argparse
+import asyncio
+import random
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import FileResponse
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
+
+from src.backend.core.static_cache import CachedStaticFiles, StaticCache
+
+PATHS = ("/", "/dashboard", "/assets/index-Bx7kQ2aZ.js", "/assets/index-C9dP1mWq.css")
+HEADERS = {"Accept-Encoding": "gzip, br"}
+
+
+def build_static_tree(root: Path, js_kb: int) -> None:
+    """生成模拟的前端构建产物（内容可压缩，接近真实 JS / CSS）"""
+    rng = random.Random(42)
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(500)
+    ]
+
+    def code(size: int) -> str:
+        parts: list[str] = []
+        length = 0
+        while length < size:
+            name, arg, obj, method = rng.sample(words, 4)
+            line = f"const {name}=function({arg}){{return {obj}.{method}({rng.randint(0, 999)})}};\n"
+            parts.append(line)
+            length += len(line)
+        return "".join(parts)
+
+    assets = root / "assets"
+    assets.mkdir(parents=True)
+    (root / "index.html").write_text(
+        '<!doctype html><html><head><script type="module" src="/assets/index-Bx7kQ2aZ.js">'
+        '</script><link rel="stylesheet" href="/assets/index-C9dP1mWq.css"></head>'
+        '<body><div id="root"></div></body></html>\n',
+    )
+    (assets / "index-Bx7kQ2aZ.js").write_text(code(js_kb * 1024))
+    (assets / "index-C9dP1mWq.css").write_text(
+        "".join(f".{rng.choice(words)}{{margin:{i}px;color:#{i:06x}}}\n" for i in range(4000)),
+    )
+
+
+def disk_app(root: Path) -> Starlette:
+    """原先的实现：每次请求从磁盘读取"""
+
+    async def serve_spa(request: Request):
+        file_path = root / request.path_params["full_path"]
+        if file_path.exists() and file_path.is_file():
+            return FileResponse(file_path)
+        return FileResponse(root / "index.html")
+
+    return Starlette(
+        routes=[
+            Mount("/assets", StaticFiles(directory=str(root / "assets"))),
+            Route("/{full_path:path}", serve_spa),
+        ],
+    )
+
+
+def cached_app(root: Path) -> Starlette:
+    """内存缓存实现"""
+    cache = StaticCache()
+    cache.configure(root)
+    cache.load()
+
+    async def serve_spa(request: Request):
+        full_path = request.path_params["full_path"]
+        return cache.response(full_path, request.headers) or cache.response(
+            "index.html",
+            request.headers,
+        )
+
+    return Starlette(
+        routes=[
+            Mount(
+                "/assets",
+                CachedStaticFiles(directory=root / "assets", cache=cache, prefix="assets"),
+            ),
+            Route("/{full_path:path}", serve_spa),
+        ],
+    )
+
+
+async def run(app: Starlette, seconds: float, concurrency: int) -> tuple[int, int]:
+    """在进程内并发请求，返回 (请求数, 传输的响应体字节数)"""
+    transport = httpx.ASGITransport(app=app)
+    requests = 0
+    body_bytes = 0
+    deadline = time.perf_counter() + seconds
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker(offset: int) -> None:
+            nonlocal requests, body_bytes
+            index = offset
+            while time.perf_counter() < deadline:
+                path = PATHS[index % len(PATHS)]
+                index += 1
+                # 读取原始字节，不在客户端解压，只统计服务端的开销
+                async with client.stream("GET", path, headers=HEADERS) as response:
+                    async for chunk in response.aiter_raw():
+                        body_bytes += len(chunk)
+                requests += 1
+
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return requests, body_bytes
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="静态资源服务基准测试")
+    parser.add_argument("--seconds", type=float, default=3.0, help="每种实现的测试时长")
+    parser.add_argument("--concurrency", type=int, default=32, help="并发请求数")
+    parser.add_argument("--js-kb", type=int, default=400, help="模拟 JS 包大小（KiB）")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        build_static_tree(root, args.js_kb)
+
+        print(f"{'implementation':<16}{'req/s':>10}{'MiB/s sent':>14}")
+        for name, app in (("disk", disk_app(root)), ("memory cache", cached_app(root))):
+            requests, body_bytes = await run(app, args.seconds, args.concurrency)
+            print(
+                f"{name:<16}{requests / args.seconds:>10.0f}"
+                f"{body_bytes / args.seconds / 1024 / 1024:>14.1f}",
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+用户目录分页基准测试
+
+在大表（默认一百万行）上对比 keyset 游标分页与 OFFSET 分页
+在第 1 页和第 N 页的查询耗时，覆盖无过滤、role/is_active 过滤与前缀搜索。
+
+用法:
+    uv run python scripts/bench-user-directory.py [--rows 1000000] [--page 1000] [--limit 50]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tortoise import Tortoise
+from tortoise.transactions import in_transaction
+
+from src.backend.config.database import get_sqlite_pragmas
+from src.features.user.backend.directory import (
+    DEFAULT_FIELDS,
+    encode_cursor,
+    list_users,
+    prefix_filter,
+)
+from src.features.user.backend.models import User
+
+SEED_CHUNK_SIZE = 10000
+ROLES = ("user", "user", "user", "editor", "admin")
+# 基准数据不需要真实密码，使用固定的哈希占位
+DUMMY_HASH = "$2b$10$" + "x" * 53
+
+
+async def seed(rows: int) -> None:
+    """批量写入测试数据"""
+    table = User._meta.db_table  # noqa: SLF001
+    sql = (
+        f'INSERT INTO "{table}" ("username", "hashed_password", "email", "nickname", '
+        f'"role", "is_active", "created_at", "updated_at") '
+        f"VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+    )
+    rng = random.Random(42)
+    for start in range(0, rows, SEED_CHUNK_SIZE):
+        values = [
+            [
+                f"user{i:07d}",
+                DUMMY_HASH,
+                f"user{i:07d}@example.com",
+                f"User {i}",
+                rng.choice(ROLES),
+                int(rng.random() > 0.1),
+            ]
+            for i in range(start, min(start + SEED_CHUNK_SIZE, rows))
+        ]
+        async with in_transaction() as conn:
+            await conn.execute_many(sql, values)
+
+
+async def timed(func: Callable[[], Awaitable[Any]], repeat: int = 5) -> float:
+    """多次执行取最小耗时（毫秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="用户目录分页基准测试")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="用户表行数")
+    parser.add_argument("--page", type=int, default=1000, help="对比的深页页码")
+    parser.add_argument("--limit", type=int, default=50, help="每页条数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        await Tortoise.init(
+            config={
+                "connections": {
+                    "default": {
+                        "engine": "tortoise.backends.sqlite",
+                        "credentials": {
+                            "file_path": str(Path(tmp) / "users.sqlite3"),
+                            **get_sqlite_pragmas("performance"),
+                        },
+                    },
+                },
+                "apps": {"models": {"models": ["src.features.user.backend.models"]}},
+            },
+        )
+        await Tortoise.generate_schemas()
+
+        print(f"📦 写入 {args.rows} 行测试数据...")
+        started = time.perf_counter()
+        await seed(args.rows)
+        print(f"   完成，耗时 {time.perf_counter() - started:.1f}s")
+
+        scenarios: dict[str, dict[str, Any]] = {
+            "all": {},
+            "role=editor,active": {"role": "editor", "is_active": True},
+            "inactive": {"is_active": False},
+            "q=user0012": {"q": "user0012"},
+        }
+        offset = (args.page - 1) * args.limit
+
+        print(
+            f"\n📊 第 1 页 vs 第 {args.page} 页 (limit={args.limit}, 单位 ms)\n"
+            f"{'scenario':<22}{'keyset p1':>12}{f'keyset p{args.page}':>14}"
+            f"{'offset p1':>12}{f'offset p{args.page}':>14}",
+        )
+
+        for name, filters in scenarios.items():
+            query = User.filter(
+                **{k: v for k, v in filters.items() if k != "q"},
+            )
+            if "q" in filters:
+                query = query.filter(
+                    prefix_filter("username", filters["q"])
+                    | prefix_filter("email", filters["q"]),
+                )
+
+            # 深页游标：取第 N-1 页最后一条的 id（不计入耗时）
+            anchor = await query.order_by("id").offset(offset - 1).limit(1).values_list(
+                "id",
+                flat=True,
+            )
+            cursor = encode_cursor(anchor[0]) if anchor else None
+
+            def keyset(page_cursor: str | None, filters: dict = filters):
+                return list_users(limit=args.limit, cursor=page_cursor, **filters)
+
+            def offset_page(skip: int, query: Any = query):
+                return (
+                    query.order_by("id")
+                    .offset(skip)
+                    .limit(args.limit)
+                    .values(*DEFAULT_FIELDS)
+                )
+
+            keyset_first = await timed(partial(keyset, None))
+            keyset_deep = await timed(partial(keyset, cursor))
+            offset_first = await timed(partial(offset_page, 0))
+            offset_deep = await timed(partial(offset_page, offset))
+            print(
+                f"{name:<22}{keyset_first:>12.2f}{keyset_deep:>14.2f}"
+                f"{offset_first:>12.2f}{offset_deep:>14.2f}",
+            )
+
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+生成功能清单
+
+扫描 src/features/*/backend（只解析源码，不导入），记录每个功能的路由模块、模型模块、
+挂载前缀、标签与是否延迟挂载，写入 src/features/manifest.json。
+生产环境（Docker / 桌面版）启动时直接读取清单，不扫描目录；桌面版打包时还据此添加隐藏导入。
+
+新增或删除功能、修改 backend/__init__.py 中的挂载参数后运行（pnpm features:manifest）；
+--check 用于 CI，清单过期时以非零状态退出。
+
+用法:
+    uv run python scripts/build-feature-manifest.py [--check]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backend.core.features import FEATURES_DIR, MANIFEST_FILE, build_manifest
+
+FEATURES_PATH = project_root / FEATURES_DIR
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="生成功能清单")
+    parser.add_argument("--check", action="store_true", help="只检查清单是否最新")
+    args = parser.parse_args()
+
+    manifest = build_manifest(FEATURES_PATH)
+    manifest_text = json.dumps(manifest, ensure_ascii=False, indent=2) + "\n"
+    manifest_path = FEATURES_PATH / MANIFEST_FILE
+
+    if args.check:
+        if not manifest_path.exists() or manifest_path.read_text(encoding="utf-8") != manifest_text:
+            print(f"❌ 功能清单已过期: {manifest_path.relative_to(project_root)}，请运行 pnpm features:manifest")
+            sys.exit(1)
+        print("✅ 功能清单是最新的")
+        return
+
+    manifest_path.write_text(manifest_text, encoding="utf-8", newline="\n")
+    lazy = [feature["name"] for feature in manifest["features"] if feature["lazy"]]
+    print(
+        f"✅ 已生成 {manifest_path.relative_to(project_root)} "
+        f"({len(manifest['features'])} 个功能, 延迟挂载: {', '.join(lazy) or '无'})",
+    )
+
+
+if __name__ == "__main__":
+    main()
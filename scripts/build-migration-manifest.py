@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+生成迁移清单与 baseline
+
+- 在临时 SQLite 数据库上依次回放 migrations/models 下的所有迁移，
+  导出最终表结构为 migrations/baseline.sql（全新安装时一次性执行）
+- 记录每个迁移文件的名称、sha256 与 MODELS_STATE 到 migrations/manifest.json
+  （启动时据此判断能否跳过 aerich）
+
+每次生成新迁移后运行（pnpm db:manifest）；
+--check 用于 CI，清单过期时以非零状态退出。
+
+用法:
+    uv run python scripts/build-migration-manifest.py [--check]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backend.core.migration_manifest import (
+    BASELINE_FILE,
+    MANIFEST_FILE,
+    build_manifest,
+    list_migration_files,
+)
+
+MIGRATIONS_DIR = project_root / "migrations"
+
+
+def load_upgrade_sql(path: Path) -> str:
+    """导入迁移文件并取得 upgrade 生成的 SQL"""
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return asyncio.run(module.upgrade(None))
+
+
+def build_baseline_sql(migrations_dir: Path) -> str:
+    """在临时数据库上回放全部迁移，导出合并后的建表语句"""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(Path(tmp) / "baseline.sqlite3")
+        try:
+            for path in list_migration_files(migrations_dir):
+                conn.executescript(load_upgrade_sql(path))
+            rows = conn.execute(
+                "SELECT sql FROM sqlite_master "
+                "WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' ORDER BY rowid",
+            ).fetchall()
+        finally:
+            conn.close()
+    return "".join(f"{sql};\n" for (sql,) in rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="生成迁移清单与 baseline")
+    parser.add_argument("--check", action="store_true", help="只检查清单是否最新")
+    args = parser.parse_args()
+
+    baseline_sql = build_baseline_sql(MIGRATIONS_DIR)
+    manifest = build_manifest(MIGRATIONS_DIR, baseline_sql, dialect="sqlite")
+    manifest_text = json.dumps(manifest, ensure_ascii=False, indent=2) + "\n"
+
+    baseline_path = MIGRATIONS_DIR / BASELINE_FILE
+    manifest_path = MIGRATIONS_DIR / MANIFEST_FILE
+
+    if args.check:
+        stale = [
+            path.name
+            for path, content in ((baseline_path, baseline_sql), (manifest_path, manifest_text))
+            if not path.exists() or path.read_text(encoding="utf-8") != content
+        ]
+        if stale:
+            print(f"❌ 迁移清单已过期: {', '.join(stale)}，请运行 pnpm db:manifest")
+            sys.exit(1)
+        print("✅ 迁移清单是最新的")
+        return
+
+    baseline_path.write_text(baseline_sql, encoding="utf-8", newline="\n")
+    manifest_path.write_text(manifest_text, encoding="utf-8", newline="\n")
+    print(f"✅ 已生成 {baseline_path.relative_to(project_root)}")
+    print(
+        f"✅ 已生成 {manifest_path.relative_to(project_root)} "
+        f"({len(manifest['migrations'])} 个迁移, 最新 {manifest['migrations'][-1]['name']})",
+    )
+
+
+if __name__ == "__main__":
+    main()
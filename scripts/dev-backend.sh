@@ -14,4 +14,4 @@ echo "📖 API 文档: http://localhost:${BACKEND_PORT}/docs"
 echo "💡 提示: 修改后端代码后，OpenAPI 规范和类型会自动更新"
 echo ""
 
-uv run uvicorn src.backend.main:app --reload --host "$BACKEND_HOST" --port "$BACKEND_PORT"
+uv run python -m src.backend.server --reload --host "$BACKEND_HOST" --port "$BACKEND_PORT"
@@ -3,9 +3,9 @@
 生成 OpenAPI JSON 规范文件
 
 无需启动服务器，直接从 FastAPI 应用生成 OpenAPI 规范
+路由与模型的指纹未变化时跳过生成（--force 强制重新生成）
 """
 
-import json
 import sys
 from pathlib import Path
 
@@ -17,24 +17,25 @@ from src.backend.core.openapi import generate_openapi_json
 from src.backend.main import app
 
 if __name__ == "__main__":
-    # 支持自定义输出路径
-    output_path = sys.argv[1] if len(sys.argv) > 1 else "openapi.json"
-
-    # 生成 OpenAPI 规范
-    success = generate_openapi_json(app, output_path, project_root)
+    # 支持自定义输出路径；--force 忽略指纹强制重新生成
+    args = [arg for arg in sys.argv[1:] if arg != "--force"]
+    output_path = args[0] if args else "openapi.json"
+
+    # 生成 OpenAPI 规范（路由与模型未变化时跳过）
+    result = generate_openapi_json(
+        app,
+        output_path,
+        project_root,
+        force="--force" in sys.argv[1:],
+    )
 
     # 控制台输出（供用户查看）
-    if success:
-        output_file = project_root / output_path
-        print(f"✅ OpenAPI 规范已生成: {output_file}")
-        print(f"📄 文件大小: {output_file.stat().st_size / 1024:.2f} KB")
-
-        # 统计端点数量
-        import json
-
-        with output_file.open("r", encoding="utf-8") as f:
-            schema = json.load(f)
-        paths_count = len(schema.get("paths", {}))
-        print(f"🔗 API 端点数量: {paths_count}")
-
-    sys.exit(0 if success else 1)
+    if result is not None:
+        if result["skipped"]:
+            print(f"⏭️ 路由与模型未变化，保留现有文件: {result['file']}")
+        else:
+            print(f"✅ OpenAPI 规范已生成: {result['file']}")
+            print(f"📄 文件大小: {result['size'] / 1024:.2f} KB")
+            print(f"🔗 API 端点数量: {result['paths']}")
+
+    sys.exit(0 if result is not None else 1)
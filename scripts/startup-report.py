@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+冷启动报告
+
+在新的 Python 进程中（`-X importtime`）导入 src.backend.main 并完整执行一次 lifespan 启动，
+使用临时 SQLite 数据库，输出：
+- 导入耗时：整个进程按第三方包与项目模块汇总的自身耗时（最慢的若干项）
+- lifespan 各启动阶段的耗时（来自 src.backend.core.startup）
+
+指定 --budget-ms 时作为回归检查：导入 + lifespan 超出预算则以非零状态退出。
+先执行一次预热进程（生成 .pyc），再取多次运行中最快的一次，减少噪声。
+
+用法:
+    uv run python scripts/startup-report.py [--runs 3] [--top 15] [--budget-ms 2500]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+
+REPORT_PREFIX = "STARTUP_REPORT "
+
+CHILD_CODE = f"""
+import asyncio, json, time
+
+started = time.perf_counter()
+from src.backend.main import app
+from src.backend.core.startup import startup_timer
+imported = time.perf_counter() - started
+
+
+async def run():
+    started = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        return time.perf_counter() - started
+
+
+ready = asyncio.run(run())
+report = {{"import_seconds": imported, "lifespan_seconds": ready, **startup_timer.snapshot()}}
+print({REPORT_PREFIX!r} + json.dumps(report, default=str), flush=True)
+"""
+
+
+def run_once(database_dir: Path, run: int) -> tuple[dict, list[tuple[int, int, str]], float]:
+    """启动一个子进程，返回 (lifespan 报告, importtime 记录, 进程总耗时)"""
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(project_root),
+        "DATABASE_URL": f"sqlite://{database_dir / f'startup-{run}.sqlite3'}",
+    }
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD_CODE],
+        cwd=project_root,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    wall = time.perf_counter() - started
+    if result.returncode != 0:
+        print(result.stdout[-4000:])
+        print(result.stderr[-4000:], file=sys.stderr)
+        sys.exit(f"❌ 启动进程异常退出（{result.returncode}）")
+
+    report = next(
+        json.loads(line[len(REPORT_PREFIX) :])
+        for line in result.stdout.splitlines()
+        if line.startswith(REPORT_PREFIX)
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace(":", "|", 1).split("|"))
+        imports.append((int(self_us), int(cumulative_us), name))
+    return report, imports, wall
+
+
+def group_name(module: str) -> str:
+    """项目模块按 feature / core 模块汇总，第三方按顶层包汇总"""
+    parts = module.split(".")
+    if parts[0] == "src":
+        return ".".join(parts[:4])
+    return parts[0]
+
+
+def print_imports(imports: list[tuple[int, int, str]], top: int) -> None:
+    totals: dict[str, int] = defaultdict(int)
+    for self_us, _, name in imports:
+        totals[group_name(name)] += self_us
+    project = sorted(((k, v) for k, v in totals.items() if k.startswith("src")), key=lambda item: -item[1])
+    third_party = sorted(((k, v) for k, v in totals.items() if not k.startswith("src")), key=lambda item: -item[1])
+
+    print(f"\n📦 导入耗时（整个进程的自身耗时按包汇总，含 lifespan 中的延迟导入，共 {sum(totals.values()) / 1000:.0f}ms）")
+    print(f"  {'ms':>8}  {'third-party':<32}{'ms':>8}  project")
+    for i in range(top):
+        left_name, left_us = third_party[i] if i < len(third_party) else ("", 0)
+        right_name, right_us = project[i] if i < len(project) else ("", 0)
+        left_ms = f"{left_us / 1000:.1f}" if left_name else ""
+        right_ms = f"{right_us / 1000:.1f}" if right_name else ""
+        print(f"  {left_ms:>8}  {left_name:<32}{right_ms:>8}  {right_name}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="冷启动报告")
+    parser.add_argument("--runs", type=int, default=3, help="测量次数（取最快一次）")
+    parser.add_argument("--top", type=int, default=15, help="导入耗时显示的条目数")
+    parser.add_argument("--budget-ms", type=float, help="导入 + lifespan 的预算，超出时以状态码 1 退出")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_dir = Path(tmp)
+        run_once(database_dir, 0)  # 预热：生成 .pyc，避免首轮包含编译时间
+        runs = [run_once(database_dir, i) for i in range(1, args.runs + 1)]
+
+    report, imports, wall = min(runs, key=lambda item: item[0]["import_seconds"] + item[0]["lifespan_seconds"])
+    cold_start_ms = (report["import_seconds"] + report["lifespan_seconds"]) * 1000
+
+    print_imports(imports, args.top)
+    print("\n🚀 lifespan 启动阶段")
+    for phase in report["phases"]:
+        print(f"  {phase['seconds'] * 1000:>8.1f}  {phase['name']}")
+
+    print(
+        f"\n⏱️  导入 {report['import_seconds'] * 1000:.0f}ms + lifespan "
+        f"{report['lifespan_seconds'] * 1000:.0f}ms = {cold_start_ms:.0f}ms"
+        f"（进程总耗时 {wall * 1000:.0f}ms，含解释器启动与关闭）",
+    )
+
+    if args.budget_ms is not None:
+        if cold_start_ms > args.budget_ms:
+            print(f"❌ 冷启动 {cold_start_ms:.0f}ms 超出预算 {args.budget_ms:.0f}ms")
+            sys.exit(1)
+        print(f"✅ 冷启动在预算 {args.budget_ms:.0f}ms 之内")
+
+
+if __name__ == "__main__":
+    main()
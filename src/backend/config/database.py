@@ -2,12 +2,17 @@
 数据库配置（Tortoise-ORM）
 """
 
+import asyncio
 import contextlib
 import sys
+import time
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
 
-from aerich import Command
 from loguru import logger
 from tortoise import Tortoise
+from tortoise.backends.base.config_generator import expand_db_url
+from tortoise.connection import connections
 
 # 引入统一路径管理
 try:
@@ -16,16 +21,124 @@ except ImportError:
     # 兼容直接运行此文件的情况 (如有需要)
     from backend.core.path_conf import get_resource_path
 
+from src.backend.core.features import feature_registry
+from src.backend.core.migration_manifest import try_fast_migrate
+from src.backend.core.scheduler import scheduler
+
 from .settings import settings
 
+
+def get_sqlite_pragmas(profile: str | None = None) -> dict[str, Any]:
+    """
+    获取 SQLite 调优 PRAGMA
+
+    Tortoise 会在每个连接建立时逐条执行 `PRAGMA key=value`
+
+    Args:
+        profile: 配置名称，默认使用 SQLITE_PROFILE
+    """
+    if (profile or settings.SQLITE_PROFILE) != "performance":
+        return {}
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT,
+    }
+
+
+def get_pool_options() -> dict[str, Any]:
+    """
+    获取 asyncpg 连接池参数
+
+    minsize / maxsize 由 Tortoise 传给连接池，其余参数原样透传给 asyncpg.create_pool
+    """
+    options: dict[str, Any] = {
+        "minsize": settings.DB_POOL_MIN_SIZE,
+        "maxsize": settings.DB_POOL_MAX_SIZE,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "max_inactive_connection_lifetime": settings.DB_MAX_INACTIVE_CONNECTION_LIFETIME,
+    }
+    if settings.DB_COMMAND_TIMEOUT > 0:
+        options["command_timeout"] = settings.DB_COMMAND_TIMEOUT
+    return options
+
+
+def build_connection_config(db_url: str) -> str | dict[str, Any]:
+    """
+    根据 DATABASE_URL 生成 Tortoise 连接配置
+
+    - SQLite：合并调优 PRAGMA
+    - PostgreSQL（asyncpg）：合并连接池参数，并使用带埋点的连接池客户端
+    - 其他数据库：直接使用 URL
+
+    URL 查询参数中显式指定的值优先。
+    """
+    config = expand_db_url(db_url)
+    if config["engine"] == "tortoise.backends.sqlite":
+        defaults = get_sqlite_pragmas()
+    elif config["engine"] == "tortoise.backends.asyncpg":
+        defaults = get_pool_options()
+        config["engine"] = "src.backend.core.db_pool_asyncpg"
+    else:
+        return db_url
+
+    credentials = config["credentials"]
+    explicit = {
+        key: credentials.get(key, value)
+        for key, value in parse_qsl(urlsplit(db_url).query)
+    }
+    config["credentials"] = {**credentials, **defaults, **explicit}
+
+    # URL 中的浮点参数不会被 Tortoise 转换类型，asyncpg 需要数值
+    for key in ("max_inactive_connection_lifetime", "command_timeout"):
+        if key in explicit:
+            config["credentials"][key] = float(explicit[key])
+    return config
+
+
+def build_connections(db_url: str) -> dict[str, Any]:
+    """
+    生成 Tortoise 连接表
+
+    SQLite 使用带锁埋点的客户端：default 为唯一写连接，
+    并按 SQLITE_READ_CONNECTIONS 追加只读连接 reader_N（内存数据库除外）。
+    其他数据库只有一个 default 连接（PostgreSQL 为带埋点的连接池）。
+    """
+    writer = build_connection_config(db_url)
+    if not isinstance(writer, dict) or writer["engine"] != "tortoise.backends.sqlite":
+        return {"default": writer}
+
+    writer["engine"] = "src.backend.core.db_pool"
+    connection_map: dict[str, Any] = {"default": writer}
+
+    if writer["credentials"].get("file_path") == ":memory:":
+        return connection_map
+
+    for index in range(settings.SQLITE_READ_CONNECTIONS):
+        connection_map[f"reader_{index}"] = {
+            "engine": "src.backend.core.db_pool",
+            "credentials": {**writer["credentials"], "query_only": "ON"},
+        }
+    return connection_map
+
+
+_connections = build_connections(settings.DATABASE_URL)
+
 # Tortoise-ORM配置
 TORTOISE_ORM = {
-    "connections": {"default": settings.DATABASE_URL},
+    "connections": _connections,
+    # 存在只读连接时启用读写路由
+    "routers": (
+        ["src.backend.core.db_pool.ReadWriteRouter"] if len(_connections) > 1 else []
+    ),
     "apps": {
         "models": {
+            # 功能模块的 models 由注册表自动发现（src/features/*/backend/models.py）
             "models": [
-                "src.features.user.backend.models",
-                # 在此添加其他功能模块的models
+                *feature_registry.model_modules(),
                 "aerich.models",  # Aerich迁移管理
             ],
             "default_connection": "default",
@@ -51,8 +164,23 @@ async def run_migrations():
         logger.critical(error_msg)
         raise RuntimeError(error_msg)
 
+    # 快速路径：清单与数据库版本一致时跳过 aerich，全新数据库直接应用 baseline
+    started = time.perf_counter()
+    if await try_fast_migrate(
+        Tortoise.get_connection("default"),
+        "default",
+        migrations_dir,
+    ):
+        logger.info(
+            f"⚡ 迁移检查完成，耗时 {(time.perf_counter() - started) * 1000:.1f} ms",
+        )
+        return
+
     logger.info(f"🔄 Running migrations from {migrations_dir}...")
 
+    # 仅在需要完整升级时才构建 aerich Command
+    from aerich import Command
+
     try:
         # 2. 初始化 Aerich Command
         command = Command(tortoise_config=TORTOISE_ORM, location=str(migrations_dir))
@@ -79,10 +207,13 @@ async def run_migrations():
         raise
 
 
-async def init_db():
+async def init_db(migrate: bool = True):
     """
     初始化数据库连接
     在应用启动时调用
+
+    Args:
+        migrate: 是否建表 / 执行迁移（多进程模式下由主进程执行一次，worker 跳过）
     """
     await Tortoise.init(config=TORTOISE_ORM)
 
@@ -95,7 +226,10 @@ async def init_db():
     is_frozen = getattr(sys, "frozen", False)
     is_production = settings.ENVIRONMENT == "production"
 
-    if settings.ENVIRONMENT == "development" and not is_frozen:
+    if not migrate:
+        logger.debug("⏭️ 数据库迁移已由主进程完成，跳过")
+
+    elif settings.ENVIRONMENT == "development" and not is_frozen:
         # 开发环境：自动建表 (如果不使用 aerich)
         # safe=True: 如果表已存在则忽略
         logger.info("🔧 Development mode: Generating schemas...")
@@ -106,10 +240,88 @@ async def init_db():
         # 如果失败，直接崩溃，绝不使用 generate_schemas 兜底
         await run_migrations()
 
+    if settings.DB_POOL_WARMUP:
+        await warm_up_connections()
+
+    if is_sqlite:
+        start_wal_checkpoint()
+
+
+async def warm_up_connections() -> None:
+    """
+    预热数据库连接
+
+    对每个连接（连接池按最小连接数）并发执行 SELECT 1，
+    提前完成建连、PRAGMA / 会话初始化，避免首批请求承担这部分延迟。
+    """
+    started = time.perf_counter()
+    queries = [
+        client.execute_query("SELECT 1")
+        for client in connections.all()
+        for _ in range(max(getattr(client, "pool_minsize", 1), 1))
+    ]
+    await asyncio.gather(*queries)
+    logger.info(
+        f"🔥 数据库连接预热完成: {len(queries)} 个连接, "
+        f"{(time.perf_counter() - started) * 1000:.1f} ms",
+    )
+
+
+# 定时 WAL checkpoint 的调度任务名
+WAL_CHECKPOINT_JOB = "wal_checkpoint"
+
+
+async def checkpoint_wal(mode: str = "PASSIVE") -> None:
+    """
+    执行一次 WAL checkpoint
+
+    Args:
+        mode: PASSIVE（不阻塞读写）| TRUNCATE（关闭时使用，清空 WAL 文件）
+    """
+    conn = Tortoise.get_connection("default")
+    _, rows = await conn.execute_query(f"PRAGMA wal_checkpoint({mode})")
+    if rows:
+        busy, log_pages, checkpointed = tuple(rows[0])
+        logger.debug(
+            f"🧹 WAL checkpoint({mode}): busy={busy}, wal={log_pages}, checkpointed={checkpointed}",
+        )
+
+
+def start_wal_checkpoint() -> None:
+    """注册定时 WAL checkpoint（仅 WAL 模式），防止 WAL 文件在持续写入下无限增长"""
+    interval = settings.SQLITE_WAL_CHECKPOINT_INTERVAL
+    connection = TORTOISE_ORM["connections"]["default"]
+    journal_mode = (
+        str(connection["credentials"].get("journal_mode", "")).upper()
+        if isinstance(connection, dict)
+        else ""
+    )
+    if interval <= 0 or journal_mode != "WAL" or scheduler.get(WAL_CHECKPOINT_JOB) is not None:
+        return
+    scheduler.add_interval(
+        WAL_CHECKPOINT_JOB,
+        checkpoint_wal,
+        interval,
+        description="SQLite WAL checkpoint（PASSIVE）",
+    )
+
+
+async def stop_wal_checkpoint() -> None:
+    """停止定时任务，并在关闭前执行一次 TRUNCATE checkpoint"""
+    if scheduler.get(WAL_CHECKPOINT_JOB) is None:
+        return
+    await scheduler.remove(WAL_CHECKPOINT_JOB)
+
+    try:
+        await checkpoint_wal("TRUNCATE")
+    except Exception as e:
+        logger.warning(f"⚠️ WAL checkpoint 失败: {e}")
+
 
 async def close_db():
     """
     关闭数据库连接
     在应用关闭时调用
     """
+    await stop_wal_checkpoint()
     await Tortoise.close_connections()
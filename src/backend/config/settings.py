@@ -42,17 +42,112 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 9871
 
+    # 多进程服务（python -m src.backend.server）
+    WORKERS: int = 1  # worker 进程数，0 表示按可用 CPU 核数
+    WORKER_MAX_REQUESTS: int = 0  # 每个 worker 处理该数量的请求后重启（限制内存增长），0 表示不限制
+    WORKER_MAX_REQUESTS_JITTER: int = 0  # 在上限上随机增加 0~N，错开各 worker 的重启时间
+    WORKER_HEALTHCHECK_TIMEOUT: int = 5  # 秒，worker 无响应超过该时间视为卡死并重启
+    WORKER_STATS_INTERVAL: float = 5.0  # 秒，worker 状态上报间隔
+    WORKER_STATE_DIR: str = "./data/workers"
+
+    # 优雅关闭：停止就绪 -> 通知 SSE 客户端重连 -> 排空进行中的请求 -> 按注册的逆序释放资源
+    SHUTDOWN_DRAIN_TIMEOUT: float = 15.0  # 秒，等待进行中请求完成的上限，超时后强制关闭连接
+    SHUTDOWN_SSE_RETRY_MS: int = 3000  # SSE 客户端的重连间隔，实际为 1~2 倍随机值以错开重连
+
+    # 就绪检查（/health/ready 返回后台探测的缓存结果）
+    HEALTH_CHECK_INTERVAL: float = 10.0  # 秒，后台探测间隔
+    HEALTH_CHECK_TIMEOUT: float = 3.0  # 秒，单个探测项的超时
+    HEALTH_MIN_FREE_MB: int = 100  # data/ 与 logs/ 所在磁盘的最小剩余空间
+    HEALTH_MAX_LOOP_LAG_MS: int = 500  # 事件循环延迟上限
+
+    # 后台任务调度器（周期任务统一注册，/api/monitor/jobs 查看）
+    SCHEDULER_THREAD_WORKERS: int = 2  # thread=True 的任务使用的线程数
+    SCHEDULER_STOP_TIMEOUT: float = 5.0  # 秒，关闭时等待进行中任务的上限，超时后取消
+    PROCESS_METRICS_INTERVAL: float = 15.0  # 秒，进程资源指标（内存、CPU、线程、文件句柄）采样间隔，0 表示关闭
+
     # 数据库配置
     DATABASE_URL: str = "sqlite://./data/db.sqlite3"
 
+    # SQLite 性能配置（每个连接建立时以 PRAGMA 形式应用）
+    # performance: 应用下列调优参数; default: 保持 SQLite/Tortoise 默认值
+    SQLITE_PROFILE: str = "performance"
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_CACHE_SIZE: int = -65536  # 负数单位为 KiB，即 64 MiB
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MiB
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    SQLITE_BUSY_TIMEOUT: int = 5000  # 毫秒
+    SQLITE_WAL_CHECKPOINT_INTERVAL: int = 300  # 秒，0 表示关闭定时 checkpoint
+    # 只读连接数（读查询路由到只读连接，写操作串行走唯一写连接），0 表示关闭读写分离
+    SQLITE_READ_CONNECTIONS: int = 4
+
+    # 连接池配置（PostgreSQL / asyncpg）
+    DB_POOL_MIN_SIZE: int = 1
+    DB_POOL_MAX_SIZE: int = 10
+    DB_STATEMENT_CACHE_SIZE: int = 100  # 每个连接缓存的预编译语句数，0 表示关闭
+    DB_MAX_INACTIVE_CONNECTION_LIFETIME: float = 300.0  # 秒，空闲超时后关闭连接
+    DB_COMMAND_TIMEOUT: float = 0  # 秒，0 表示不限制
+    # 启动时预先建立连接，避免部署后的首批请求承担建连开销
+    DB_POOL_WARMUP: bool = True
+
+    # 写回缓冲（高频遥测数据批量写入）
+    WRITE_BEHIND_BATCH_SIZE: int = 500  # 待写入行数达到该值时立即 flush
+    WRITE_BEHIND_FLUSH_INTERVAL: float = 2.0  # 秒，最长 flush 间隔
+    WRITE_BEHIND_MAX_PENDING: int = 10000  # 超过后写入方等待 flush（背压）
+
+    # SQLite 在线备份
+    BACKUP_DIR: str = "./data/backups"
+    BACKUP_PAGES_PER_STEP: int = 1024  # 每步复制的页数
+    BACKUP_STEP_SLEEP: float = 0.005  # 秒，步与步之间让出写锁
+    BACKUP_INTERVAL: int = 0  # 秒，定时快照间隔，0 表示关闭
+    BACKUP_CRON: str = ""  # cron 表达式（分 时 日 月 周，本地时间），如 "0 3 * * *"，设置后代替 BACKUP_INTERVAL
+    BACKUP_RETENTION: int = 7  # 保留的快照份数，0 表示不清理
+
+    # 查询结果缓存（进程内，按模型 / 行标签失效）
+    QUERY_CACHE_TTL: float = 60.0  # 秒
+    QUERY_CACHE_MAX_ENTRIES: int = 10000  # 每个缓存的最大条目数
+    QUERY_CACHE_MAX_BYTES: int = 33554432  # 每个缓存的内存预算（估算），32 MiB
+
     # 安全配置
     SECRET_KEY: str = "dev-secret-key-change-in-production-please"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080
 
+    # 密码哈希配置
+    # BCRYPT_ROUNDS > 0 时固定使用该 cost，否则启动时根据 BCRYPT_TARGET_MS 自动校准
+    BCRYPT_ROUNDS: int = 0
+    BCRYPT_TARGET_MS: int = 250
+    BCRYPT_MIN_ROUNDS: int = 10
+    BCRYPT_MAX_ROUNDS: int = 15
+    # 批量导入时的密码哈希进程数（0 表示使用 CPU 核数）
+    PASSWORD_HASH_WORKERS: int = 0
+
+    # 静态资源内存缓存（前端构建产物）
+    STATIC_CACHE_MAX_BYTES: int = 67108864  # 载入内存的总量上限，64 MiB，0 表示只建清单不载入
+    STATIC_CACHE_MAX_FILE_BYTES: int = 8388608  # 单文件上限，8 MiB，超出的文件从磁盘读取
+
+    # 响应压缩（API JSON、流式导出等；静态资源使用预压缩版本）
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # 小于该大小的响应不压缩
+    COMPRESSION_MAX_SIZE: int = 8 * 1024 * 1024  # 声明的 Content-Length 超过该大小的响应不压缩
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 需要 uv add brotli
+    COMPRESSION_ZSTD_LEVEL: int = 3  # 需要 uv add zstandard
+
+    # 功能模块：生产环境中 LAZY = True 的功能在第一次请求时才导入路由
+    LAZY_FEATURE_ROUTERS: bool = True
+
     # 监控配置
     LOG_BUFFER_SIZE: int = 500
 
+    # 请求追踪（Server-Timing 响应头；采样的追踪保存在内存中，/api/monitor/traces 查看）
+    TRACING_ENABLED: bool = True
+    TRACE_SERVER_TIMING: bool = True  # 在响应中添加 Server-Timing 头，不希望暴露内部耗时可关闭
+    TRACE_SAMPLE_RATE: float = 0.05  # 保存到缓冲区的请求比例
+    TRACE_SLOW_MS: float = 500  # 耗时超过该值的请求总是保存
+    TRACE_BUFFER_SIZE: int = 200  # 保存的追踪条数上限
+    TRACE_DB_WAIT_MIN_MS: float = 1.0  # 等待数据库连接超过该值时才记录 db_wait 阶段
+
     # CORS配置
     CORS_ORIGINS: list[str] = ["http://localhost:5173", "http://localhost:3000"]
 
@@ -0,0 +1,380 @@
+"""
+响应压缩中间件（纯 ASGI）
+
+按 Accept-Encoding（含 q 值）在 zstd / br / gzip 中协商编码，服务端偏好依次为
+zstd > br > gzip；zstd 需要 `uv add zstandard`，br 需要 `uv add brotli`，未安装时不参与协商。
+
+- 一次性响应（JSON 等）：小于 COMPRESSION_MIN_SIZE 或压缩后没有变小时原样返回，
+  否则整体压缩并改写 Content-Length（达到 THREAD_COMPRESS_SIZE 时在线程中压缩）
+- 流式响应（NDJSON / CSV 导出等）：攒够阈值后开始压缩，之后每块压缩后立即 flush 发出，
+  客户端能持续收到数据，不会被缓冲到响应结束
+- 以下响应原样透传：text/event-stream（SSE 日志流等）、已有 Content-Encoding（静态资源的
+  预压缩版本）、不可压缩的类型（图片、gzip 附件、数据库快照）、Range / 204 / 304、
+  带 Accept-Ranges 的文件响应（压缩会破坏断点续传）、Content-Length 超过 COMPRESSION_MAX_SIZE、
+  Cache-Control: no-transform、HEAD 请求
+
+压缩器对象按编码复用：zstd 的 ZstdCompressor（上下文创建开销大）放在空闲池中，
+流式响应结束后归还；gzip / brotli 的一次性压缩直接调用模块函数，不创建压缩对象。
+"""
+
+import zlib
+from collections.abc import Callable
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.backend.config.settings import settings
+from src.backend.core.metrics import metrics
+
+try:
+    import brotli
+except ImportError:  # 可选依赖：uv add brotli
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # 可选依赖：uv add zstandard
+    zstandard = None
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/javascript",
+    "application/json",
+    "application/x-ndjson",
+    "application/problem+json",
+    "application/manifest+json",
+    "application/xml",
+    "application/wasm",
+    "image/svg+xml",
+    "image/x-icon",
+    "image/vnd.microsoft.icon",
+    "font/ttf",
+    "font/otf",
+)
+SKIPPED_TYPES = ("text/event-stream",)
+# 一次性响应体达到该大小时在线程中压缩
+THREAD_COMPRESS_SIZE = 256 * 1024
+# 空闲 zstd 压缩器的保留上限
+ZSTD_POOL_SIZE = 16
+# 缓存协商结果的不同 Accept-Encoding 取值上限（浏览器发送的取值很少）
+NEGOTIATION_CACHE_SIZE = 256
+
+_responses_counter = metrics.counter("compression_responses_total", "响应压缩结果（按编码与结果）")
+_bytes_in_counter = metrics.counter("compression_bytes_in_total", "压缩前的响应体字节数")
+_bytes_out_counter = metrics.counter("compression_bytes_out_total", "压缩后的响应体字节数")
+
+
+class StreamCompressor:
+    """流式压缩：每块压缩后 flush，保证已写入的数据能被客户端立即解码"""
+
+    def __init__(
+        self,
+        process: Callable[[bytes], bytes],
+        finish: Callable[[], bytes],
+        release: Callable[[], None] | None = None,
+    ):
+        self._process = process
+        self._finish = finish
+        self._release = release
+
+    def compress(self, data: bytes) -> bytes:
+        return self._process(data)
+
+    def finish(self) -> bytes:
+        try:
+            return self._finish()
+        finally:
+            if self._release is not None:
+                self._release()
+
+
+class Codec:
+    """一种 Content-Encoding 的一次性与流式压缩"""
+
+    name = ""
+
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    def stream(self) -> StreamCompressor:
+        raise NotImplementedError
+
+
+class GzipCodec(Codec):
+    name = "gzip"
+
+    def __init__(self, level: int):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level, wbits=31)
+
+    def stream(self) -> StreamCompressor:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return StreamCompressor(
+            lambda data: compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH),
+            compressor.flush,
+        )
+
+
+class BrotliCodec(Codec):
+    name = "br"
+
+    def __init__(self, quality: int):
+        self.quality = quality
+
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self.quality)
+
+    def stream(self) -> StreamCompressor:
+        compressor = brotli.Compressor(quality=self.quality)
+        return StreamCompressor(
+            lambda data: compressor.process(data) + compressor.flush(),
+            compressor.finish,
+        )
+
+
+class ZstdCodec(Codec):
+    name = "zstd"
+
+    def __init__(self, level: int):
+        self.level = level
+        self._idle: list = []
+
+    def _acquire(self):
+        if self._idle:
+            return self._idle.pop()
+        return zstandard.ZstdCompressor(level=self.level)
+
+    def _release(self, compressor) -> None:
+        if len(self._idle) < ZSTD_POOL_SIZE:
+            self._idle.append(compressor)
+
+    def compress(self, data: bytes) -> bytes:
+        compressor = self._acquire()
+        try:
+            return compressor.compress(data)
+        finally:
+            self._release(compressor)
+
+    def stream(self) -> StreamCompressor:
+        compressor = self._acquire()
+        stream = compressor.compressobj()
+        return StreamCompressor(
+            lambda data: stream.compress(data) + stream.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+            stream.flush,
+            lambda: self._release(compressor),
+        )
+
+
+def available_codecs() -> list[Codec]:
+    """按服务端偏好排序的可用编码"""
+    codecs: list[Codec] = []
+    if zstandard is not None:
+        codecs.append(ZstdCodec(settings.COMPRESSION_ZSTD_LEVEL))
+    if brotli is not None:
+        codecs.append(BrotliCodec(settings.COMPRESSION_BROTLI_QUALITY))
+    codecs.append(GzipCodec(settings.COMPRESSION_GZIP_LEVEL))
+    return codecs
+
+
+def negotiate(accept_encoding: str | None, codecs: list[Codec]) -> Codec | None:
+    """
+    按 Accept-Encoding 选择编码
+
+    取 q 值最高的可用编码，q 相同时按服务端偏好；`*` 匹配未显式列出的编码，q=0 表示拒绝。
+    """
+    if not accept_encoding:
+        return None
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    best: Codec | None = None
+    best_quality = 0.0
+    for codec in codecs:
+        quality = qualities.get(codec.name, wildcard)
+        if quality > best_quality:
+            best, best_quality = codec, quality
+    return best
+
+
+class CompressionMiddleware:
+    """按协商结果压缩响应体，见模块说明"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, maximum_size: int = 8 * 1024 * 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.maximum_size = maximum_size
+        self.codecs = available_codecs()
+        self._negotiated: dict[str, Codec | None] = {}
+
+    def _negotiate(self, accept_encoding: str | None) -> Codec | None:
+        if not accept_encoding:
+            return None
+        try:
+            return self._negotiated[accept_encoding]
+        except KeyError:
+            codec = negotiate(accept_encoding, self.codecs)
+            if len(self._negotiated) < NEGOTIATION_CACHE_SIZE:
+                self._negotiated[accept_encoding] = codec
+            return codec
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        codec = self._negotiate(Headers(scope=scope).get("accept-encoding"))
+        if codec is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self.app, codec, self.minimum_size, self.maximum_size)
+        await responder(scope, receive, send)
+
+
+class _CompressionResponder:
+    """单个请求的压缩状态：暂存响应头，根据首个响应体决定是否压缩"""
+
+    def __init__(self, app: ASGIApp, codec: Codec, minimum_size: int, maximum_size: int):
+        self.app = app
+        self.codec = codec
+        self.minimum_size = minimum_size
+        self.maximum_size = maximum_size
+        self.send: Send | None = None
+        self.start_message: Message | None = None
+        self.passthrough = False
+        self.buffer = bytearray()
+        self.stream: StreamCompressor | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    def _should_compress(self, message: Message) -> bool:
+        if message["status"] < 200 or message["status"] in (204, 206, 304):
+            return False
+        # 每个响应都会经过这里：只遍历一次原始响应头（ASGI 头名为小写）
+        content_type = ""
+        for key, value in message["headers"]:
+            if key == b"content-type":
+                content_type = value.decode("latin-1").lower()
+            elif key == b"content-length":
+                if not self._compressible_length(value):
+                    return False
+            elif (
+                key in (b"content-encoding", b"content-range")
+                # 支持 Range 的文件响应：压缩后字节偏移对不上，断点续传会拼出损坏的文件
+                or (key == b"accept-ranges" and value.lower() != b"none")
+                or (key == b"cache-control" and b"no-transform" in value.lower())
+            ):
+                return False
+        return content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith(SKIPPED_TYPES)
+
+    def _compressible_length(self, value: bytes) -> bool:
+        """声明的 Content-Length 在 [minimum_size, maximum_size] 内（无法解析时不压缩）"""
+        try:
+            length = int(value)
+        except ValueError:
+            return False
+        return self.minimum_size <= length <= self.maximum_size
+
+    def _compressed_headers(self, content_length: int | None) -> list[tuple[bytes, bytes]]:
+        headers = MutableHeaders(raw=list(self.start_message["headers"]))
+        headers["Content-Encoding"] = self.codec.name
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        # 压缩后的字节与原表示不同，强 ETag 降为弱 ETag
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        return headers.raw
+
+    async def send_with_compression(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.start_message = message
+            if not self._should_compress(message):
+                self.passthrough = True
+                _responses_counter.inc(encoding=self.codec.name, result="skipped")
+                await self.send(message)
+            return
+
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        if message_type != "http.response.body":
+            # pathsend 等扩展消息无法压缩：原样发出暂存的响应头
+            self.passthrough = True
+            _responses_counter.inc(encoding=self.codec.name, result="skipped")
+            await self.send(self.start_message)
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.stream is not None:
+            data = self.stream.compress(body) if body else b""
+            if not more_body:
+                data += self.stream.finish()
+            _bytes_in_counter.inc(len(body), encoding=self.codec.name)
+            _bytes_out_counter.inc(len(data), encoding=self.codec.name)
+            if data or not more_body:
+                await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        self.buffer += body
+        if more_body and len(self.buffer) < self.minimum_size:
+            return
+
+        payload = bytes(self.buffer)
+        self.buffer.clear()
+        if not more_body:
+            await self._send_complete(payload)
+            return
+
+        # 流式响应：攒够阈值后开始压缩，此后逐块 flush
+        self.stream = self.codec.stream()
+        data = self.stream.compress(payload)
+        _responses_counter.inc(encoding=self.codec.name, result="streamed")
+        _bytes_in_counter.inc(len(payload), encoding=self.codec.name)
+        _bytes_out_counter.inc(len(data), encoding=self.codec.name)
+        await self.send({**self.start_message, "headers": self._compressed_headers(None)})
+        await self.send({"type": "http.response.body", "body": data, "more_body": True})
+
+    async def _send_complete(self, payload: bytes) -> None:
+        """一次性响应：整体压缩，太小或没有变小时原样返回"""
+        compressed = None
+        if len(payload) >= THREAD_COMPRESS_SIZE:
+            # 较大的响应体在线程中压缩，避免阻塞事件循环
+            compressed = await anyio.to_thread.run_sync(self.codec.compress, payload)
+        elif len(payload) >= self.minimum_size:
+            compressed = self.codec.compress(payload)
+        if compressed is None or len(compressed) >= len(payload):
+            _responses_counter.inc(encoding=self.codec.name, result="skipped")
+            await self.send(self.start_message)
+            await self.send({"type": "http.response.body", "body": payload, "more_body": False})
+            return
+
+        _responses_counter.inc(encoding=self.codec.name, result="compressed")
+        _bytes_in_counter.inc(len(payload), encoding=self.codec.name)
+        _bytes_out_counter.inc(len(compressed), encoding=self.codec.name)
+        await self.send({**self.start_message, "headers": self._compressed_headers(len(compressed))})
+        await self.send({"type": "http.response.body", "body": compressed, "more_body": False})
@@ -0,0 +1,225 @@
+"""
+数据库连接池与读写路由
+
+SQLite 场景：
+- 一个写连接（default），所有写操作与事务在其锁上串行执行
+- 多个只读连接（reader_N，PRAGMA query_only=ON），各自拥有独立的 aiosqlite 线程
+- ReadWriteRouter 将读查询路由到最空闲的只读连接，写查询路由到写连接
+
+每个连接的锁（PostgreSQL 场景下为连接池，见 db_pool_asyncpg）都经过埋点，
+记录使用量、排队深度与等待时间，可通过 /api/monitor/metrics 中的 db_* 指标
+或仪表盘的数据库连接面板查看。请求追踪中的 db 阶段为持有连接的时间，
+db_wait 为排队时间（不足 TRACE_DB_WAIT_MIN_MS 时不记录）。
+"""
+
+import asyncio
+import itertools
+import time
+from typing import Any
+
+from tortoise.backends.base.client import TransactionalDBClient
+from tortoise.backends.sqlite.client import SqliteClient
+from tortoise.connection import connections
+
+from src.backend.config.settings import settings
+from src.backend.core.metrics import metrics
+from src.backend.core.tracing import Trace, current_trace
+
+WRITER_CONNECTION = "default"
+READER_PREFIX = "reader_"
+
+_wait_histogram = metrics.histogram(
+    "db_connection_wait_seconds",
+    "获取数据库连接的等待时间",
+)
+_waiting_gauge = metrics.gauge("db_connection_waiting", "等待获取连接的任务数（排队深度）")
+_in_use_gauge = metrics.gauge("db_connection_in_use", "正在使用中的连接数")
+_idle_gauge = metrics.gauge("db_connection_idle", "空闲可用的连接数")
+_size_gauge = metrics.gauge("db_connection_pool_size", "连接池容量（最大连接数）")
+
+
+class ConnectionStats:
+    """单个连接（或连接池）的使用统计"""
+
+    def __init__(self, name: str, role: str, size: int = 1):
+        self.name = name
+        self.role = role
+        self.size = size
+        self.in_use = 0
+        self.waiting = 0
+        self.acquired_total = 0
+        self.wait_seconds_total = 0.0
+        self.max_wait_seconds = 0.0
+        self.resize(size)
+
+    def resize(self, size: int) -> None:
+        """更新连接池容量（连接池在首次建连时才确定大小）"""
+        self.size = size
+        _size_gauge.set(size, connection=self.name)
+        self._publish_usage()
+
+    def _publish_usage(self) -> None:
+        _in_use_gauge.set(self.in_use, connection=self.name)
+        _idle_gauge.set(max(self.size - self.in_use, 0), connection=self.name)
+
+    def begin_wait(self) -> float:
+        self.waiting += 1
+        _waiting_gauge.set(self.waiting, connection=self.name)
+        return time.perf_counter()
+
+    def end_wait(self, started: float) -> None:
+        waited = time.perf_counter() - started
+        self.waiting -= 1
+        self.in_use += 1
+        self.acquired_total += 1
+        self.wait_seconds_total += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        _waiting_gauge.set(self.waiting, connection=self.name)
+        self._publish_usage()
+        _wait_histogram.observe(waited, connection=self.name)
+
+    def cancel_wait(self) -> None:
+        self.waiting -= 1
+        _waiting_gauge.set(self.waiting, connection=self.name)
+
+    def release(self) -> None:
+        self.in_use -= 1
+        self._publish_usage()
+
+    @property
+    def load(self) -> int:
+        return self.in_use + self.waiting
+
+    def snapshot(self) -> dict[str, Any]:
+        avg_wait = (
+            self.wait_seconds_total / self.acquired_total if self.acquired_total else 0
+        )
+        return {
+            "name": self.name,
+            "role": self.role,
+            "size": self.size,
+            "in_use": self.in_use,
+            "idle": max(self.size - self.in_use, 0),
+            "waiting": self.waiting,
+            "acquired_total": self.acquired_total,
+            "avg_wait_ms": round(avg_wait * 1000, 3),
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+        }
+
+
+class ConnectionStatsRegistry:
+    """所有连接统计的注册表"""
+
+    def __init__(self):
+        self._stats: dict[str, ConnectionStats] = {}
+
+    def register(self, name: str, role: str, size: int = 1) -> ConnectionStats:
+        stats = ConnectionStats(name, role, size)
+        self._stats[name] = stats
+        return stats
+
+    def get(self, name: str) -> ConnectionStats | None:
+        return self._stats.get(name)
+
+    def by_role(self, role: str) -> list[ConnectionStats]:
+        return [s for s in self._stats.values() if s.role == role]
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        return [stats.snapshot() for stats in self._stats.values()]
+
+
+db_stats: ConnectionStatsRegistry = ConnectionStatsRegistry()
+
+
+def trace_acquired(started: float) -> tuple[Trace, float] | None:
+    """获取到连接时记录当前请求的 db_wait 阶段，返回 (追踪, 获取时间) 供释放时记录 db 阶段"""
+    trace = current_trace()
+    if trace is None:
+        return None
+    acquired = time.perf_counter()
+    if (acquired - started) * 1000 >= settings.TRACE_DB_WAIT_MIN_MS:
+        trace.add("db_wait", started, acquired)
+    return trace, acquired
+
+
+def trace_released(held: tuple[Trace, float] | None) -> None:
+    if held is not None:
+        trace, acquired = held
+        trace.add("db", acquired, time.perf_counter())
+
+
+class InstrumentedLock(asyncio.Lock):
+    """记录排队深度与等待时间的 asyncio.Lock"""
+
+    def __init__(self, stats: ConnectionStats):
+        super().__init__()
+        self._stats = stats
+        # 锁同一时间只有一个持有者
+        self._held: tuple[Trace, float] | None = None
+
+    async def acquire(self) -> bool:
+        started = self._stats.begin_wait()
+        try:
+            await super().acquire()
+        except BaseException:
+            self._stats.cancel_wait()
+            raise
+        self._stats.end_wait(started)
+        self._held = trace_acquired(started)
+        return True
+
+    def release(self) -> None:
+        held, self._held = self._held, None
+        trace_released(held)
+        super().release()
+        self._stats.release()
+
+
+class RoutedSqliteClient(SqliteClient):
+    """
+    带锁埋点的 SQLite 客户端
+
+    连接名以 reader_ 开头时作为只读连接注册
+    """
+
+    def __init__(self, file_path: str, **kwargs: Any) -> None:
+        super().__init__(file_path, **kwargs)
+        role = (
+            "reader"
+            if self.connection_name.startswith(READER_PREFIX)
+            else "writer"
+        )
+        self._lock = InstrumentedLock(db_stats.register(self.connection_name, role))
+
+
+class ReadWriteRouter:
+    """
+    Tortoise 读写路由
+
+    - 写操作：写连接
+    - 读操作：最空闲的只读连接；若当前任务处于写连接的事务中则返回 None，
+      由 Tortoise 回落到事务连接，保证事务内读到自己的写入
+    """
+
+    def __init__(self):
+        self._counter = itertools.count()
+
+    def db_for_read(self, _model: type) -> str | None:
+        if isinstance(connections.get(WRITER_CONNECTION), TransactionalDBClient):
+            return None
+
+        readers = db_stats.by_role("reader")
+        if not readers:
+            return None
+
+        # 负载相同时轮询，避免总是命中第一个连接
+        offset = next(self._counter) % len(readers)
+        rotated = readers[offset:] + readers[:offset]
+        return min(rotated, key=lambda s: s.load).name
+
+    def db_for_write(self, _model: type) -> str:
+        return WRITER_CONNECTION
+
+
+# Tortoise 引擎入口：engine="src.backend.core.db_pool" 时使用
+client_class = RoutedSqliteClient
@@ -0,0 +1,79 @@
+"""
+带埋点的 PostgreSQL（asyncpg）连接池
+
+Tortoise 的所有查询与事务都通过 `client._pool.acquire()` / `release()` 获取连接，
+这里用 InstrumentedPool 包装 asyncpg 连接池，复用 db_pool 的连接统计，
+记录使用量、排队深度与获取连接的等待时间，并计入请求追踪的 db / db_wait 阶段。
+
+Tortoise 引擎入口：engine="src.backend.core.db_pool_asyncpg"
+"""
+
+from typing import Any
+
+from tortoise.backends.asyncpg.client import AsyncpgDBClient
+
+from src.backend.core.db_pool import (
+    ConnectionStats,
+    db_stats,
+    trace_acquired,
+    trace_released,
+)
+from src.backend.core.tracing import Trace
+
+
+class InstrumentedPool:
+    """
+    连接池包装器
+
+    只拦截 acquire / release，其余属性透传给被包装的连接池。
+    任何提供 `await acquire()` / `await release(conn)` 的连接池都可以被包装。
+    """
+
+    def __init__(self, pool: Any, stats: ConnectionStats):
+        self._pool = pool
+        self._stats = stats
+        # 连接 id -> (追踪, 获取时间)
+        self._held: dict[int, tuple[Trace, float]] = {}
+
+    async def acquire(self, **kwargs: Any) -> Any:
+        started = self._stats.begin_wait()
+        try:
+            connection = await self._pool.acquire(**kwargs)
+        except BaseException:
+            self._stats.cancel_wait()
+            raise
+        self._stats.end_wait(started)
+        held = trace_acquired(started)
+        if held is not None:
+            self._held[id(connection)] = held
+        return connection
+
+    async def release(self, connection: Any, **kwargs: Any) -> None:
+        trace_released(self._held.pop(id(connection), None))
+        try:
+            await self._pool.release(connection, **kwargs)
+        finally:
+            self._stats.release()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pool, name)
+
+
+class InstrumentedAsyncpgClient(AsyncpgDBClient):
+    """连接池带埋点的 asyncpg 客户端"""
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._stats = db_stats.register(
+            self.connection_name,
+            "pool",
+            self.pool_maxsize,
+        )
+
+    async def create_pool(self, **kwargs: Any) -> InstrumentedPool:
+        pool = await super().create_pool(**kwargs)
+        self._stats.resize(self.pool_maxsize)
+        return InstrumentedPool(pool, self._stats)
+
+
+client_class = InstrumentedAsyncpgClient
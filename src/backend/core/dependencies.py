@@ -3,15 +3,28 @@ FastAPI依赖注入
 提供全局依赖函数
 """
 
+from collections.abc import Awaitable, Callable
 from typing import Annotated
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from src.backend.core.exceptions import PermissionDeniedError
 from src.backend.core.security import decode_access_token
 
 security = HTTPBearer()
 
+# 按用户 ID 读取启用用户的角色（用户不存在或已禁用时返回 None）。
+# 由用户功能模块注册，core 不直接依赖具体的用户模型
+RoleLoader = Callable[[int], Awaitable[str | None]]
+_role_loader: RoleLoader | None = None
+
+
+def set_role_loader(loader: RoleLoader) -> None:
+    """注册管理员校验使用的角色读取函数"""
+    global _role_loader
+    _role_loader = loader
+
 
 async def get_current_user_id(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
@@ -44,5 +57,23 @@ async def get_current_user_id(
     return int(user_id)
 
 
+async def get_current_admin_id(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+) -> int:
+    """
+    获取当前管理员用户ID
+
+    角色每次从数据库读取（经用户缓存，用户保存 / 删除时失效），
+    降级或禁用的管理员在令牌过期前也会立即失去权限
+    """
+    user_id = await get_current_user_id(credentials)
+
+    if _role_loader is None or await _role_loader(user_id) != "admin":
+        raise PermissionDeniedError("需要管理员权限")
+
+    return user_id
+
+
 # 类型别名，方便使用
 CurrentUserId = Annotated[int, Depends(get_current_user_id)]
+CurrentAdminId = Annotated[int, Depends(get_current_admin_id)]
@@ -4,9 +4,9 @@
 """
 
 from fastapi import HTTPException, Request, status
-from fastapi.responses import JSONResponse
 
 from src.backend.core.logger import logger
+from src.backend.core.serialization import FastJSONResponse
 
 
 class APIError(HTTPException):
@@ -123,7 +123,7 @@ class BusinessError(APIError):
 async def validation_exception_handler(
     _request: Request,
     exc: Exception,
-) -> JSONResponse:
+) -> FastJSONResponse:
     """
     Pydantic验证错误处理器
     """
@@ -135,7 +135,7 @@ async def validation_exception_handler(
     else:
         error_details = [str(exc)]
 
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "success": False,
@@ -146,7 +146,7 @@ async def validation_exception_handler(
     )
 
 
-async def global_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def global_exception_handler(request: Request, exc: Exception) -> FastJSONResponse:
     """
     全局异常处理器
     捕获所有未处理的异常
@@ -159,7 +159,7 @@ async def global_exception_handler(request: Request, exc: Exception) -> JSONResp
     if hasattr(request.app.state, "settings") and request.app.state.settings.DEBUG:
         details = {"error": str(exc), "type": type(exc).__name__}
 
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "success": False,
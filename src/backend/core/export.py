@@ -0,0 +1,194 @@
+"""
+流式表导出
+
+按主键 keyset 分块读取模型数据，每块直接编码为 NDJSON / CSV 字节并交给
+StreamingResponse，可选在线 gzip 压缩；任何时刻内存中只有一个数据块，
+占用与表的总行数无关。
+
+各 feature 通过 export_tables.register() 声明可导出的表与字段（敏感字段
+如密码哈希不要加入），管理端的通用导出接口据此提供下载。
+"""
+
+import csv
+import io
+import json
+import zlib
+from collections.abc import AsyncIterator, Sequence
+from typing import Any, Literal
+
+from fastapi.responses import StreamingResponse
+from tortoise.models import Model
+
+from src.backend.core.metrics import metrics
+
+ExportFormat = Literal["ndjson", "csv"]
+
+# 每次读取的行数
+EXPORT_CHUNK_SIZE = 1000
+# gzip 压缩级别（1 最快，9 压缩率最高）
+GZIP_LEVEL = 6
+
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+_rows_counter = metrics.counter("export_rows_total", "流式导出的行数")
+_bytes_counter = metrics.counter("export_bytes_total", "流式导出的字节数（压缩后）")
+
+
+class ExportTable:
+    """一张可导出的表"""
+
+    def __init__(self, name: str, model: type[Model], fields: Sequence[str]):
+        self.name = name
+        self.model = model
+        self.fields = tuple(fields)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "model": self.model.__name__,
+            "fields": list(self.fields),
+        }
+
+
+class ExportRegistry:
+    """可导出表的注册表"""
+
+    def __init__(self):
+        self._tables: dict[str, ExportTable] = {}
+
+    def register(self, name: str, model: type[Model], fields: Sequence[str]) -> ExportTable:
+        table = ExportTable(name, model, fields)
+        self._tables[name] = table
+        return table
+
+    def get(self, name: str) -> ExportTable | None:
+        return self._tables.get(name)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        return [table.snapshot() for table in self._tables.values()]
+
+
+export_tables: ExportRegistry = ExportRegistry()
+
+
+def encode_rows(
+    rows: list[dict[str, Any]],
+    fields: Sequence[str],
+    fmt: ExportFormat,
+    header: bool,
+) -> bytes:
+    """将一块数据编码为字节"""
+    if fmt == "ndjson":
+        return "".join(
+            json.dumps(
+                {field: row[field] for field in fields},
+                default=str,
+                ensure_ascii=False,
+            )
+            + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(fields)
+    writer.writerows([row[field] for field in fields] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+async def iter_model_chunks(
+    model: type[Model],
+    fields: Sequence[str],
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """
+    按主键 keyset 分块读取模型数据
+
+    每块都是一次 "WHERE pk > last ORDER BY pk LIMIT n" 查询，
+    与 OFFSET 不同，越往后读取的代价并不会变高。
+    """
+    pk = model._meta.pk_attr  # noqa: SLF001
+    columns = list(dict.fromkeys((pk, *fields)))
+    query = model.all()
+    while True:
+        rows = await query.order_by(pk).limit(chunk_size).values(*columns)
+        if not rows:
+            return
+        yield rows
+        if len(rows) < chunk_size:
+            return
+        query = model.filter(**{f"{pk}__gt": rows[-1][pk]})
+
+
+async def stream_export(
+    model: type[Model],
+    fields: Sequence[str],
+    fmt: ExportFormat,
+    *,
+    compress: bool = False,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """
+    流式导出模型数据
+
+    Args:
+        model: 导出的模型
+        fields: 导出的字段（CSV 的列顺序）
+        fmt: ndjson | csv
+        compress: 是否在线 gzip 压缩
+        chunk_size: 每次读取的行数
+    """
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31) if compress else None
+    table = model._meta.db_table  # noqa: SLF001
+    header = True
+
+    def emit(data: bytes) -> bytes:
+        if compressor is not None:
+            data = compressor.compress(data)
+        _bytes_counter.inc(len(data), table=table)
+        return data
+
+    async for rows in iter_model_chunks(model, fields, chunk_size):
+        _rows_counter.inc(len(rows), table=table)
+        data = emit(encode_rows(rows, fields, fmt, header))
+        header = False
+        if data:
+            yield data
+
+    if header and fmt == "csv":
+        # 空表也输出表头
+        yield emit(encode_rows([], fields, fmt, header=True))
+    if compressor is not None:
+        tail = compressor.flush()
+        _bytes_counter.inc(len(tail), table=table)
+        yield tail
+
+
+def export_response(
+    stream: AsyncIterator[bytes],
+    filename: str,
+    fmt: ExportFormat,
+    *,
+    compress: bool = False,
+) -> StreamingResponse:
+    """
+    构造下载响应
+
+    压缩时以 .gz 附件下载（application/gzip），而不是设置 Content-Encoding，
+    避免浏览器或代理自动解压后再落盘。
+    """
+    if compress:
+        filename = f"{filename}.{fmt}.gz"
+        media_type = "application/gzip"
+    else:
+        filename = f"{filename}.{fmt}"
+        media_type = MEDIA_TYPES[fmt]
+    return StreamingResponse(
+        stream,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,249 @@
+"""
+功能模块注册表
+
+发现 src/features/*/backend 下的功能模块，记录每个模块的路由、模型与挂载参数：
+- 路由：backend/router.py 中模块级的 `router`
+- 模型：backend/models.py（注册到 Tortoise 的 models 应用）
+- 挂载参数：backend/__init__.py 中的 PREFIX（默认 /<功能名>）、TAGS（默认 [功能名]）、LAZY
+
+发现过程只解析源码（ast），不导入任何功能模块。结果写入 src/features/manifest.json
+（pnpm features:manifest）：开发环境每次启动重新扫描，新增功能无需手动注册；
+生产环境（Docker / 桌面版）按清单挂载；存在源码目录时（Docker）启动时与扫描结果比对，
+清单过期直接启动失败，避免静默缺失路由或模型。桌面版没有源码目录，打包前重新生成清单。
+
+LAZY = True 的功能（不常用的管理页面等）在生产环境只挂载一个占位路由，第一次请求到达时
+才导入路由模块并原位替换为真实路由；开发环境总是立即挂载（生成 OpenAPI 需要完整路由）。
+"""
+
+import ast
+import json
+import sys
+import time
+from importlib import import_module
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI
+from loguru import logger
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+from src.backend.config.settings import settings
+from src.backend.core.path_conf import get_base_dir, get_resource_path
+
+FEATURES_PACKAGE = "src.features"
+FEATURES_DIR = "src/features"
+MANIFEST_FILE = "manifest.json"
+# backend/__init__.py 中可声明的挂载参数
+MOUNT_CONSTANTS = ("PREFIX", "TAGS", "LAZY")
+
+
+def read_module_constants(path: Path, names: tuple[str, ...]) -> dict[str, Any]:
+    """读取模块顶层的字面量常量（只解析不导入）"""
+    if not path.exists():
+        return {}
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    constants: dict[str, Any] = {}
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and len(node.targets) == 1
+            and isinstance(node.targets[0], ast.Name)
+            and node.targets[0].id in names
+        ):
+            constants[node.targets[0].id] = ast.literal_eval(node.value)
+    return constants
+
+
+def defines_name(path: Path, name: str) -> bool:
+    """模块顶层是否定义了指定名称（赋值或带注解的赋值）"""
+    if not path.exists():
+        return False
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, ast.AnnAssign):
+            targets = [node.target]
+        else:
+            continue
+        if any(isinstance(target, ast.Name) and target.id == name for target in targets):
+            return True
+    return False
+
+
+def scan_features(features_dir: Path) -> list[dict[str, Any]]:
+    """扫描功能目录，按功能名排序"""
+    features: list[dict[str, Any]] = []
+    for backend_dir in sorted(features_dir.glob("*/backend")):
+        name = backend_dir.parent.name
+        if not backend_dir.is_dir() or name.startswith(("_", ".")):
+            continue
+        module = f"{FEATURES_PACKAGE}.{name}.backend"
+        router_file = backend_dir / "router.py"
+        models_file = backend_dir / "models.py"
+        constants = read_module_constants(backend_dir / "__init__.py", MOUNT_CONSTANTS)
+        features.append(
+            {
+                "name": name,
+                "router": f"{module}.router" if defines_name(router_file, "router") else None,
+                "models": f"{module}.models" if models_file.exists() else None,
+                "prefix": constants.get("PREFIX", f"/{name}"),
+                "tags": list(constants.get("TAGS", [name])),
+                "lazy": bool(constants.get("LAZY", False)),
+            },
+        )
+    return features
+
+
+def build_manifest(features_dir: Path) -> dict[str, Any]:
+    """生成功能清单"""
+    return {"features": scan_features(features_dir)}
+
+
+def load_manifest() -> dict[str, Any] | None:
+    """读取随包分发的功能清单，不存在时返回 None"""
+    path = get_resource_path(f"{FEATURES_DIR}/{MANIFEST_FILE}")
+    if path is None:
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+class LazyFeatureRoute(BaseRoute):
+    """
+    延迟挂载的占位路由
+
+    匹配功能前缀下的所有请求；第一次命中时导入路由模块，用真实路由原位替换自身，
+    再把请求重新交给应用路由分发。
+    """
+
+    def __init__(self, registry: "FeatureRegistry", app: FastAPI, feature: dict[str, Any], prefix: str):
+        self.registry = registry
+        self.app = app
+        self.name = feature["name"]
+        self.path = prefix + feature["prefix"]
+
+    def matches(self, scope: Scope) -> tuple[Match, Scope]:
+        if scope["type"] not in ("http", "websocket"):
+            return Match.NONE, {}
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path) :]
+        if path == self.path or path.startswith(self.path + "/"):
+            return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params: Any):
+        raise NoMatchFound(name, path_params)
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.registry.load(self.app, self.name)
+        await self.app.router(scope, receive, send)
+
+
+class FeatureRegistry:
+    """功能模块注册表：发现功能、提供模型列表、把路由挂载到应用"""
+
+    def __init__(self):
+        self._features: list[dict[str, Any]] | None = None
+        self.source: str | None = None
+        self.prefix = ""
+
+    @property
+    def features(self) -> list[dict[str, Any]]:
+        if self._features is None:
+            self._features = self._discover()
+        return self._features
+
+    def _discover(self) -> list[dict[str, Any]]:
+        features_dir = get_base_dir() / FEATURES_DIR
+        is_frozen = getattr(sys, "frozen", False)
+        if settings.ENVIRONMENT == "development" and not is_frozen and features_dir.exists():
+            self.source = "scan"
+            return scan_features(features_dir)
+
+        manifest = load_manifest()
+        if manifest is not None:
+            features = manifest["features"]
+            if not is_frozen and features_dir.exists() and scan_features(features_dir) != features:
+                error_msg = "❌ CRITICAL: Feature manifest is out of date (run pnpm features:manifest before building)"
+                logger.critical(error_msg)
+                raise RuntimeError(error_msg)
+            self.source = "manifest"
+            return features
+
+        if is_frozen or not features_dir.exists():
+            error_msg = "❌ CRITICAL: Feature manifest NOT found (run pnpm features:manifest before building)"
+            logger.critical(error_msg)
+            raise RuntimeError(error_msg)
+        logger.warning("⚠️ 未找到功能清单（请运行 pnpm features:manifest），扫描功能目录")
+        self.source = "scan"
+        return scan_features(features_dir)
+
+    def model_modules(self) -> list[str]:
+        """Tortoise models 应用需要注册的模型模块"""
+        return [feature["models"] for feature in self.features if feature["models"]]
+
+    def router_modules(self) -> list[str]:
+        return [feature["router"] for feature in self.features if feature["router"]]
+
+    @property
+    def lazy_enabled(self) -> bool:
+        return settings.LAZY_FEATURE_ROUTERS and settings.ENVIRONMENT != "development"
+
+    def mount(self, app: FastAPI, prefix: str = "/api") -> None:
+        """挂载所有功能路由：立即挂载或放置占位路由"""
+        self.prefix = prefix
+        for feature in self.features:
+            if not feature["router"]:
+                continue
+            if feature["lazy"] and self.lazy_enabled:
+                app.router.routes.append(LazyFeatureRoute(self, app, feature, prefix))
+            else:
+                self._include(app, feature)
+        logger.debug(
+            f"🧩 已挂载 {len(self.router_modules())} 个功能模块（来源: {self.source}，"
+            f"延迟: {', '.join(self.pending(app)) or '无'}）",
+        )
+
+    def _include(self, app: FastAPI, feature: dict[str, Any]) -> None:
+        router = import_module(feature["router"]).router
+        app.include_router(router, prefix=self.prefix + feature["prefix"], tags=feature["tags"])
+
+    def pending(self, app: FastAPI) -> list[str]:
+        """尚未载入的延迟功能"""
+        return [route.name for route in app.router.routes if isinstance(route, LazyFeatureRoute)]
+
+    def load(self, app: FastAPI, name: str) -> None:
+        """载入延迟功能：导入路由模块，用真实路由替换占位路由（同步执行，不会与其他请求交错）"""
+        routes = app.router.routes
+        index = next(
+            (i for i, route in enumerate(routes) if isinstance(route, LazyFeatureRoute) and route.name == name),
+            None,
+        )
+        if index is None:
+            return
+        feature = next(feature for feature in self.features if feature["name"] == name)
+
+        started = time.perf_counter()
+        # include_router 把路由追加到末尾（SPA 兜底路由之后），取出后放回占位路由的位置
+        count = len(routes)
+        self._include(app, feature)
+        loaded = routes[count:]
+        del routes[count:]
+        routes[index : index + 1] = loaded
+        app.openapi_schema = None
+        logger.info(
+            f"🧩 已按需载入功能模块 {name}（{len(loaded)} 个路由，"
+            f"{(time.perf_counter() - started) * 1000:.0f}ms）",
+        )
+
+    def load_all(self, app: FastAPI) -> None:
+        """载入全部延迟功能（生成 OpenAPI 前调用）"""
+        for name in self.pending(app):
+            self.load(app, name)
+
+
+# 全局单例
+feature_registry = FeatureRegistry()
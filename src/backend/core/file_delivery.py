@@ -0,0 +1,301 @@
+"""
+大文件下发（零拷贝 / pread + HTTP Range）
+
+RangeFileResponse 沿用 FileResponse 的构造参数与 stat 响应头，自行实现下发与 Range 处理：
+- http.response.pathsend / http.response.zerocopysend：服务器声明了对应的 ASGI 扩展时，
+  把路径或文件描述符直接交给服务器（os.sendfile），文件内容不经过 Python
+- 否则在工作线程中按块 os.pread（没有 pread 的平台退回 seek + read），
+  事件循环上不做任何磁盘 IO，常驻内存只有一个块，与文件大小无关（多 GB 文件同样适用）
+
+文件在响应开始前打开一次，Content-Length / ETag / Last-Modified 以打开后的 fstat 为准
+（调用方传入的 stat_result 可能已过期）；发送过程中文件被截断时中止响应，而不是发送不完整的内容。
+
+Range 按 RFC 9110 处理：单段返回 206 + Content-Range；多段合并重叠区间后以标准的
+multipart/byteranges 返回（CRLF 分隔、Content-Type 携带 boundary）；没有可满足的区间时返回 416；
+格式不合法、If-Range 不匹配或段数超过 MAX_RANGES 时忽略 Range 返回整个文件。
+"""
+
+import os
+import re
+import stat
+from collections.abc import Sequence
+from pathlib import Path
+from secrets import token_hex
+from typing import BinaryIO
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from src.backend.core.metrics import metrics
+
+# 每条 http.response.body 消息的大小（也是每次 pread 的大小）
+CHUNK_SIZE = 256 * 1024
+# 多段 Range 的段数上限，防止大量细碎区间放大响应
+MAX_RANGES = 16
+
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+PATHSEND_EXTENSION = "http.response.pathsend"
+
+# 单个区间：first-last / first- / -suffix
+_RANGE_SPEC = re.compile(r"^(\d*)-(\d*)$", re.ASCII)
+
+_responses_counter = metrics.counter("file_delivery_responses_total", "大文件下发响应数（按方式与状态码）")
+_bytes_counter = metrics.counter("file_delivery_bytes_total", "大文件下发的文件内容字节数")
+
+
+def merge_ranges(ranges: Sequence[tuple[int, int]]) -> list[tuple[int, int]]:
+    """按起点排序并合并重叠或相邻的 [start, end) 区间"""
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def parse_ranges(value: str, file_size: int) -> list[tuple[int, int]] | None:
+    """
+    解析 Range 头为合并后的 [start, end) 区间
+
+    Returns:
+        None 表示应忽略 Range（非 bytes 单位或格式不合法）；
+        空列表表示没有可满足的区间（416）
+    """
+    unit, _, spec = value.partition("=")
+    if unit.strip().lower() != "bytes":
+        return None
+
+    ranges: list[tuple[int, int]] = []
+    parts = [part.strip() for part in spec.split(",") if part.strip()]
+    if not parts:
+        return None
+    for part in parts:
+        match = _RANGE_SPEC.match(part.replace(" ", ""))
+        if match is None:
+            return None
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            if last and int(last) < start:
+                return None
+            if start >= file_size:
+                continue
+            end = min(int(last) + 1, file_size) if last else file_size
+        elif last:
+            suffix = int(last)
+            if suffix == 0 or file_size == 0:
+                continue
+            start, end = max(file_size - suffix, 0), file_size
+        else:
+            return None
+        ranges.append((start, end))
+    return merge_ranges(ranges)
+
+
+def _open_regular(path: str | os.PathLike[str]) -> tuple[BinaryIO, os.stat_result]:
+    """打开文件并 fstat（在工作线程中调用），文件由调用方在响应结束后关闭"""
+    file = Path(path).open("rb")  # noqa: SIM115 - 文件对象交给响应，在发送结束后关闭
+    stat_result = os.fstat(file.fileno())
+    if not stat.S_ISREG(stat_result.st_mode):
+        file.close()
+        raise RuntimeError(f"不是普通文件: {path}")
+    return file, stat_result
+
+
+def _read_at(file: BinaryIO, offset: int, size: int) -> bytes:
+    """读取 [offset, offset + size)（在工作线程中调用）"""
+    if hasattr(os, "pread"):
+        return os.pread(file.fileno(), size, offset)
+    # Windows 没有 pread：每个响应独占一个文件对象，seek + read 同样安全
+    file.seek(offset)
+    return file.read(size)
+
+
+class RangeFileResponse(FileResponse):
+    """
+    支持 Range 的文件响应，优先零拷贝，否则在线程中 pread 分块
+
+    用法与 FileResponse 相同；已知 stat 结果时传入 stat_result 可提前生成 ETag 等响应头，
+    发送前仍会以打开文件后的 fstat 校正。
+    """
+
+    chunk_size = CHUNK_SIZE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        extensions = scope.get("extensions") or {}
+        self._zerocopy = ZEROCOPY_EXTENSION in extensions
+        send_header_only = scope["method"].upper() == "HEAD"
+
+        try:
+            file, stat_result = await anyio.to_thread.run_sync(_open_regular, self.path)
+        except FileNotFoundError as e:
+            raise RuntimeError(f"文件不存在: {self.path}") from e
+
+        try:
+            self._apply_stat(stat_result)
+            file_size = stat_result.st_size
+            headers = Headers(scope=scope)
+            http_range = headers.get("range")
+            ranges = None
+            if http_range is not None and self.status_code == 200 and self._if_range_matches(headers.get("if-range")):
+                ranges = parse_ranges(http_range, file_size)
+
+            if ranges is None or len(ranges) > MAX_RANGES:
+                # 服务器可以忽略 Range（RFC 9110 §14.2），直接返回整个文件
+                send_pathsend = PATHSEND_EXTENSION in extensions and not self._zerocopy
+                await self._send_full(send, file, file_size, send_header_only, send_pathsend)
+            elif not ranges:
+                _responses_counter.inc(mode=self._mode, status="416")
+                response = Response(status_code=416, headers={"Content-Range": f"bytes */{file_size}"})
+                await response(scope, receive, send)
+                return
+            elif len(ranges) == 1:
+                start, end = ranges[0]
+                await self._send_single_range(send, file, start, end, file_size, send_header_only)
+            else:
+                await self._send_multiple_ranges(send, file, ranges, file_size, send_header_only)
+        finally:
+            file.close()
+
+        if self.background is not None:
+            await self.background()
+
+    @property
+    def _mode(self) -> str:
+        if self._zerocopy:
+            return "zerocopy"
+        return "pread"
+
+    def _apply_stat(self, stat_result: os.stat_result) -> None:
+        """以打开后的 fstat 为准设置 Content-Length / ETag / Last-Modified"""
+        previous = self.stat_result
+        if previous is not None and (previous.st_size, previous.st_mtime) != (
+            stat_result.st_size,
+            stat_result.st_mtime,
+        ):
+            for name in ("content-length", "last-modified", "etag"):
+                del self.headers[name]
+        self.stat_result = stat_result
+        self.set_stat_headers(stat_result)
+
+    def _if_range_matches(self, if_range: str | None) -> bool:
+        """If-Range 与当前 ETag 或 Last-Modified 一致时才使用 Range"""
+        return if_range is None or if_range in (self.headers["etag"], self.headers["last-modified"])
+
+    async def _send_full(
+        self,
+        send: Send,
+        file: BinaryIO,
+        file_size: int,
+        send_header_only: bool,
+        send_pathsend: bool,
+    ) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if send_header_only:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif send_pathsend:
+            _responses_counter.inc(mode="pathsend", status=str(self.status_code))
+            _bytes_counter.inc(file_size)
+            await send({"type": PATHSEND_EXTENSION, "path": str(self.path)})
+            return
+        else:
+            await self._send_file_range(send, file, 0, file_size, more_body=False)
+        _responses_counter.inc(mode=self._mode, status=str(self.status_code))
+
+    async def _send_single_range(
+        self,
+        send: Send,
+        file: BinaryIO,
+        start: int,
+        end: int,
+        file_size: int,
+        send_header_only: bool,
+    ) -> None:
+        self.headers["content-range"] = f"bytes {start}-{end - 1}/{file_size}"
+        self.headers["content-length"] = str(end - start)
+        await send({"type": "http.response.start", "status": 206, "headers": self.raw_headers})
+        if send_header_only:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        else:
+            await self._send_file_range(send, file, start, end, more_body=False)
+        _responses_counter.inc(mode=self._mode, status="206")
+
+    async def _send_multiple_ranges(
+        self,
+        send: Send,
+        file: BinaryIO,
+        ranges: list[tuple[int, int]],
+        file_size: int,
+        send_header_only: bool,
+    ) -> None:
+        boundary = token_hex(13)
+        content_type = self.headers["content-type"]
+        part_headers = [
+            (
+                f"--{boundary}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Range: bytes {start}-{end - 1}/{file_size}\r\n\r\n"
+            ).encode("latin-1")
+            for start, end in ranges
+        ]
+        closing = f"--{boundary}--\r\n".encode("latin-1")
+        content_length = (
+            sum(len(header) + (end - start) + 2 for header, (start, end) in zip(part_headers, ranges, strict=True))
+            + len(closing)
+        )
+
+        self.headers["content-type"] = f"multipart/byteranges; boundary={boundary}"
+        self.headers["content-length"] = str(content_length)
+        await send({"type": "http.response.start", "status": 206, "headers": self.raw_headers})
+        if send_header_only:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        else:
+            for header, (start, end) in zip(part_headers, ranges, strict=True):
+                await send({"type": "http.response.body", "body": header, "more_body": True})
+                await self._send_file_range(send, file, start, end, more_body=True)
+                await send({"type": "http.response.body", "body": b"\r\n", "more_body": True})
+            await send({"type": "http.response.body", "body": closing, "more_body": False})
+        _responses_counter.inc(mode=self._mode, status="206")
+
+    async def _send_file_range(
+        self,
+        send: Send,
+        file: BinaryIO,
+        start: int,
+        end: int,
+        *,
+        more_body: bool,
+    ) -> None:
+        """发送文件的 [start, end) 区间；more_body 表示之后是否还有其他消息"""
+        _bytes_counter.inc(end - start)
+        if self._zerocopy:
+            await send(
+                {
+                    "type": ZEROCOPY_EXTENSION,
+                    "file": file,
+                    "offset": start,
+                    "count": end - start,
+                    "more_body": more_body,
+                },
+            )
+            return
+        if start >= end:
+            await send({"type": "http.response.body", "body": b"", "more_body": more_body})
+            return
+
+        position = start
+        while position < end:
+            chunk = await anyio.to_thread.run_sync(_read_at, file, position, min(self.chunk_size, end - position))
+            if not chunk:
+                # 已发送的 Content-Length 无法兑现，中止响应让客户端重试
+                raise RuntimeError(f"文件在发送过程中被截断: {self.path}")
+            position += len(chunk)
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": more_body or position < end,
+                },
+            )
@@ -0,0 +1,86 @@
+"""
+批量密码哈希（进程池）
+
+本模块只依赖 bcrypt，保持极轻量：
+在 spawn 模式（Windows / macOS / PyInstaller）下子进程只需导入本模块，
+不会触发配置加载、日志文件创建等副作用。
+"""
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt
+
+# bcrypt 只支持最多 72 字节的密码
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = 0
+
+
+def hash_password(password: str, rounds: int) -> str:
+    """计算单个密码的 bcrypt 哈希（截断到 72 字节）"""
+    password_bytes = password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES]
+    return bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=rounds)).decode(
+        "utf-8",
+    )
+
+
+def hash_password_batch(passwords: list[str], rounds: int) -> list[str]:
+    """在子进程中执行的批量哈希任务"""
+    return [hash_password(password, rounds) for password in passwords]
+
+
+def get_hash_pool(max_workers: int = 0) -> ProcessPoolExecutor:
+    """
+    获取（懒创建）密码哈希进程池
+
+    Args:
+        max_workers: 进程数，0 表示使用 CPU 核数
+    """
+    global _pool, _pool_workers
+    if _pool is None:
+        _pool_workers = max_workers or os.cpu_count() or 1
+        _pool = ProcessPoolExecutor(max_workers=_pool_workers)
+    return _pool
+
+
+async def hash_passwords_parallel(
+    passwords: list[str],
+    rounds: int,
+    max_workers: int = 0,
+) -> list[str]:
+    """
+    将一批密码分片到进程池并行哈希，结果顺序与输入一致
+
+    Args:
+        passwords: 明文密码列表
+        rounds: bcrypt cost（子进程没有校准状态，需要显式传入）
+        max_workers: 进程数，0 表示使用 CPU 核数
+    """
+    if not passwords:
+        return []
+
+    pool = get_hash_pool(max_workers)
+    loop = asyncio.get_running_loop()
+
+    chunk_size = -(-len(passwords) // _pool_workers)
+    chunks = [
+        passwords[i : i + chunk_size] for i in range(0, len(passwords), chunk_size)
+    ]
+    results = await asyncio.gather(
+        *(
+            loop.run_in_executor(pool, hash_password_batch, chunk, rounds)
+            for chunk in chunks
+        ),
+    )
+    return [hashed for chunk in results for hashed in chunk]
+
+
+def shutdown_hash_pool() -> None:
+    """关闭进程池（应用关闭时调用）"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -0,0 +1,192 @@
+"""
+健康检查
+
+- /health/live：进程存活即返回 200，不访问任何依赖（供存活探针使用）
+- /health/ready：返回后台探测的缓存结果，请求本身不访问数据库或文件系统，
+  负载均衡轮询的频率与数量不会放大到依赖上
+
+调度器（src/backend/core/scheduler.py）每 HEALTH_CHECK_INTERVAL 秒探测一次：
+- database：执行 SELECT 1（超时 HEALTH_CHECK_TIMEOUT）
+- migrations：数据库中已应用的最新迁移版本与 migrations 目录一致（开发环境自动建表，不检查）
+- disk：数据目录与日志目录的剩余空间不低于 HEALTH_MIN_FREE_MB
+- event_loop：最近一个探测周期内事件循环的最大延迟不超过 HEALTH_MAX_LOOP_LAG_MS
+  （延迟采样本身是测量工具，使用独立的协程而不经过调度器）
+"""
+
+import asyncio
+import contextlib
+import shutil
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+from starlette.responses import Response
+from tortoise import Tortoise
+from tortoise.exceptions import OperationalError
+
+from src.backend.config.settings import settings
+from src.backend.core.metrics import metrics
+from src.backend.core.migration_manifest import get_latest_version, list_migration_files
+from src.backend.core.path_conf import get_resource_path
+from src.backend.core.scheduler import scheduler
+from src.backend.core.serialization import dumps
+from src.backend.core.shutdown import shutdown_coordinator
+from src.backend.core.sqlite_backup import get_sqlite_path
+
+# aerich 迁移记录中的应用名（Tortoise 的 models 应用）
+MIGRATION_APP = "models"
+HEALTH_PROBE_JOB = "health_probe"
+# 事件循环延迟的采样间隔（秒）
+LAG_SAMPLE_INTERVAL = 0.5
+# 探测结果超过该倍数的探测间隔未更新时视为失效（探测任务卡死）
+STALE_INTERVALS = 3
+
+_check_gauge = metrics.gauge("health_check_ok", "健康检查结果（1 正常 / 0 异常，按检查项）")
+_lag_gauge = metrics.gauge("event_loop_lag_seconds", "最近一个探测周期内事件循环的最大延迟")
+
+Probe = Callable[[], Awaitable[tuple[bool, dict[str, Any]]]]
+
+
+class HealthMonitor:
+    """后台依赖探测与就绪状态缓存"""
+
+    def __init__(self):
+        self.checks: dict[str, dict[str, Any]] = {}
+        self.checked_at: float | None = None
+        self.ok = False
+        self._body = b"{}"
+        self._max_lag = 0.0
+        self._expected_migration: str | None = None
+        self._lag_task: asyncio.Task | None = None
+
+    @property
+    def probes(self) -> dict[str, Probe]:
+        return {
+            "database": self._check_database,
+            "migrations": self._check_migrations,
+            "disk": self._check_disk,
+            "event_loop": self._check_event_loop,
+        }
+
+    async def start(self) -> None:
+        """执行第一轮探测并注册定时探测（lifespan 中数据库初始化之后调用）"""
+        migrations_dir = get_resource_path("migrations")
+        if migrations_dir is not None and settings.ENVIRONMENT != "development":
+            files = list_migration_files(migrations_dir)
+            self._expected_migration = files[-1].name if files else None
+        await self.run_checks()
+        scheduler.add_interval(
+            HEALTH_PROBE_JOB,
+            self.run_checks,
+            settings.HEALTH_CHECK_INTERVAL,
+            description="依赖健康探测",
+        )
+        self._lag_task = asyncio.create_task(self._lag_loop())
+
+    async def stop(self) -> None:
+        await scheduler.remove(HEALTH_PROBE_JOB)
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._lag_task
+            self._lag_task = None
+
+    async def run_checks(self) -> None:
+        """执行一轮探测（并发，各自超时），更新缓存的结果"""
+        names = list(self.probes)
+        results = await asyncio.gather(*(self._run_probe(name, probe) for name, probe in self.probes.items()))
+        checks = dict(zip(names, results))
+        ok = all(check["ok"] for check in checks.values())
+        if self.checked_at is not None and ok != self.ok:
+            failed = [name for name, check in checks.items() if not check["ok"]]
+            if ok:
+                logger.info("💚 依赖检查恢复正常")
+            else:
+                logger.warning(f"⚠️ 依赖检查失败: {', '.join(failed)}")
+        self.checks = checks
+        self.ok = ok
+        self.checked_at = time.time()
+        self._body = dumps({"checks": checks, "checked_at": self.checked_at})
+
+    async def _run_probe(self, name: str, probe: Probe) -> dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            ok, details = await asyncio.wait_for(probe(), settings.HEALTH_CHECK_TIMEOUT)
+        except TimeoutError:
+            ok, details = False, {"error": f"timeout after {settings.HEALTH_CHECK_TIMEOUT:g}s"}
+        except Exception as e:
+            ok, details = False, {"error": str(e)}
+        _check_gauge.set(1 if ok else 0, check=name)
+        return {"ok": ok, "ms": round((time.perf_counter() - started) * 1000, 1), **details}
+
+    async def _lag_loop(self) -> None:
+        """测量 sleep 的实际唤醒延迟，记录探测周期内的最大值"""
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+            lag = time.perf_counter() - started - LAG_SAMPLE_INTERVAL
+            self._max_lag = max(self._max_lag, lag)
+
+    # ---- 探测项 ----
+
+    async def _check_database(self) -> tuple[bool, dict[str, Any]]:
+        await Tortoise.get_connection("default").execute_query("SELECT 1")
+        return True, {}
+
+    async def _check_migrations(self) -> tuple[bool, dict[str, Any]]:
+        expected = self._expected_migration
+        if expected is None:
+            return True, {"skipped": True}
+        try:
+            applied = await get_latest_version(Tortoise.get_connection("default"), MIGRATION_APP)
+        except OperationalError:
+            applied = None
+        return applied == expected, {"applied": applied, "expected": expected}
+
+    async def _check_disk(self) -> tuple[bool, dict[str, Any]]:
+        database = get_sqlite_path()
+        directories = {"data": database.parent if database else Path("data"), "logs": Path("logs")}
+        minimum = settings.HEALTH_MIN_FREE_MB * 1024 * 1024
+        free: dict[str, int] = {}
+        for name, directory in directories.items():
+            if directory.exists():
+                free[name] = shutil.disk_usage(directory).free // (1024 * 1024)
+        ok = all(mb * 1024 * 1024 >= minimum for mb in free.values())
+        return ok, {"free_mb": free, "min_free_mb": settings.HEALTH_MIN_FREE_MB}
+
+    async def _check_event_loop(self) -> tuple[bool, dict[str, Any]]:
+        lag, self._max_lag = self._max_lag, 0.0
+        _lag_gauge.set(lag)
+        lag_ms = round(lag * 1000, 1)
+        return lag_ms <= settings.HEALTH_MAX_LOOP_LAG_MS, {"lag_ms": lag_ms}
+
+    # ---- 响应 ----
+
+    def readiness(self) -> Response:
+        """就绪状态：只读取缓存的探测结果"""
+        stale = (
+            self.checked_at is None
+            or time.time() - self.checked_at > settings.HEALTH_CHECK_INTERVAL * STALE_INTERVALS
+        )
+        if shutdown_coordinator.draining:
+            status = "shutting_down"
+        elif not shutdown_coordinator.ready:
+            status = "starting"
+        elif stale:
+            status = "stale"
+        elif not self.ok:
+            status = "unavailable"
+        else:
+            status = "ready"
+        body = b'{"status":%s,"version":%s,"probe":%s}' % (
+            dumps(status),
+            dumps(settings.VERSION),
+            self._body,
+        )
+        return Response(body, status_code=200 if status == "ready" else 503, media_type="application/json")
+
+
+# 全局单例
+health_monitor = HealthMonitor()
@@ -14,6 +14,9 @@ from src.backend.core.sse import log_stream_manager
 # 移除默认的 handler
 logger.remove()
 
+# 请求中的日志由 TracingMiddleware 绑定 extra.request_id，请求之外为 "-"
+logger.configure(extra={"request_id": "-"})
+
 # 控制台输出配置
 logger.add(
     sys.stdout,
@@ -31,31 +34,41 @@ logger.add(
     filter=lambda record: "sse" not in str(record["name"]),
 )
 
-# 文件日志配置
-log_dir = Path("logs")
-log_dir.mkdir(exist_ok=True)
+# 文件日志：由服务启动时（lifespan）调用 setup_file_logging() 添加，
+# 仅导入模块（脚本、迁移工具）不会创建 logs/ 目录
+_file_logging_ready = False
 
-# 普通日志
-logger.add(
-    log_dir / "app.log",
-    rotation="500 MB",
-    retention="10 days",
-    compression="zip",
-    level="INFO",
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-)
 
-# 错误日志
-logger.add(
-    log_dir / "error.log",
-    rotation="500 MB",
-    retention="30 days",
-    compression="zip",
-    level="ERROR",
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-    backtrace=True,
-    diagnose=True,
-)
+def setup_file_logging(log_dir: Path = Path("logs")) -> None:
+    """添加文件日志 sink（重复调用只生效一次）"""
+    global _file_logging_ready
+
+    if _file_logging_ready:
+        return
+    _file_logging_ready = True
+    log_dir.mkdir(exist_ok=True)
+
+    # 普通日志
+    logger.add(
+        log_dir / "app.log",
+        rotation="500 MB",
+        retention="10 days",
+        compression="zip",
+        level="INFO",
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {extra[request_id]} | {name}:{function}:{line} - {message}",
+    )
+
+    # 错误日志
+    logger.add(
+        log_dir / "error.log",
+        rotation="500 MB",
+        retention="30 days",
+        compression="zip",
+        level="ERROR",
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {extra[request_id]} | {name}:{function}:{line} - {message}",
+        backtrace=True,
+        diagnose=True,
+    )
 
 
 def get_logger(name: str = __name__):
@@ -0,0 +1,199 @@
+"""
+进程内运行时指标
+提供轻量的 Counter / Gauge / Histogram，供各模块记录运行状态
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Any
+
+LabelKey = tuple[tuple[str, str], ...]
+
+# 默认直方图分桶（单位：秒）
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _label_key(labels: dict[str, Any]) -> LabelKey:
+    """将标签字典规范化为可哈希的键"""
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class _Metric:
+    """指标基类"""
+
+    type: str = "untyped"
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._lock = threading.Lock()
+
+    def samples(self) -> list[dict[str, Any]]:
+        raise NotImplementedError
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "type": self.type,
+            "description": self.description,
+            "samples": self.samples(),
+        }
+
+
+class Counter(_Metric):
+    """单调递增计数器"""
+
+    type = "counter"
+
+    def __init__(self, name: str, description: str = ""):
+        super().__init__(name, description)
+        self._values: dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [
+                {"labels": dict(key), "value": value}
+                for key, value in self._values.items()
+            ]
+
+
+class Gauge(_Metric):
+    """可增可减的瞬时值"""
+
+    type = "gauge"
+
+    def __init__(self, name: str, description: str = ""):
+        super().__init__(name, description)
+        self._values: dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels: Any) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def samples(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [
+                {"labels": dict(key), "value": value}
+                for key, value in self._values.items()
+            ]
+
+
+class Histogram(_Metric):
+    """分桶直方图"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, description)
+        self.buckets = tuple(sorted(buckets))
+        # 每个标签组合: [各桶计数..., +Inf 计数], 总和, 总数
+        self._values: dict[LabelKey, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = _label_key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = ([0] * (len(self.buckets) + 1), [0.0, 0.0])
+                self._values[key] = entry
+            counts, totals = entry
+            counts[index] += 1
+            totals[0] += value
+            totals[1] += 1
+
+    def samples(self) -> list[dict[str, Any]]:
+        with self._lock:
+            result = []
+            for key, (counts, totals) in self._values.items():
+                cumulative = 0
+                buckets = {}
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    buckets[str(bound)] = cumulative
+                buckets["+Inf"] = cumulative + counts[-1]
+                result.append(
+                    {
+                        "labels": dict(key),
+                        "count": int(totals[1]),
+                        "sum": totals[0],
+                        "buckets": buckets,
+                    },
+                )
+            return result
+
+
+class MetricsRegistry:
+    """指标注册表（同名指标只创建一次）"""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls: type, name: str, *args: Any) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, *args)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise TypeError(f"指标 {name} 已注册为 {metric.type}")
+            return metric
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        return self._get_or_create(Counter, name, description)
+
+    def gauge(self, name: str, description: str = "") -> Gauge:
+        return self._get_or_create(Gauge, name, description)
+
+    def histogram(
+        self,
+        name: str,
+        description: str = "",
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, description, buckets)
+
+    def snapshot(self) -> dict[str, Any]:
+        """导出所有指标的当前值"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+
+# 全局单例
+metrics: MetricsRegistry = MetricsRegistry()
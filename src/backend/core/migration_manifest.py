@@ -0,0 +1,233 @@
+"""
+迁移清单与启动快速路径
+
+构建时（scripts/build-migration-manifest.py）生成：
+- migrations/manifest.json：每个迁移文件的名称、sha256 与 MODELS_STATE
+- migrations/baseline.sql：当前模型的完整建表语句（合并所有迁移）
+
+启动时：
+- 数据库已记录的最新版本与清单一致：跳过 aerich
+- 全新数据库：在一个事务内执行 baseline 并写入所有迁移记录，不逐个回放迁移
+- 其他情况（清单缺失/过期、数据库落后、旧库缺少 aerich 表）：交给 aerich 完整升级
+
+本模块不依赖 aerich，快速路径命中时不会执行 aerich 的初始化与逐版本升级。
+"""
+
+import ast
+import base64
+import hashlib
+import json
+import sqlite3
+import zlib
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+from pypika_tortoise import Order, Table
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.exceptions import OperationalError
+from tortoise.transactions import in_transaction
+
+MANIFEST_FILE = "manifest.json"
+BASELINE_FILE = "baseline.sql"
+VERSIONS_DIR = "models"
+AERICH_TABLE = "aerich"
+
+
+def file_sha256(path: Path) -> str:
+    """计算文件的 sha256（统一换行符，避免 Windows 检出的 CRLF 导致校验失败）"""
+    return hashlib.sha256(path.read_bytes().replace(b"\r\n", b"\n")).hexdigest()
+
+
+def list_migration_files(migrations_dir: Path) -> list[Path]:
+    """按版本号排序的迁移文件（与 aerich 的排序规则一致）"""
+    files = [
+        path
+        for path in (migrations_dir / VERSIONS_DIR).glob("*.py")
+        if path.name.split("_", 1)[0].isdigit()
+    ]
+    return sorted(files, key=lambda path: int(path.name.split("_", 1)[0]))
+
+
+def read_models_state(path: Path) -> str | None:
+    """读取迁移文件中的 MODELS_STATE（aerich 压缩格式），只解析不导入"""
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and len(node.targets) == 1
+            and isinstance(node.targets[0], ast.Name)
+            and node.targets[0].id == "MODELS_STATE"
+        ):
+            return ast.literal_eval(node.value)
+    return None
+
+
+def build_manifest(
+    migrations_dir: Path,
+    baseline_sql: str,
+    dialect: str,
+    app: str = "models",
+) -> dict[str, Any]:
+    """
+    生成迁移清单
+
+    Args:
+        migrations_dir: migrations 目录
+        baseline_sql: 当前模型的完整建表语句
+        dialect: baseline 对应的数据库方言
+        app: aerich 应用名
+    """
+    return {
+        "app": app,
+        "dialect": dialect,
+        "baseline_sha256": hashlib.sha256(baseline_sql.encode("utf-8")).hexdigest(),
+        "migrations": [
+            {
+                "name": path.name,
+                "sha256": file_sha256(path),
+                "models_state": read_models_state(path),
+            }
+            for path in list_migration_files(migrations_dir)
+        ],
+    }
+
+
+def load_manifest(migrations_dir: Path) -> dict[str, Any] | None:
+    """读取清单，不存在时返回 None"""
+    path = migrations_dir / MANIFEST_FILE
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def verify_manifest(manifest: dict[str, Any], migrations_dir: Path) -> bool:
+    """校验清单与磁盘上的迁移文件、baseline 是否一致"""
+    files = list_migration_files(migrations_dir)
+    expected = [(m["name"], m["sha256"]) for m in manifest["migrations"]]
+    actual = [(path.name, file_sha256(path)) for path in files]
+    if expected != actual:
+        return False
+
+    baseline = migrations_dir / BASELINE_FILE
+    return baseline.exists() and file_sha256(baseline) == manifest["baseline_sha256"]
+
+
+def split_sql_statements(script: str) -> list[str]:
+    """按完整语句切分 SQL 脚本（正确处理注释与字符串中的分号）"""
+    statements: list[str] = []
+    buffer = ""
+    for line in script.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            if buffer.strip():
+                statements.append(buffer.strip())
+            buffer = ""
+    if buffer.strip():
+        statements.append(buffer.strip())
+    return statements
+
+
+def decode_models_state(models_state: str) -> str:
+    """aerich 的 MODELS_STATE 为 base64(zlib(json))，还原为 JSON 文本"""
+    return zlib.decompress(base64.b64decode(models_state)).decode("utf-8")
+
+
+async def get_latest_version(conn: BaseDBAsyncClient, app: str) -> str | None:
+    """
+    查询 aerich 表中最新的已应用版本
+
+    通过连接自身的 query_class 生成 SQL，SQLite 与 PostgreSQL 的占位符、引号规则不同，
+    健康检查在两种数据库上都会调用。
+
+    Raises:
+        OperationalError: aerich 表不存在
+    """
+    table = Table(AERICH_TABLE)
+    query = (
+        conn.query_class.from_(table)
+        .select(table.version)
+        .where(table.app == app)
+        .orderby(table.id, order=Order.desc)
+        .limit(1)
+    )
+    _, rows = await conn.execute_query(query.get_sql())
+    return rows[0]["version"] if rows else None
+
+
+async def is_empty_database(conn: BaseDBAsyncClient) -> bool:
+    """SQLite 数据库中是否还没有任何表"""
+    _, rows = await conn.execute_query(
+        "SELECT COUNT(*) AS total FROM sqlite_master "
+        "WHERE type = 'table' AND name NOT LIKE 'sqlite_%'",
+    )
+    return rows[0]["total"] == 0
+
+
+async def apply_baseline(
+    connection_name: str,
+    manifest: dict[str, Any],
+    migrations_dir: Path,
+) -> None:
+    """在一个事务内执行 baseline 建表，并为每个迁移写入 aerich 记录"""
+    statements = split_sql_statements(
+        (migrations_dir / BASELINE_FILE).read_text(encoding="utf-8"),
+    )
+    records = [
+        [m["name"], manifest["app"], decode_models_state(m["models_state"])]
+        for m in manifest["migrations"]
+    ]
+    async with in_transaction(connection_name) as conn:
+        # 逐条执行：SQLite 的 executescript 会先提交当前事务
+        for statement in statements:
+            await conn.execute_query(statement)
+        await conn.execute_many(
+            f'INSERT INTO "{AERICH_TABLE}" ("version", "app", "content") VALUES (?, ?, ?)',
+            records,
+        )
+
+
+async def try_fast_migrate(
+    conn: BaseDBAsyncClient,
+    connection_name: str,
+    migrations_dir: Path,
+) -> bool:
+    """
+    尝试通过清单快速完成迁移检查
+
+    Returns:
+        bool: True 表示数据库已是最新（或已通过 baseline 初始化），无需运行 aerich
+    """
+    manifest = load_manifest(migrations_dir)
+    if manifest is None:
+        logger.info("ℹ️ 未找到迁移清单，使用 aerich 完整升级")
+        return False
+    if manifest["dialect"] != conn.capabilities.dialect:
+        return False
+    if not manifest["migrations"] or any(
+        m["models_state"] is None for m in manifest["migrations"]
+    ):
+        return False
+    if not verify_manifest(manifest, migrations_dir):
+        logger.warning(
+            "⚠️ 迁移清单与 migrations 目录不一致（请运行 pnpm db:manifest），"
+            "使用 aerich 完整升级",
+        )
+        return False
+
+    latest = manifest["migrations"][-1]["name"]
+    try:
+        applied = await get_latest_version(conn, manifest["app"])
+    except OperationalError:
+        applied = None
+        if await is_empty_database(conn):
+            await apply_baseline(connection_name, manifest, migrations_dir)
+            logger.success(f"✅ 已通过 baseline 初始化数据库 (版本 {latest})")
+            return True
+
+    if applied == latest:
+        logger.info(f"✅ 数据库已是最新版本 ({latest})，跳过迁移")
+        return True
+
+    logger.info(f"🔄 数据库版本 {applied or '未知'} 与清单 {latest} 不一致，运行 aerich 升级")
+    return False
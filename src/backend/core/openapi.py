@@ -2,35 +2,174 @@
 OpenAPI 规范生成工具
 
 统一的 OpenAPI JSON 生成逻辑，避免代码重复
+
+- 指纹：由已注册路由（路径、方法、参数、响应模型、文档字符串等）与其引用的 Pydantic 模型
+  （字段定义、配置、文档字符串）计算，不需要生成 schema；生成的 openapi.json 中以
+  `x-fingerprint` 记录，指纹未变化时跳过 app.openapi() 与写盘
+- 生产环境：第一次请求 /openapi.json 时先载入延迟挂载的功能模块，再载入与当前指纹一致的
+  预构建 openapi.json（桌面版随包分发），否则在线程中生成一次；序列化并预压缩后直接从内存
+  返回（ETag / 304 / gzip / br），生成 schema 不会阻塞事件循环
 """
 
+import asyncio
+import enum
+import hashlib
 import json
+import re
+import time
+import typing
 from pathlib import Path
 from typing import Any
 
+import fastapi
+import pydantic
+from fastapi.dependencies.utils import get_flat_dependant
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from src.backend.core.features import feature_registry
 from src.backend.core.logger import logger
+from src.backend.core.path_conf import get_resource_path
+from src.backend.core.static_cache import REVALIDATE_CACHE, StaticAsset, precompress
+
+FINGERPRINT_KEY = "x-fingerprint"
+# repr 中的对象地址（函数、default_factory 等）每个进程都不同，计算指纹前去掉
+_ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+def _referenced_types(annotation: Any) -> typing.Iterator[type]:
+    """展开注解（Optional / list / Annotated 等）中引用的类型"""
+    if isinstance(annotation, type):
+        yield annotation
+    for arg in typing.get_args(annotation):
+        yield from _referenced_types(arg)
+
+
+def _describe_types(annotations: list[Any]) -> list[str]:
+    """描述注解引用到的 Pydantic 模型与枚举（递归包括嵌套模型）"""
+    seen: set[type] = set()
+    pending = [t for annotation in annotations for t in _referenced_types(annotation)]
+    parts: list[str] = []
+    while pending:
+        cls = pending.pop()
+        if cls in seen:
+            continue
+        seen.add(cls)
+        if issubclass(cls, BaseModel):
+            parts.append(
+                f"{cls.__module__}.{cls.__qualname__}|{cls.__doc__}|{cls.model_config}"
+                f"|{cls.model_fields}|{cls.model_computed_fields}",
+            )
+            pending.extend(t for field in cls.model_fields.values() for t in _referenced_types(field.annotation))
+        elif issubclass(cls, enum.Enum):
+            parts.append(f"{cls.__module__}.{cls.__qualname__}|{[member.value for member in cls]}")
+    return sorted(parts)
+
+
+def openapi_fingerprint(app: fastapi.FastAPI) -> str:
+    """
+    计算路由与模型的指纹
+
+    只读取路由与模型的定义，耗时远小于 app.openapi()；FastAPI / Pydantic 版本也计入，
+    升级后 schema 的生成方式可能变化。
+    """
+    parts: list[str] = [
+        f"fastapi={fastapi.__version__}",
+        f"pydantic={pydantic.__version__}",
+        repr(
+            (
+                app.title,
+                app.version,
+                app.summary,
+                app.description,
+                app.openapi_version,
+                app.openapi_tags,
+                app.servers,
+                app.terms_of_service,
+                app.contact,
+                app.license_info,
+            ),
+        ),
+    ]
+    annotations: list[Any] = []
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or not route.include_in_schema:
+            continue
+        dependant = get_flat_dependant(route.dependant, skip_repeats=True)
+        params = [
+            *dependant.path_params,
+            *dependant.query_params,
+            *dependant.header_params,
+            *dependant.cookie_params,
+            *dependant.body_params,
+        ]
+        parts.append(
+            repr(
+                (
+                    route.path,
+                    sorted(route.methods),
+                    route.name,
+                    route.operation_id,
+                    route.summary,
+                    route.description,
+                    route.response_description,
+                    route.tags,
+                    route.deprecated,
+                    route.status_code,
+                    route.responses,
+                    route.openapi_extra,
+                    route.callbacks,
+                    route.response_model,
+                    getattr(route.response_class, "__name__", repr(route.response_class)),
+                    [(param.name, param.alias, param.field_info) for param in params],
+                    [
+                        (type(requirement.security_scheme).__name__, requirement.security_scheme.model, requirement.scopes)
+                        for requirement in dependant.security_requirements
+                    ],
+                ),
+            ),
+        )
+        annotations.append(route.response_model)
+        annotations.extend(param.field_info.annotation for param in params)
+
+    parts.extend(_describe_types(annotations))
+    text = _ADDRESS.sub("", "\n".join(parts))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def read_fingerprint(path: Path) -> str | None:
+    """读取已生成文件中记录的指纹"""
+    try:
+        return json.loads(path.read_bytes()).get(FINGERPRINT_KEY)
+    except (OSError, ValueError, AttributeError):
+        return None
 
 
 def generate_openapi_json(
     app: Any,
     output_path: str | Path = "openapi.json",
     project_root: Path | None = None,
-) -> bool:
+    *,
+    force: bool = False,
+) -> dict[str, Any] | None:
     """
     生成 OpenAPI JSON 文件
 
+    路由与模型的指纹与已有文件一致时跳过生成与写盘（force=True 时总是重新生成）。
+
     Args:
         app: FastAPI 应用实例
         output_path: 输出文件路径（相对于 project_root）
         project_root: 项目根目录，默认为当前工作目录
+        force: 忽略指纹，强制重新生成
 
     Returns:
-        bool: 生成是否成功
+        dict | None: 生成结果（file、size、paths、skipped），失败返回 None
     """
     try:
-        # 获取 OpenAPI schema
-        openapi_schema = app.openapi()
-
         # 确定输出路径
         if project_root is None:
             project_root = Path.cwd()
@@ -41,22 +180,130 @@ def generate_openapi_json(
             else Path(output_path)
         )
 
-        # 写入文件
-        output_file.write_text(
-            json.dumps(openapi_schema, indent=2, ensure_ascii=False),
-            encoding="utf-8",
+        fingerprint = openapi_fingerprint(app)
+        if not force and read_fingerprint(output_file) == fingerprint:
+            logger.info(f"⏭️ 路由与模型未变化，跳过 OpenAPI 生成: {output_file}")
+            return {
+                "file": output_file,
+                "size": output_file.stat().st_size,
+                "paths": None,
+                "skipped": True,
+            }
+
+        # 获取 OpenAPI schema
+        openapi_schema = app.openapi()
+
+        # 写入文件（附带指纹，供下次启动比较）
+        content = json.dumps(
+            {**openapi_schema, FINGERPRINT_KEY: fingerprint},
+            indent=2,
+            ensure_ascii=False,
         )
+        output_file.write_text(content, encoding="utf-8")
 
         # 统计信息
-        file_size = output_file.stat().st_size / 1024
+        file_size = len(content.encode("utf-8"))
         paths_count = len(openapi_schema.get("paths", {}))
 
         logger.info(f"✅ OpenAPI 规范已生成: {output_file}")
-        logger.debug(f"📄 文件大小: {file_size:.2f} KB")
+        logger.debug(f"📄 文件大小: {file_size / 1024:.2f} KB")
         logger.debug(f"🔗 API 端点数量: {paths_count}")
 
     except Exception as e:
         logger.error(f"❌ OpenAPI 规范生成失败: {e}")
-        return False
+        return None
     else:
-        return True
+        return {
+            "file": output_file,
+            "size": file_size,
+            "paths": paths_count,
+            "skipped": False,
+        }
+
+
+class OpenAPICache:
+    """
+    生产环境的 OpenAPI 规范内存缓存
+
+    install() 替换 FastAPI 默认的 /openapi.json 路由（默认实现每次请求都序列化整个 schema，
+    并在事件循环中生成）；第一次请求时在线程中 load()，准备好序列化与压缩后的响应体。
+    """
+
+    def __init__(self):
+        self.asset: StaticAsset | None = None
+        self.source: str | None = None
+        self.fingerprint: str | None = None
+        self.load_seconds = 0.0
+        self._lock: asyncio.Lock | None = None
+
+    def load(self, app: fastapi.FastAPI) -> None:
+        """载入或生成 schema 并预压缩（同步，CPU 密集，应在线程中调用）"""
+        started = time.perf_counter()
+        self.fingerprint = openapi_fingerprint(app)
+        schema = self._load_prebuilt()
+        if schema is not None:
+            # 与 app.openapi() 的结果一致，之后的调用直接返回缓存
+            app.openapi_schema = schema
+            self.source = "prebuilt"
+        else:
+            schema = app.openapi()
+            self.source = "generated"
+
+        body = json.dumps(schema, ensure_ascii=False, separators=(",", ":")).encode()
+        media_type = "application/json"
+        asset = StaticAsset("openapi.json", body, media_type, time.time(), precompress(body, media_type))
+        asset.cache_control = REVALIDATE_CACHE
+        self.asset = asset
+        self.load_seconds = time.perf_counter() - started
+        logger.info(
+            f"📘 OpenAPI 规范已就绪（{self.source}，{len(body) / 1024:.1f} KiB，"
+            f"{self.load_seconds * 1000:.0f}ms）",
+        )
+
+    async def ensure_loaded(self, app: fastapi.FastAPI) -> None:
+        """载入全部功能路由后在线程中载入 schema（并发请求只载入一次）"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self.asset is not None:
+                return
+            feature_registry.load_all(app)
+            await asyncio.to_thread(self.load, app)
+
+    def _load_prebuilt(self) -> dict[str, Any] | None:
+        """读取随包分发的 openapi.json，指纹与当前路由一致时使用"""
+        path = get_resource_path("openapi.json")
+        if path is None:
+            return None
+        try:
+            schema = json.loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(schema, dict) or schema.pop(FINGERPRINT_KEY, None) != self.fingerprint:
+            return None
+        return schema
+
+    def install(self, app: fastapi.FastAPI) -> None:
+        """用内存中的预压缩响应替换默认的 openapi 路由"""
+        routes = app.router.routes
+        index = next(
+            (i for i, route in enumerate(routes) if isinstance(route, Route) and route.path == app.openapi_url),
+            None,
+        )
+        if index is None:
+            return
+        default_endpoint = routes[index].endpoint
+
+        async def openapi(request: Request) -> Response:
+            if self.asset is None:
+                await self.ensure_loaded(app)
+            # 带 root_path 时默认实现会把它加入 servers，交给默认实现处理
+            if request.scope.get("root_path"):
+                return await default_endpoint(request)
+            return self.asset.response(request.headers)
+
+        routes[index] = Route(app.openapi_url, openapi, include_in_schema=False)
+
+
+# 全局单例
+openapi_cache = OpenAPICache()
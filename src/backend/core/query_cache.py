@@ -0,0 +1,357 @@
+"""
+进程内查询结果缓存
+
+- TTL + LRU 淘汰，并受条目数与内存预算（估算字节数）双重约束
+- 键为规范化的查询：Tortoise 查询集内联参数后的 SQL
+- 每个条目携带标签：
+  - 模型标签（如 "User"）：列表 / 聚合查询，模型任意一行变化即失效
+  - 行标签（如 "User:1"）：按主键的单行查询，只在该行变化时失效
+- watch(Model) 注册 post_save / post_delete 信号，自动按标签失效；
+  bulk_create / bulk_update / QuerySet.update 不会触发信号，
+  需要调用 query_caches.invalidate(...)（写回缓冲已自动调用）
+- 同一键的并发未命中只会查询一次数据库（single-flight）
+- 查询进行中发生失效时，结果不会写入缓存，避免旧数据覆盖
+
+事务尚未提交时，其他请求仍可能读到旧值并缓存，最长在 TTL 后过期。
+
+多进程模式（WORKERS > 1）下失效无法通知其他 worker，而管理员权限等依赖缓存的读取
+不能容忍旧数据，因此所有缓存直接查询数据库、不保存条目。
+"""
+
+import asyncio
+import copy
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any, TypeVar
+
+from tortoise.models import Model
+from tortoise.queryset import AwaitableQuery
+from tortoise.signals import Signals
+
+from src.backend.config.settings import settings
+from src.backend.core.metrics import metrics
+from src.backend.core.workers import worker_state
+
+T = TypeVar("T")
+
+_requests_counter = metrics.counter("query_cache_requests_total", "查询缓存请求数（按结果）")
+_evictions_counter = metrics.counter("query_cache_evictions_total", "查询缓存淘汰的条目数")
+_bytes_gauge = metrics.gauge("query_cache_bytes", "查询缓存占用的估算字节数")
+_entries_gauge = metrics.gauge("query_cache_entries", "查询缓存条目数")
+
+
+def model_tag(model: type[Model]) -> str:
+    """模型级标签"""
+    return model.__name__
+
+
+def row_tag(model: type[Model], pk: Any) -> str:
+    """行级标签"""
+    return f"{model.__name__}:{pk}"
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """粗略估算对象占用的字节数（用于内存预算）"""
+    size = sys.getsizeof(value)
+    if _depth > 4:
+        return size
+    if isinstance(value, dict):
+        size += sum(
+            estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+            for k, v in value.items()
+        )
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _depth + 1) for item in value)
+    elif isinstance(value, Model):
+        size += estimate_size(vars(value), _depth + 1)
+    return size
+
+
+def _detach(value: Any) -> Any:
+    """返回缓存值的浅拷贝，避免调用方修改影响缓存中的对象"""
+    if isinstance(value, list):
+        return [_detach(item) for item in value]
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, Model):
+        return copy.copy(value)
+    return value
+
+
+class _Entry:
+    __slots__ = ("expires_at", "size", "tags", "value")
+
+    def __init__(self, value: Any, expires_at: float, size: int, tags: frozenset[str]):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.tags = tags
+
+
+class QueryCache:
+    """
+    单个查询缓存
+
+    Args:
+        name: 缓存名称（用于指标）
+        ttl: 条目存活时间（秒）
+        max_entries: 最大条目数
+        max_bytes: 内存预算（估算字节数）
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        ttl: float | None = None,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+    ):
+        self.name = name
+        self.ttl = ttl or settings.QUERY_CACHE_TTL
+        self.max_entries = max_entries or settings.QUERY_CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes or settings.QUERY_CACHE_MAX_BYTES
+
+        self._entries: OrderedDict[Any, _Entry] = OrderedDict()
+        self._tags: dict[str, set[Any]] = {}
+        self._inflight: dict[Any, asyncio.Future] = {}
+        self._generation = 0
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        """多进程模式下不缓存（见模块说明）"""
+        return not worker_state.supervised
+
+    # --- 读取 ---
+
+    async def get_or_load(
+        self,
+        key: Any,
+        loader: Callable[[], Awaitable[T]],
+        tags: Iterable[str],
+    ) -> T:
+        """
+        命中时返回缓存值，否则调用 loader 加载并写入缓存
+
+        Args:
+            key: 缓存键（可哈希）
+            loader: 未命中时的加载函数
+            tags: 条目的失效标签
+        """
+        if not self.enabled:
+            self.misses += 1
+            _requests_counter.inc(cache=self.name, result="bypass")
+            return await loader()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                _requests_counter.inc(cache=self.name, result="hit")
+                return _detach(entry.value)
+            self.expirations += 1
+            self._remove(key)
+
+        # single-flight：同一键的并发未命中等待同一次加载
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.hits += 1
+            _requests_counter.inc(cache=self.name, result="coalesced")
+            return _detach(await asyncio.shield(inflight))
+
+        self.misses += 1
+        _requests_counter.inc(cache=self.name, result="miss")
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            value = await loader()
+        except BaseException as e:
+            future.set_exception(e)
+            # 没有其他等待者时避免 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        future.set_result(value)
+        # 加载期间发生过失效：结果可能是旧数据，不写入缓存
+        if generation == self._generation:
+            self._store(key, value, frozenset(tags))
+        return _detach(value)
+
+    async def fetch(
+        self,
+        queryset: AwaitableQuery,
+        *,
+        row: tuple[type[Model], Any] | None = None,
+    ) -> Any:
+        """
+        缓存一个 Tortoise 查询的结果
+
+        Args:
+            queryset: 查询集（键为内联参数后的 SQL）
+            row: (模型, 主键)，按主键的单行查询传入，只在该行变化时失效；
+                 不传时使用模型级标签
+        """
+        model = queryset.model
+        tags = [row_tag(*row)] if row else [model_tag(model)]
+        key = (model_tag(model), queryset.sql(params_inline=True))
+        return await self.get_or_load(key, lambda: queryset, tags)
+
+    # --- 写入与淘汰 ---
+
+    def _store(self, key: Any, value: Any, tags: frozenset[str]) -> None:
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = _Entry(value, time.monotonic() + self.ttl, size, tags)
+        self.bytes += size
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+            _evictions_counter.inc(cache=self.name)
+        self._publish()
+
+    def _remove(self, key: Any) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        self._publish()
+
+    def _publish(self) -> None:
+        _bytes_gauge.set(self.bytes, cache=self.name)
+        _entries_gauge.set(len(self._entries), cache=self.name)
+
+    # --- 失效 ---
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """使带有任一标签的条目失效，返回失效的条目数"""
+        self._generation += 1
+        removed = 0
+        for tag in tags:
+            for key in list(self._tags.get(tag, ())):
+                self._remove(key)
+                removed += 1
+        self.invalidations += removed
+        return removed
+
+    def invalidate(self, model: type[Model], pks: Iterable[Any] = ()) -> int:
+        """模型数据变化：使模型级条目与对应行的条目失效"""
+        return self.invalidate_tags(
+            model_tag(model),
+            *(row_tag(model, pk) for pk in pks),
+        )
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+        self._tags.clear()
+        self.bytes = 0
+        self._publish()
+
+    def purge_expired(self) -> int:
+        """清理已过期的条目（读取时也会惰性清理）"""
+        now = time.monotonic()
+        expired = [key for key, entry in self._entries.items() if entry.expires_at <= now]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+        return len(expired)
+
+    def snapshot(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "name": self.name,
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+class QueryCacheRegistry:
+    """查询缓存注册表：创建缓存、订阅模型信号、统一失效与统计"""
+
+    def __init__(self):
+        self._caches: dict[str, QueryCache] = {}
+        self._watched: dict[type[Model], list[QueryCache]] = {}
+
+    def create(self, name: str, **options: Any) -> QueryCache:
+        cache = QueryCache(name, **options)
+        self._caches[name] = cache
+        return cache
+
+    def watch(self, cache: QueryCache, *models: type[Model]) -> None:
+        """模型保存 / 删除时自动使 cache 中相关条目失效"""
+        for model in models:
+            if model not in self._watched:
+                self._watched[model] = []
+                model.register_listener(Signals.post_save, self._on_save)
+                model.register_listener(Signals.post_delete, self._on_delete)
+            if cache not in self._watched[model]:
+                self._watched[model].append(cache)
+
+    async def _on_save(
+        self,
+        sender: type[Model],
+        instance: Model,
+        _created: bool,
+        _using_db: Any,
+        _update_fields: list[str] | None,
+    ) -> None:
+        self.invalidate(sender, [instance.pk])
+
+    async def _on_delete(
+        self,
+        sender: type[Model],
+        instance: Model,
+        _using_db: Any,
+    ) -> None:
+        self.invalidate(sender, [instance.pk])
+
+    def invalidate(self, model: type[Model], pks: Iterable[Any] = ()) -> None:
+        """通知模型数据变化（批量写入等不触发信号的场景需要手动调用）"""
+        pks = list(pks)
+        for cache in self._watched.get(model, ()):
+            cache.invalidate(model, pks)
+
+    def purge_expired(self) -> int:
+        return sum(cache.purge_expired() for cache in self._caches.values())
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        return [cache.snapshot() for cache in self._caches.values()]
+
+
+query_caches: QueryCacheRegistry = QueryCacheRegistry()
@@ -0,0 +1,390 @@
+"""
+后台任务调度器
+
+周期性的后台工作（WAL checkpoint、依赖探测、worker 状态上报、定时快照、查询缓存清理、
+进程指标采样等）统一注册到 scheduler，而不是各自在 lifespan 中 create_task：
+
+    scheduler.add_interval("wal_checkpoint", checkpoint_wal, 300)
+    scheduler.add_cron("backup_snapshot", run_backup, "0 3 * * *")
+
+- 间隔任务与 cron 任务（5 段：分 时 日 月 周，按本地时间；支持 * , - /，周日为 0 或 7）
+- jitter：每次在计划时间上随机推迟 0~jitter 秒，错开多个 worker 中的同名任务
+- max_instances：同一任务同时运行的上限，到点时已达上限则跳过本次（计入 skipped）
+- timeout：单次运行的超时；线程中的任务无法中断，超时后仍占用并发名额直到实际结束
+- thread=True：同步函数在调度器的线程池（SCHEDULER_THREAD_WORKERS）中运行，不阻塞事件循环
+- 运行耗时记录到 scheduler_job_duration_seconds 直方图，各任务状态通过 /api/monitor/jobs 查看
+
+错过的运行（事件循环阻塞、系统休眠）不补跑，从当前时间起计算下一次。
+lifespan 中 start() / stop()；start() 之前注册的任务在 start() 时开始调度，同名任务重复注册时替换。
+"""
+
+import asyncio
+import contextlib
+import inspect
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Protocol
+
+from loguru import logger
+
+from src.backend.config.settings import settings
+from src.backend.core.metrics import metrics
+
+JobFunc = Callable[[], Awaitable[Any] | Any]
+
+# 每个任务保留的最近运行耗时条数（计算分位数）
+RECENT_RUNS = 100
+
+_duration_histogram = metrics.histogram("scheduler_job_duration_seconds", "后台任务单次运行耗时")
+_runs_counter = metrics.counter("scheduler_job_runs_total", "后台任务运行次数（按结果）")
+_running_gauge = metrics.gauge("scheduler_job_running", "正在运行的后台任务实例数")
+
+
+class Trigger(Protocol):
+    def next_after(self, now: float) -> float:
+        """now 之后的下一次计划时间（time.time()）"""
+        ...
+
+
+class IntervalTrigger:
+    """固定间隔（按计划时间累加，不随运行耗时漂移）"""
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise ValueError(f"间隔必须大于 0: {seconds}")
+        self.seconds = seconds
+
+    def next_after(self, now: float) -> float:
+        return now + self.seconds
+
+    def __str__(self) -> str:
+        return f"every {self.seconds:g}s"
+
+
+def _parse_cron_field(field: str, low: int, high: int) -> frozenset[int]:
+    values: set[int] = set()
+    for part in field.split(","):
+        expr, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if expr == "*":
+            start, end = low, high
+        elif "-" in expr:
+            first, last = expr.split("-", 1)
+            start, end = int(first), int(last)
+        else:
+            start = int(expr)
+            # "5/10" 表示从 5 开始每 10 个
+            end = high if step_text else start
+        if step <= 0 or start < low or end > high or start > end:
+            raise ValueError(f"cron 字段超出范围 [{low}-{high}]: {field}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronTrigger:
+    """cron 表达式（分 时 日 月 周，本地时间）"""
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 表达式应为 5 段（分 时 日 月 周）: {expression!r}")
+        self.expression = expression
+        self.minutes = _parse_cron_field(fields[0], 0, 59)
+        self.hours = _parse_cron_field(fields[1], 0, 23)
+        self.days = _parse_cron_field(fields[2], 1, 31)
+        self.months = _parse_cron_field(fields[3], 1, 12)
+        self.weekdays = frozenset(day % 7 for day in _parse_cron_field(fields[4], 0, 7))
+        # 与 cron 一致：日与周都被限定时满足其一即可
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        weekday = moment.isoweekday() % 7 in self.weekdays
+        if self._any_day:
+            return weekday
+        if self._any_weekday:
+            return day
+        return day or weekday
+
+    def next_after(self, now: float) -> float:
+        moment = datetime.fromtimestamp(now).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # 2 月 29 日等表达式最长约 4 年才出现一次
+        limit = moment + timedelta(days=366 * 5)
+        while moment < limit:
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment.timestamp()
+        raise ValueError(f"cron 表达式没有可执行的时间: {self.expression!r}")
+
+    def __str__(self) -> str:
+        return f"cron {self.expression}"
+
+
+class Job:
+    """一个周期任务的配置与运行统计"""
+
+    def __init__(
+        self,
+        name: str,
+        func: JobFunc,
+        trigger: Trigger,
+        *,
+        description: str = "",
+        jitter: float = 0.0,
+        timeout: float | None = None,
+        max_instances: int = 1,
+        thread: bool = False,
+        run_immediately: bool = False,
+    ):
+        self.name = name
+        self.func = func
+        self.trigger = trigger
+        self.description = description
+        self.jitter = jitter
+        self.timeout = timeout
+        self.max_instances = max(max_instances, 1)
+        self.thread = thread
+        self.run_immediately = run_immediately
+
+        self.planned: float | None = None  # 不含 jitter 的计划时间
+        self.next_run: float | None = None
+        self.running = 0
+        self.runs = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.skipped = 0
+        self.last_started_at: float | None = None
+        self.last_result: str | None = None
+        self.last_error: str | None = None
+        self.durations: deque[float] = deque(maxlen=RECENT_RUNS)
+        self.tasks: set[asyncio.Task] = set()
+
+    def schedule(self, now: float, first: bool = False) -> None:
+        """计算下一次运行时间"""
+        if first and self.run_immediately:
+            planned = now
+        else:
+            base = self.planned if self.planned is not None and not first else now
+            planned = self.trigger.next_after(base)
+            if planned <= now:
+                # 错过的运行不补跑
+                planned = self.trigger.next_after(now)
+        self.planned = planned
+        self.next_run = planned + (random.uniform(0, self.jitter) if self.jitter > 0 else 0)
+
+    def snapshot(self) -> dict[str, Any]:
+        durations = sorted(self.durations)
+
+        def percentile(p: float) -> float | None:
+            if not durations:
+                return None
+            return round(durations[min(int(len(durations) * p), len(durations) - 1)] * 1000, 3)
+
+        return {
+            "name": self.name,
+            "description": self.description,
+            "trigger": str(self.trigger),
+            "jitter": self.jitter,
+            "timeout": self.timeout,
+            "max_instances": self.max_instances,
+            "thread": self.thread,
+            "next_run_at": self.next_run,
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "skipped": self.skipped,
+            "last_started_at": self.last_started_at,
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+            "last_ms": round(self.durations[-1] * 1000, 3) if self.durations else None,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "max_ms": round(durations[-1] * 1000, 3) if durations else None,
+        }
+
+
+class Scheduler:
+    """单个调度协程按最近的计划时间唤醒，到点的任务各自在独立的 Task 中运行"""
+
+    def __init__(self):
+        self._jobs: dict[str, Job] = {}
+        self._task: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    # ---- 注册 ----
+
+    def add(self, name: str, func: JobFunc, trigger: Trigger, **options: Any) -> Job:
+        """注册任务（同名任务被替换，进行中的运行不受影响）"""
+        job = Job(name, func, trigger, **options)
+        self._jobs[name] = job
+        if self._task is not None:
+            job.schedule(time.time(), first=True)
+            self._wake()
+        return job
+
+    def add_interval(self, name: str, func: JobFunc, seconds: float, **options: Any) -> Job:
+        """每 seconds 秒运行一次"""
+        return self.add(name, func, IntervalTrigger(seconds), **options)
+
+    def add_cron(self, name: str, func: JobFunc, expression: str, **options: Any) -> Job:
+        """按 cron 表达式运行"""
+        return self.add(name, func, CronTrigger(expression), **options)
+
+    def get(self, name: str) -> Job | None:
+        return self._jobs.get(name)
+
+    async def remove(self, name: str, *, wait: bool = True) -> None:
+        """取消任务的后续调度；wait 时等待进行中的运行结束"""
+        job = self._jobs.pop(name, None)
+        if job is None:
+            return
+        job.next_run = None
+        self._wake()
+        if wait and job.tasks:
+            await asyncio.gather(*job.tasks, return_exceptions=True)
+
+    # ---- 生命周期 ----
+
+    def start(self) -> None:
+        """开始调度（lifespan 启动时调用）"""
+        if self._task is not None:
+            return
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(settings.SCHEDULER_THREAD_WORKERS, 1),
+            thread_name_prefix="scheduler",
+        )
+        self._wakeup = asyncio.Event()
+        now = time.time()
+        for job in self._jobs.values():
+            job.schedule(now, first=True)
+        self._task = asyncio.create_task(self._dispatch())
+        logger.debug(f"⏰ 调度器已启动: {len(self._jobs)} 个任务")
+
+    async def stop(self) -> None:
+        """停止调度，等待进行中的运行（最长 SCHEDULER_STOP_TIMEOUT 秒，超时后取消）"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+        tasks = [task for job in self._jobs.values() for task in job.tasks]
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=settings.SCHEDULER_STOP_TIMEOUT)
+            if pending:
+                logger.warning(
+                    f"⚠️ {len(pending)} 个后台任务在 {settings.SCHEDULER_STOP_TIMEOUT:g}s 内未结束，已取消",
+                )
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+        for job in self._jobs.values():
+            job.planned = job.next_run = None
+        if self._executor is not None:
+            # 线程中的任务无法中断，不等待其结束
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _dispatch(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            now = time.time()
+            for job in list(self._jobs.values()):
+                if job.next_run is not None and job.next_run <= now:
+                    self._launch(job)
+                    job.schedule(now)
+            upcoming = [job.next_run for job in self._jobs.values() if job.next_run is not None]
+            delay = max(min(upcoming) - time.time(), 0) if upcoming else None
+            self._wakeup.clear()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+
+    # ---- 运行 ----
+
+    def _launch(self, job: Job) -> None:
+        if job.running >= job.max_instances:
+            job.skipped += 1
+            _runs_counter.inc(job=job.name, result="skipped")
+            logger.debug(f"⏭️ 任务 {job.name} 仍有 {job.running} 个运行未结束，跳过本次")
+            return
+        job.running += 1
+        _running_gauge.set(job.running, job=job.name)
+        task = asyncio.create_task(self._run(job), name=f"job:{job.name}")
+        job.tasks.add(task)
+        task.add_done_callback(job.tasks.discard)
+
+    async def _run(self, job: Job) -> None:
+        job.last_started_at = time.time()
+        started = time.perf_counter()
+        result = "ok"
+        future: asyncio.Future | None = None
+        deadline = asyncio.timeout(job.timeout)
+        try:
+            async with deadline:
+                if job.thread:
+                    future = asyncio.get_running_loop().run_in_executor(self._executor, job.func)
+                    await asyncio.shield(future)
+                else:
+                    value = job.func()
+                    if inspect.isawaitable(value):
+                        await value
+        except asyncio.CancelledError:
+            result = "cancelled"
+            raise
+        except Exception as e:
+            if isinstance(e, TimeoutError) and deadline.expired():
+                result = "timeout"
+                job.timeouts += 1
+                job.last_error = f"timeout after {job.timeout:g}s"
+                logger.warning(f"⚠️ 后台任务 {job.name} 超时（{job.timeout:g}s）")
+                if future is not None:
+                    # 线程无法中断：等待其结束后再释放并发名额
+                    with contextlib.suppress(Exception):
+                        await future
+            else:
+                result = "error"
+                job.failures += 1
+                job.last_error = str(e) or type(e).__name__
+                logger.warning(f"⚠️ 后台任务 {job.name} 失败: {job.last_error}")
+        finally:
+            duration = time.perf_counter() - started
+            job.running -= 1
+            job.runs += 1
+            job.last_result = result
+            job.durations.append(duration)
+            _running_gauge.set(job.running, job=job.name)
+            _runs_counter.inc(job=job.name, result=result)
+            _duration_histogram.observe(duration, job=job.name)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "running": self.running,
+            "jobs": [job.snapshot() for job in sorted(self._jobs.values(), key=lambda job: job.name)],
+        }
+
+
+# 全局单例
+scheduler = Scheduler()
@@ -3,13 +3,97 @@
 包括密码加密、JWT令牌生成等
 """
 
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import bcrypt
-from jose import jwt
 
 from src.backend.config.settings import settings
+from src.backend.core.hashing import hash_password, hash_passwords_parallel
+from src.backend.core.logger import logger
+from src.backend.core.tracing import span
+
+# bcrypt 库默认的 cost
+DEFAULT_BCRYPT_ROUNDS = 12
+
+# 校准时实际测量使用的 cost（较低以缩短启动时间，再按 2 的幂外推）
+_CALIBRATION_ROUNDS = 8
+_CALIBRATION_SAMPLES = 3
+
+# 校准结果（None 表示尚未校准）
+_calibrated_rounds: int | None = None
+
+
+def calibrate_bcrypt_rounds() -> int:
+    """
+    校准 bcrypt cost
+
+    测量低 cost 下的哈希耗时，按每增加 1 轮耗时翻倍外推，
+    选出不超过 BCRYPT_TARGET_MS 的最大 cost（限制在 MIN/MAX 范围内）。
+    该函数会阻塞 CPU，应在线程中调用。
+
+    Returns:
+        int: 选定的 cost
+    """
+    global _calibrated_rounds
+
+    if settings.BCRYPT_ROUNDS > 0:
+        _calibrated_rounds = settings.BCRYPT_ROUNDS
+        logger.info(f"🔐 bcrypt cost 已固定为 {_calibrated_rounds}")
+        return _calibrated_rounds
+
+    salt = bcrypt.gensalt(rounds=_CALIBRATION_ROUNDS)
+    best = float("inf")
+    for _ in range(_CALIBRATION_SAMPLES):
+        start = time.perf_counter()
+        bcrypt.hashpw(b"calibration-password", salt)
+        best = min(best, time.perf_counter() - start)
+
+    target_seconds = settings.BCRYPT_TARGET_MS / 1000
+    rounds = settings.BCRYPT_MIN_ROUNDS
+    while rounds < settings.BCRYPT_MAX_ROUNDS:
+        estimated = best * 2 ** (rounds + 1 - _CALIBRATION_ROUNDS)
+        if estimated > target_seconds:
+            break
+        rounds += 1
+
+    _calibrated_rounds = rounds
+    estimated_ms = best * 2 ** (rounds - _CALIBRATION_ROUNDS) * 1000
+    logger.info(
+        f"🔐 bcrypt cost 校准完成: {rounds} (预计 {estimated_ms:.0f} ms/次, 目标 {settings.BCRYPT_TARGET_MS} ms)",
+    )
+    return rounds
+
+
+def get_bcrypt_rounds() -> int:
+    """获取当前使用的 bcrypt cost"""
+    if _calibrated_rounds is not None:
+        return _calibrated_rounds
+    if settings.BCRYPT_ROUNDS > 0:
+        return settings.BCRYPT_ROUNDS
+    return DEFAULT_BCRYPT_ROUNDS
+
+
+def get_hash_rounds(hashed_password: str) -> int | None:
+    """
+    从 bcrypt 哈希中解析 cost
+
+    Args:
+        hashed_password: 形如 $2b$12$... 的哈希
+
+    Returns:
+        int | None: cost，无法解析时返回 None
+    """
+    parts = hashed_password.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """判断已存储的哈希是否需要按当前 cost 重新计算"""
+    return get_hash_rounds(hashed_password) != get_bcrypt_rounds()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -23,10 +107,11 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: 密码是否匹配
     """
-    return bcrypt.checkpw(
-        plain_password.encode("utf-8"),
-        hashed_password.encode("utf-8"),
-    )
+    with span("bcrypt"):
+        return bcrypt.checkpw(
+            plain_password.encode("utf-8"),
+            hashed_password.encode("utf-8"),
+        )
 
 
 def get_password_hash(password: str) -> str:
@@ -42,14 +127,25 @@ def get_password_hash(password: str) -> str:
     Note:
         bcrypt 密码长度限制为 72 字节
     """
-    # bcrypt 只支持最多 72 字节的密码
-    password_bytes = password.encode("utf-8")
-    if len(password_bytes) > 72:
-        password_bytes = password_bytes[:72]
+    with span("bcrypt"):
+        return hash_password(password, get_bcrypt_rounds())
 
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
-    return hashed.decode("utf-8")
+
+async def get_password_hashes(passwords: list[str]) -> list[str]:
+    """
+    批量获取密码哈希（进程池并行，不阻塞事件循环）
+
+    Args:
+        passwords: 明文密码列表
+
+    Returns:
+        list[str]: 与输入顺序一致的密码哈希
+    """
+    return await hash_passwords_parallel(
+        passwords,
+        get_bcrypt_rounds(),
+        settings.PASSWORD_HASH_WORKERS,
+    )
 
 
 def create_access_token(
@@ -75,11 +171,15 @@ def create_access_token(
         )
 
     to_encode.update({"exp": expire})
-    return jwt.encode(
-        to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM,
-    )
+    # jose 会连带导入 cryptography（约 60ms），延迟到首次签发令牌时导入
+    from jose import jwt
+
+    with span("jwt"):
+        return jwt.encode(
+            to_encode,
+            settings.SECRET_KEY,
+            algorithm=settings.ALGORITHM,
+        )
 
 
 def decode_access_token(token: str) -> dict[str, Any] | None:
@@ -92,6 +192,8 @@ def decode_access_token(token: str) -> dict[str, Any] | None:
     Returns:
         dict | None: 解码后的数据，失败返回None
     """
+    from jose import jwt
+
     try:
         return jwt.decode(
             token,
@@ -0,0 +1,63 @@
+"""
+JSON 序列化
+
+API 响应（应用的 default_response_class）、错误响应与 SSE 事件统一通过 dumps 编码
+（日志流解析 loguru 的 JSON 记录使用 loads）：
+- 安装了 orjson 时使用 orjson（uv add orjson）
+- 否则使用 pydantic_core.to_json（Pydantic 自带的 Rust 实现，无需额外依赖）
+
+两者都比标准库 json 快数倍；输出与 Starlette 的 JSONResponse 一致（紧凑分隔符、不转义非 ASCII）。
+datetime / date / UUID / Decimal / Pydantic 模型可直接序列化（日期时间为 ISO 8601），
+其余无法序列化的对象转为 str。
+"""
+
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic_core import from_json, to_json
+from starlette.responses import JSONResponse
+
+from src.backend.core.tracing import span
+
+try:
+    import orjson
+except ImportError:  # 可选依赖：uv add orjson
+    orjson = None
+
+
+def _orjson_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+if orjson is not None:
+
+    def dumps(value: Any) -> bytes:
+        """编码为 JSON 字节串"""
+        return orjson.dumps(value, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+    loads = orjson.loads
+
+else:
+
+    def dumps(value: Any) -> bytes:
+        """编码为 JSON 字节串"""
+        return to_json(value, fallback=str)
+
+    def loads(data: str | bytes) -> Any:
+        """解码 JSON"""
+        return from_json(data)
+
+
+def dumps_str(value: Any) -> str:
+    """编码为 JSON 字符串（SSE 事件的 data 字段）"""
+    return dumps(value).decode()
+
+
+class FastJSONResponse(JSONResponse):
+    """使用 dumps 编码的 JSONResponse（编码耗时计入追踪的 serialize 阶段）"""
+
+    def render(self, content: Any) -> bytes:
+        with span("serialize"):
+            return dumps(content)
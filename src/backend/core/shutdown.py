@@ -0,0 +1,169 @@
+"""
+优雅关闭协调器
+
+uvicorn 收到退出信号（或 worker 达到最大请求数）时，src/backend/server.py 通知协调器开始排空：
+1. 就绪状态置为 False（/health 返回 503，负载均衡停止转发新请求）
+2. 调用排空回调：SSE 流发送带 retry 的 reconnect 事件后结束，新的订阅返回 503
+3. 等待进行中的请求完成（由 DrainMiddleware 计数），最长 SHUTDOWN_DRAIN_TIMEOUT 秒
+4. lifespan 关闭阶段按注册的逆序释放资源（先停止写入方，最后关闭数据库），逐项计时
+
+直接结束 lifespan（测试、脚本）时在第 4 步之前补做 1~3 步。
+"""
+
+import asyncio
+import inspect
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from loguru import logger
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.backend.config.settings import settings
+
+Callback = Callable[[], Awaitable[Any] | Any]
+
+
+async def _call(callback: Callback) -> None:
+    """调用同步或异步回调"""
+    result = callback()
+    if inspect.isawaitable(result):
+        await result
+
+
+class ShutdownCoordinator:
+    """就绪状态、进行中请求计数与关闭顺序"""
+
+    def __init__(self):
+        self.ready = False
+        self.draining = False
+        self.in_flight = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._drain_hooks: list[tuple[str, Callback]] = []
+        self._resources: list[tuple[str, Callback]] = []
+        self._idle = asyncio.Event()
+        self._drain_task: asyncio.Task | None = None
+        self._drain_started: float | None = None
+        self.report: dict[str, Any] | None = None
+
+    def attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        """记录事件循环并重置状态（lifespan 启动时调用）"""
+        self._loop = loop
+        self._idle = asyncio.Event()
+        self.ready = False
+        self.draining = False
+        self._drain_hooks.clear()
+        self._resources.clear()
+        self._drain_task = None
+        self._drain_started = None
+        self.report = None
+
+    def mark_ready(self) -> None:
+        """启动完成，开始接收流量"""
+        self.ready = True
+
+    def on_drain(self, name: str, callback: Callback) -> None:
+        """注册开始排空时调用的回调（通知长连接客户端重连等）"""
+        self._drain_hooks.append((name, callback))
+
+    def register(self, name: str, callback: Callback) -> None:
+        """注册关闭时释放的资源，按注册的逆序调用（先启动的资源最后关闭）"""
+        self._resources.append((name, callback))
+
+    # ---- 进行中的请求（DrainMiddleware 调用） ----
+
+    def request_started(self) -> None:
+        self.in_flight += 1
+        self._idle.clear()
+
+    def request_finished(self) -> None:
+        self.in_flight -= 1
+        if self.in_flight == 0:
+            self._idle.set()
+
+    # ---- 排空 ----
+
+    def request(self) -> None:
+        """请求开始排空（可在信号处理器或其他线程中调用）"""
+        loop = self._loop
+        if loop is None or loop.is_closed() or self.draining:
+            return
+        loop.call_soon_threadsafe(self.begin)
+
+    def begin(self) -> None:
+        """开始排空（在事件循环中调用，重复调用无效）"""
+        if self.draining:
+            return
+        self.ready = False
+        self.draining = True
+        self._drain_started = time.perf_counter()
+        logger.info(f"🛑 开始排空：{self.in_flight} 个进行中的请求，最长等待 {settings.SHUTDOWN_DRAIN_TIMEOUT:g}s")
+        for name, callback in self._drain_hooks:
+            try:
+                result = callback()
+                if inspect.isawaitable(result):
+                    asyncio.ensure_future(result)
+            except Exception as e:
+                logger.warning(f"⚠️ 排空回调 {name} 失败: {e}")
+        self._drain_task = asyncio.create_task(self._wait_idle(settings.SHUTDOWN_DRAIN_TIMEOUT))
+
+    async def _wait_idle(self, timeout: float) -> dict[str, Any]:
+        if self.in_flight > 0:
+            try:
+                await asyncio.wait_for(self._idle.wait(), timeout)
+            except TimeoutError:
+                logger.warning(f"⚠️ 排空超时（{timeout:g}s），仍有 {self.in_flight} 个请求未完成")
+        return {
+            "drain_seconds": time.perf_counter() - (self._drain_started or time.perf_counter()),
+            "remaining": self.in_flight,
+        }
+
+    async def run(self) -> dict[str, Any]:
+        """完成排空并按逆序释放资源，返回各阶段耗时（lifespan 关闭阶段调用）"""
+        self.begin()
+        assert self._drain_task is not None
+        report = await self._drain_task
+
+        resources: list[dict[str, Any]] = []
+        for name, callback in reversed(self._resources):
+            started = time.perf_counter()
+            error = None
+            try:
+                await _call(callback)
+            except Exception as e:
+                error = str(e)
+                logger.error(f"❌ 关闭 {name} 失败: {e}")
+            resources.append({"name": name, "seconds": time.perf_counter() - started, "error": error})
+        self._resources.clear()
+
+        report["resources"] = resources
+        report["total_seconds"] = time.perf_counter() - (self._drain_started or time.perf_counter())
+        self.report = report
+        details = ", ".join(f"{item['name']} {item['seconds'] * 1000:.0f}ms" for item in resources)
+        logger.info(
+            f"🛑 关闭完成，用时 {report['total_seconds'] * 1000:.0f}ms"
+            f"（排空 {report['drain_seconds'] * 1000:.0f}ms，剩余请求 {report['remaining']}；{details}）",
+        )
+        return report
+
+
+class DrainMiddleware:
+    """统计进行中的 HTTP 请求（包括 SSE 长连接），供关闭时排空"""
+
+    def __init__(self, app: ASGIApp, coordinator: ShutdownCoordinator):
+        self.app = app
+        self.coordinator = coordinator
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        self.coordinator.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.coordinator.request_finished()
+
+
+# 全局单例
+shutdown_coordinator = ShutdownCoordinator()
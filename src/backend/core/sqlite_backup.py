@@ -0,0 +1,434 @@
+"""
+SQLite 在线备份
+
+使用 SQLite 的在线备份 API（sqlite3.Connection.backup）逐步复制数据库页：
+- 源连接先开启一个读事务，固定一致的快照；WAL 模式下读事务不阻塞写入，
+  备份期间写入的数据不会让备份重新开始（否则持续写入下备份可能永远无法完成）
+- 每步复制 BACKUP_PAGES_PER_STEP 页，步与步之间休眠 BACKUP_STEP_SLEEP 秒
+- 复制在线程中执行，不阻塞事件循环；进度通过 SSE 推送，多进程模式下任务快照通过
+  SharedJobStore 共享，任意 worker 都能查询与订阅
+- 先写入 .part 临时文件，完成后原子重命名，不会留下不完整的快照
+
+BACKUP_CRON（cron 表达式）或 BACKUP_INTERVAL > 0 时由调度器定时生成快照，
+只保留最新的 BACKUP_RETENTION 份。
+"""
+
+import asyncio
+import contextlib
+import sqlite3
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from tortoise.backends.base.config_generator import expand_db_url
+
+from src.backend.config.settings import settings
+from src.backend.core.logger import logger
+from src.backend.core.metrics import metrics
+from src.backend.core.scheduler import scheduler
+from src.backend.core.serialization import dumps_str
+from src.backend.core.sse import SSEEvent, SSEManager, sse_event
+from src.backend.core.workers import SharedJobStore
+
+SNAPSHOT_PREFIX = "db-"
+SNAPSHOT_SUFFIX = ".sqlite3"
+# 下载时每次读取的字节数
+READ_CHUNK_SIZE = 1024 * 1024
+# gzip 压缩级别（1 最快，9 压缩率最高）
+GZIP_LEVEL = 6
+BACKUP_JOB = "backup_snapshot"
+# 最多保留的任务数
+MAX_JOBS = 16
+# 进度推送的最小间隔（秒）
+PUBLISH_INTERVAL = 0.2
+# 跨 worker 跟随备份进度时，超过该时间（秒）快照没有变化则结束订阅
+FOLLOW_IDLE_TIMEOUT = 60.0
+FINISHED_STATUSES = ("completed", "failed")
+
+backup_job_store = SharedJobStore("backup")
+
+_backup_counter = metrics.counter("sqlite_backup_total", "SQLite 在线备份次数（按结果）")
+_backup_histogram = metrics.histogram("sqlite_backup_seconds", "SQLite 在线备份耗时")
+
+
+class BackupCancelled(Exception):
+    """备份被取消（应用关闭等）"""
+
+
+def get_sqlite_path(database_url: str | None = None) -> Path | None:
+    """从数据库 URL 解析 SQLite 文件路径，非 SQLite 或内存数据库返回 None"""
+    database_url = database_url or settings.DATABASE_URL
+    if not database_url.startswith("sqlite://"):
+        return None
+    file_path = expand_db_url(database_url)["credentials"]["file_path"]
+    if file_path == ":memory:":
+        return None
+    return Path(file_path)
+
+
+def snapshot_path(directory: Path) -> Path:
+    """生成新快照的文件路径（按时间命名，字典序即时间顺序）"""
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = directory / f"{SNAPSHOT_PREFIX}{stamp}{SNAPSHOT_SUFFIX}"
+    index = 1
+    while path.exists():
+        path = directory / f"{SNAPSHOT_PREFIX}{stamp}-{index}{SNAPSHOT_SUFFIX}"
+        index += 1
+    return path
+
+
+def list_snapshots(directory: Path) -> list[Path]:
+    """列出已有快照（最新的在前）"""
+    if not directory.exists():
+        return []
+    return sorted(
+        (
+            path
+            for path in directory.iterdir()
+            if path.name.startswith(SNAPSHOT_PREFIX)
+            and path.name.endswith((SNAPSHOT_SUFFIX, f"{SNAPSHOT_SUFFIX}.gz"))
+        ),
+        key=lambda path: path.name,
+        reverse=True,
+    )
+
+
+def prune_snapshots(directory: Path, keep: int) -> list[Path]:
+    """只保留最新的 keep 份快照，返回被删除的文件"""
+    if keep <= 0:
+        return []
+    removed = list_snapshots(directory)[keep:]
+    for path in removed:
+        path.unlink(missing_ok=True)
+    return removed
+
+
+def backup_sqlite(
+    source: Path,
+    target: Path,
+    *,
+    pages: int | None = None,
+    sleep: float | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> int:
+    """
+    在线备份 SQLite 数据库（同步，应在线程中调用）
+
+    Args:
+        source: 源数据库文件
+        target: 快照文件
+        pages: 每步复制的页数
+        sleep: 步与步之间的休眠（秒）
+        progress: 进度回调 (已复制页数, 总页数)，抛出异常可中止备份
+
+    Returns:
+        int: 数据库总页数
+    """
+    pages = pages or settings.BACKUP_PAGES_PER_STEP
+    sleep = settings.BACKUP_STEP_SLEEP if sleep is None else sleep
+    partial = target.with_name(f"{target.name}.part")
+    partial.unlink(missing_ok=True)
+    total_pages = 0
+
+    def on_progress(_status: int, remaining: int, total: int) -> None:
+        nonlocal total_pages
+        total_pages = total
+        if progress is not None:
+            progress(total - remaining, total)
+
+    src = sqlite3.connect(source, isolation_level=None)
+    dst = sqlite3.connect(partial)
+    try:
+        src.execute("PRAGMA query_only=ON")
+        # 开启读事务固定快照：备份期间其他连接的写入不会导致备份重启
+        src.execute("BEGIN")
+        src.execute("SELECT count(*) FROM sqlite_master").fetchone()
+        src.backup(dst, pages=pages, progress=on_progress, sleep=sleep)
+        src.execute("COMMIT")
+        # 快照为单文件，不依赖 -wal / -shm
+        dst.execute("PRAGMA journal_mode=DELETE")
+    except BaseException:
+        dst.close()
+        partial.unlink(missing_ok=True)
+        raise
+    finally:
+        src.close()
+    dst.close()
+    partial.replace(target)
+    return total_pages
+
+
+def gzip_file(path: Path) -> Path:
+    """将文件压缩为 .gz 并删除原文件（同步）"""
+    target = path.with_name(f"{path.name}.gz")
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    with path.open("rb") as src, target.open("wb") as dst:
+        while chunk := src.read(READ_CHUNK_SIZE):
+            dst.write(compressor.compress(chunk))
+        dst.write(compressor.flush())
+    path.unlink()
+    return target
+
+
+async def stream_file(path: Path, *, compress: bool = False) -> AsyncIterator[bytes]:
+    """分块读取文件（可选在线 gzip 压缩），内存占用与文件大小无关"""
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31) if compress else None
+    with path.open("rb") as f:
+        while chunk := await asyncio.to_thread(f.read, READ_CHUNK_SIZE):
+            if compressor is not None:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+    if compressor is not None:
+        yield compressor.flush()
+
+
+class BackupJob:
+    """一次备份任务的状态"""
+
+    def __init__(self, job_id: str, reason: str):
+        self.job_id = job_id
+        self.reason = reason
+        self.status = "pending"
+        self.pages_done = 0
+        self.pages_total = 0
+        self.file: str | None = None
+        self.size: int | None = None
+        self.error: str | None = None
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.cancelled = False
+        self.sse_manager = SSEManager()
+        self._last_publish = 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def snapshot(self) -> dict[str, Any]:
+        elapsed = (self.finished_at or time.monotonic()) - (
+            self.started_at or time.monotonic()
+        )
+        return {
+            "job_id": self.job_id,
+            "reason": self.reason,
+            "status": self.status,
+            "pages_done": self.pages_done,
+            "pages_total": self.pages_total,
+            "progress": round(self.pages_done / self.pages_total, 4) if self.pages_total else 0,
+            "file": self.file,
+            "size": self.size,
+            "error": self.error,
+            "elapsed_seconds": round(elapsed, 3),
+        }
+
+    async def publish(self, force: bool = True) -> None:
+        """向订阅者推送当前进度（非强制时限频），任务结束时关闭所有订阅"""
+        now = time.monotonic()
+        if not force and now - self._last_publish < PUBLISH_INTERVAL:
+            return
+        self._last_publish = now
+        snapshot = self.snapshot()
+        backup_job_store.write(self.job_id, snapshot)
+        await self.sse_manager.broadcast(snapshot, event="progress")
+        if self.finished:
+            await self.sse_manager.shutdown()
+
+    async def stream(self) -> AsyncIterator[SSEEvent]:
+        """进度事件流：先发送当前快照，再推送后续进度"""
+        yield sse_event(dumps_str(self.snapshot()), "progress")
+        if self.finished:
+            return
+        async for message in self.sse_manager.subscribe():
+            yield message
+
+
+class BackupManager:
+    """备份任务管理：同一时间只运行一个备份，并负责定时快照与保留策略"""
+
+    def __init__(self, capacity: int = MAX_JOBS):
+        self.capacity = capacity
+        self._jobs: OrderedDict[str, BackupJob] = OrderedDict()
+        self._running: tuple[BackupJob, asyncio.Task] | None = None
+
+    @property
+    def directory(self) -> Path:
+        return Path(settings.BACKUP_DIR)
+
+    @property
+    def supported(self) -> bool:
+        return get_sqlite_path() is not None
+
+    def get(self, job_id: str) -> BackupJob | None:
+        return self._jobs.get(job_id)
+
+    def find(self, job_id: str) -> dict[str, Any] | None:
+        """任务快照：本进程的任务，或多进程模式下其他 worker 共享的快照"""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job.snapshot()
+        return backup_job_store.read(job_id)
+
+    async def follow(self, job_id: str) -> AsyncIterator[SSEEvent]:
+        """进度事件流：本进程的任务直接订阅，其他 worker 的任务轮询共享快照"""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            async for message in job.stream():
+                yield message
+            return
+        async for snapshot in backup_job_store.follow(
+            job_id,
+            lambda snapshot: snapshot["status"] in FINISHED_STATUSES,
+            FOLLOW_IDLE_TIMEOUT,
+        ):
+            yield sse_event(dumps_str(snapshot), "progress")
+
+    def jobs(self) -> list[dict[str, Any]]:
+        return [job.snapshot() for job in reversed(self._jobs.values())]
+
+    def snapshots(self) -> list[dict[str, Any]]:
+        result = []
+        for path in list_snapshots(self.directory):
+            stat = path.stat()
+            result.append(
+                {
+                    "name": path.name,
+                    "size": stat.st_size,
+                    "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                },
+            )
+        return result
+
+    def find_snapshot(self, name: str) -> Path | None:
+        """按文件名查找快照（只接受 list_snapshots 中的文件，防止路径穿越）"""
+        for path in list_snapshots(self.directory):
+            if path.name == name:
+                return path
+        return None
+
+    def start(self, reason: str = "manual") -> BackupJob:
+        """启动一次备份；已有备份在运行时直接返回该任务"""
+        if self._running is not None and not self._running[0].finished:
+            return self._running[0]
+
+        job = BackupJob(uuid.uuid4().hex, reason)
+        self._jobs[job.job_id] = job
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.capacity:
+                break
+            if self._jobs[job_id].finished:
+                del self._jobs[job_id]
+
+        self._running = (job, asyncio.create_task(self._run(job)))
+        return job
+
+    async def wait(self, job: BackupJob) -> BackupJob:
+        """等待备份任务结束"""
+        if self._running is not None and self._running[0] is job:
+            await asyncio.shield(self._running[1])
+        return job
+
+    async def _snapshot(self, progress: Callable[[int, int], None]) -> Path:
+        """在线程中写入一份新快照，返回快照路径"""
+        source = get_sqlite_path()
+        if source is None:
+            raise RuntimeError("仅支持 SQLite 文件数据库的在线备份")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        target = snapshot_path(self.directory)
+        await asyncio.to_thread(backup_sqlite, source, target, progress=progress)
+        return target
+
+    async def _run(self, job: BackupJob) -> None:
+        loop = asyncio.get_running_loop()
+        job.status = "running"
+        job.started_at = time.monotonic()
+        await job.publish()
+
+        # 进度推送任务（保留引用直到完成，避免被垃圾回收）
+        publishing: set[asyncio.Task] = set()
+        last_progress = 0.0
+
+        def schedule_publish() -> None:
+            task = asyncio.create_task(job.publish())
+            publishing.add(task)
+            task.add_done_callback(publishing.discard)
+
+        def on_progress(done: int, total: int) -> None:
+            # 在备份线程中调用，限频后才切回事件循环推送
+            nonlocal last_progress
+            if job.cancelled:
+                raise BackupCancelled
+            job.pages_done, job.pages_total = done, total
+            now = time.monotonic()
+            if now - last_progress < PUBLISH_INTERVAL:
+                return
+            last_progress = now
+            loop.call_soon_threadsafe(schedule_publish)
+
+        try:
+            target = await self._snapshot(on_progress)
+            job.file = target.name
+            job.size = target.stat().st_size
+        except Exception as e:
+            job.status = "failed"
+            job.error = "已取消" if isinstance(e, BackupCancelled) else str(e)
+            _backup_counter.inc(result="failed")
+            logger.error(f"❌ 数据库快照失败 [{job.reason}]: {job.error}")
+        else:
+            job.status = "completed"
+            _backup_counter.inc(result="completed")
+            # 快照已经写入，清理旧快照失败不影响本次备份的结果
+            try:
+                removed = len(prune_snapshots(self.directory, settings.BACKUP_RETENTION))
+            except OSError as e:
+                removed = 0
+                logger.warning(f"⚠️ 清理旧快照失败: {e}")
+            logger.info(
+                f"💾 数据库快照完成 [{job.reason}]: {target.name} "
+                f"({job.size / 1024 / 1024:.1f} MiB, 清理旧快照 {removed} 份)",
+            )
+        finally:
+            if not job.finished:
+                job.status = "failed"
+                job.error = "已取消"
+            job.finished_at = time.monotonic()
+            _backup_histogram.observe(job.finished_at - job.started_at)
+            if publishing:
+                await asyncio.gather(*publishing, return_exceptions=True)
+            await job.publish()
+
+    async def _scheduled_snapshot(self) -> None:
+        await self.wait(self.start(reason="scheduled"))
+
+    def start_schedule(self) -> None:
+        """注册定时快照（BACKUP_CRON 或 BACKUP_INTERVAL > 0，且为 SQLite 时）"""
+        if not self.supported or scheduler.get(BACKUP_JOB) is not None:
+            return
+        if settings.BACKUP_CRON:
+            job = scheduler.add_cron(BACKUP_JOB, self._scheduled_snapshot, settings.BACKUP_CRON)
+        elif settings.BACKUP_INTERVAL > 0:
+            job = scheduler.add_interval(BACKUP_JOB, self._scheduled_snapshot, settings.BACKUP_INTERVAL)
+        else:
+            return
+        job.description = "SQLite 定时快照"
+        logger.info(
+            f"💾 已启用定时快照: {job.trigger}, 保留 {settings.BACKUP_RETENTION} 份 → {self.directory}",
+        )
+
+    async def stop(self) -> None:
+        """停止定时快照并中止进行中的备份（应用关闭时调用）"""
+        await scheduler.remove(BACKUP_JOB, wait=False)
+        if self._running is not None:
+            job, task = self._running
+            job.cancelled = True
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+            self._running = None
+
+
+backups: BackupManager = BackupManager()
@@ -1,13 +1,57 @@
 import asyncio
-import json
+import math
+import random
 import sys
+import weakref
 from collections import deque
+from collections.abc import AsyncIterator
 from contextlib import suppress
 from typing import Any, Dict, List, Optional
 
-from sse_starlette.event import ServerSentEvent
+from loguru import logger
+from starlette.responses import Response
 
 from src.backend.config.settings import settings
+from src.backend.core.serialization import FastJSONResponse, dumps_str, loads
+from src.backend.core.shutdown import shutdown_coordinator
+
+# SSE 事件：EventSourceResponse 直接接受 {"data": ..., "event": ...}，
+# 生产者不需要在导入时加载 sse_starlette
+SSEEvent = Dict[str, str]
+
+
+def sse_event(data: str, event: str = "message") -> SSEEvent:
+    """构造一条 SSE 事件"""
+    return {"data": data, "event": event}
+
+
+def reconnect_delay_ms() -> int:
+    """客户端重连间隔：SHUTDOWN_SSE_RETRY_MS 的 1~2 倍随机值，避免所有客户端同时重连"""
+    base = max(settings.SHUTDOWN_SSE_RETRY_MS, 0)
+    return base + random.randint(0, base)
+
+
+def event_source_response(stream: AsyncIterator[SSEEvent]) -> Response:
+    """
+    SSE 响应
+
+    sse_starlette 会连带导入 uvicorn（约 70ms），延迟到首次建立 SSE 连接时导入。
+    服务正在关闭时不再接受新的订阅，返回 503 并通过 Retry-After 告知客户端稍后重连。
+    """
+    if shutdown_coordinator.draining:
+        return FastJSONResponse(
+            status_code=503,
+            content={"detail": "Server is shutting down"},
+            headers={"Retry-After": str(math.ceil(reconnect_delay_ms() / 1000))},
+        )
+
+    from sse_starlette.sse import EventSourceResponse
+
+    return EventSourceResponse(stream)
+
+
+# 所有存活的 SSEManager，关闭时统一通知客户端重连
+_managers: "weakref.WeakSet[SSEManager]" = weakref.WeakSet()
 
 
 class SSEManager:
@@ -15,6 +59,7 @@ class SSEManager:
 
     def __init__(self):
         self.connections: List[asyncio.Queue] = []
+        _managers.add(self)
 
     async def subscribe(self):
         """订阅实时消息"""
@@ -38,7 +83,7 @@ class SSEManager:
         if not self.connections:
             return
 
-        message = ServerSentEvent(data=json.dumps(data, default=str), event=event)
+        message = sse_event(dumps_str(data), event)
         # 复制列表以避免在迭代时修改
         for queue in list(self.connections):
             with suppress(Exception):
@@ -51,6 +96,24 @@ class SSEManager:
                 queue.put_nowait(None)
         self.connections.clear()
 
+    def reconnect(self) -> int:
+        """发送 reconnect 事件（附带 retry 重连间隔）后关闭所有连接，返回关闭的连接数"""
+        queues = list(self.connections)
+        for queue in queues:
+            delay = reconnect_delay_ms()
+            with suppress(Exception):
+                queue.put_nowait({"data": dumps_str({"retry": delay}), "event": "reconnect", "retry": delay})
+                queue.put_nowait(None)
+        self.connections.clear()
+        return len(queues)
+
+
+def reconnect_all() -> None:
+    """通知所有 SSE 客户端重连到其他实例（服务开始排空时调用）"""
+    closed = sum(manager.reconnect() for manager in list(_managers))
+    if closed:
+        logger.info(f"🔌 已通知 {closed} 个 SSE 连接重连")
+
 
 class LogStreamManager:
     """日志流管理器（带缓冲）"""
@@ -71,7 +134,7 @@ class LogStreamManager:
         """
         try:
             # 解析 Loguru 的 JSON 格式日志
-            record = json.loads(message)
+            record = loads(message)
 
             # 提取关键信息
             r = record.get("record", {})
@@ -122,7 +185,7 @@ class LogStreamManager:
         # 创建副本以避免在迭代期间被其他协程修改
         history_logs = list(self.buffer)
         for log in history_logs:
-            yield ServerSentEvent(data=json.dumps(log, default=str), event="log")
+            yield sse_event(dumps_str(log), "log")
 
         # 2. 发送实时日志
         async for msg in self.sse_manager.subscribe():
@@ -0,0 +1,145 @@
+"""
+启动耗时统计
+
+lifespan 把启动拆成若干阶段，每个阶段用 startup_timer.phase(...) 计时；
+启动完成后输出一行汇总日志，明细可通过 /api/monitor/startup 查看。
+导入阶段的耗时（按模块）由 scripts/startup-report.py 借助 `python -X importtime` 统计。
+
+桌面启动器（src/backend/desktop_launcher.py）还会记录从进程启动到浏览器首次绘制的
+里程碑（解包、导入、启动完成、开始监听、首个响应、首次绘制），等待 wait_ready() 后再打开浏览器。
+"""
+
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class StartupTimer:
+    """记录 lifespan 各启动阶段的耗时"""
+
+    def __init__(self):
+        self.phases: list[tuple[str, float]] = []
+        self.ready_at: datetime | None = None
+        self._started: float | None = None
+        self.total_seconds = 0.0
+        # 冷启动里程碑 (名称, time.time())，由桌面启动器开启
+        self.milestones: list[tuple[str, float]] = []
+        self.tracking_launch = False
+        self.first_paint_ms: float | None = None  # 浏览器报告的 first-contentful-paint（相对页面导航开始）
+        # 以下事件可在其他线程中等待（桌面启动器）
+        self._ready = threading.Event()
+        self._first_response = threading.Event()
+        self._first_paint = threading.Event()
+
+    def begin(self) -> None:
+        self.phases.clear()
+        self.ready_at = None
+        self._ready.clear()
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """计时一个启动阶段（阶段内抛出异常时同样记录）"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+
+    def finish(self) -> None:
+        if self._started is not None:
+            self.total_seconds = time.perf_counter() - self._started
+        self.ready_at = datetime.now()
+        self.milestone("启动完成")
+
+    def mark_serving(self) -> None:
+        """lifespan 启动完成且已开始监听（src/backend/server.py 的 Server.startup 调用）"""
+        self.milestone("开始监听")
+        self._ready.set()
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """等待服务可以接收请求，返回是否在超时前就绪"""
+        return self._ready.wait(timeout)
+
+    # ---- 冷启动里程碑（桌面启动器） ----
+
+    def track_launch(self, launched_at: float) -> None:
+        """开始记录冷启动里程碑，launched_at 为进程（或 PyInstaller 引导程序）启动的时间"""
+        self.tracking_launch = True
+        self.milestones = [("进程启动", launched_at)]
+
+    def milestone(self, name: str, at: float | None = None) -> None:
+        if self.tracking_launch:
+            self.milestones.append((name, at if at is not None else time.time()))
+
+    def mark_first_response(self) -> None:
+        if not self._first_response.is_set():
+            self.milestone("首个响应")
+            self._first_response.set()
+
+    def wait_first_response(self, timeout: float | None = None) -> bool:
+        return self._first_response.wait(timeout)
+
+    def mark_first_paint(self, paint_ms: float) -> bool:
+        """记录浏览器报告的首次绘制（只接受启动器打开的第一个页面），返回是否记录"""
+        if not self.tracking_launch or self._first_paint.is_set():
+            return False
+        self.milestone("首次绘制")
+        self.first_paint_ms = paint_ms
+        self._first_paint.set()
+        return True
+
+    def wait_first_paint(self, timeout: float | None = None) -> bool:
+        return self._first_paint.wait(timeout)
+
+    def launch_breakdown(self) -> list[tuple[str, float]]:
+        """相邻里程碑之间的耗时 [(到达的里程碑, 秒)]"""
+        return [
+            (name, at - previous)
+            for (_, previous), (name, at) in zip(self.milestones, self.milestones[1:])
+        ]
+
+    def summary(self) -> str:
+        """一行汇总：总耗时与最慢的几个阶段"""
+        slowest = sorted(self.phases, key=lambda item: item[1], reverse=True)[:3]
+        details = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in slowest)
+        return f"{self.total_seconds * 1000:.0f}ms（{details}）"
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "total_seconds": round(self.total_seconds, 4),
+            "ready_at": self.ready_at,
+            "phases": [
+                {"name": name, "seconds": round(seconds, 4)} for name, seconds in self.phases
+            ],
+            "first_paint_ms": self.first_paint_ms,
+            "launch": [
+                {"name": name, "seconds": round(seconds, 4)} for name, seconds in self.launch_breakdown()
+            ],
+        }
+
+
+class FirstResponseMiddleware:
+    """第一个 HTTP 响应发送完成时通知 startup_timer（之后只多一次属性判断）"""
+
+    def __init__(self, app: ASGIApp, timer: StartupTimer):
+        self.app = app
+        self.timer = timer
+        self.done = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.done or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+        self.done = True
+        self.timer.mark_first_response()
+
+
+# 全局单例
+startup_timer = StartupTimer()
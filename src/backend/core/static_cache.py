@@ -0,0 +1,390 @@
+"""
+静态资源清单与内存缓存
+
+启动时索引前端构建产物（static/）建立清单，请求只做一次字典查找，
+不再逐个请求 stat 文件系统；清单之外的路径一律不存在，天然杜绝路径穿越。
+清单只在显式 reload（POST /api/admin/static/reload）或开发环境文件变化时重建。
+
+文件内容载入内存（受 STATIC_CACHE_MAX_BYTES 限制），并预先计算：
+- gzip / brotli 压缩版本（已存在 .gz / .br 预压缩文件时直接使用；未安装 brotli 时只有 gzip）
+- 强 ETag（内容 sha256），每种编码使用独立的 ETag
+- Cache-Control：Vite 带内容哈希的 /assets/* 文件长期缓存且 immutable，
+  index.html 等每次协商（no-cache + ETag → 304）
+
+请求直接从内存返回，按 Accept-Encoding 选择编码，If-None-Match 命中时返回 304；
+未载入内存的文件（超出上限）从磁盘读取（RangeFileResponse，支持 Range），仍带相同的缓存头。
+"""
+
+import asyncio
+import contextlib
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import time
+from datetime import UTC, datetime
+from email.utils import format_datetime
+from pathlib import Path
+from typing import Any
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from src.backend.config.settings import settings
+from src.backend.core.compression import COMPRESSIBLE_TYPES
+from src.backend.core.file_delivery import RangeFileResponse
+from src.backend.core.logger import logger
+from src.backend.core.metrics import metrics
+
+try:
+    import brotli
+except ImportError:  # 可选依赖：uv add brotli
+    brotli = None
+
+# 产物文件名中的内容哈希：8 位以上十六进制（vendor.3f9a2c1b.js），或 Vite 默认的
+# 8 位 base64url（index-BvX3k9aQ.js，要求含大写字母或数字，排除 logo-download.png 这类单词）
+HASHED_ASSET = re.compile(
+    r"[-.](?:[0-9a-f]{8,}|(?=[a-z_-]*[A-Z0-9])[A-Za-z0-9_-]{8})\.[A-Za-z0-9]+$",
+)
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+DEFAULT_CACHE = "public, max-age=3600"
+
+# 小于该大小的文件不压缩（压缩收益小于额外的头部开销）
+MIN_COMPRESS_SIZE = 512
+# 压缩后至少要小于原文件的该比例才保留压缩版本
+MIN_COMPRESS_RATIO = 0.9
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+PRECOMPRESSED_SUFFIXES = {".gz": "gzip", ".br": "br"}
+
+_responses_counter = metrics.counter("static_responses_total", "静态资源响应数（按来源与编码）")
+
+
+def cache_control_for(rel_path: str) -> str:
+    """根据路径决定 Cache-Control"""
+    if rel_path.startswith("assets/") and HASHED_ASSET.search(rel_path):
+        return IMMUTABLE_CACHE
+    if rel_path.endswith(".html"):
+        return REVALIDATE_CACHE
+    return DEFAULT_CACHE
+
+
+def accepted_encodings(header: str | None) -> set[str]:
+    """解析 Accept-Encoding，返回可接受（q > 0）的编码"""
+    accepted = set()
+    for item in (header or "").split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if quality > 0:
+            accepted.add(name)
+    return accepted
+
+
+def etag_matches(if_none_match: str | None, etags: tuple[str, ...]) -> bool:
+    """If-None-Match 是否命中（弱比较）"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return any(etag in candidates for etag in etags)
+
+
+class StaticAsset:
+    """一个载入内存的静态文件及其预压缩版本"""
+
+    __slots__ = ("bodies", "cache_control", "etags", "last_modified", "media_type")
+
+    def __init__(
+        self,
+        rel_path: str,
+        body: bytes,
+        media_type: str,
+        mtime: float,
+        compressed: dict[str, bytes],
+    ):
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.media_type = media_type
+        self.cache_control = cache_control_for(rel_path)
+        self.last_modified = format_datetime(datetime.fromtimestamp(mtime, UTC), usegmt=True)
+        # identity 在前；每种编码是不同的表示，ETag 必须不同
+        self.bodies: dict[str, bytes] = {"identity": body, **compressed}
+        self.etags: dict[str, str] = {
+            encoding: f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"'
+            for encoding in self.bodies
+        }
+
+    @property
+    def all_etags(self) -> tuple[str, ...]:
+        return tuple(self.etags.values())
+
+    def choose_encoding(self, accept_encoding: str | None) -> str:
+        """按 br > gzip > identity 选择客户端可接受的编码"""
+        if len(self.bodies) == 1:
+            return "identity"
+        accepted = accepted_encodings(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in self.bodies and encoding in accepted:
+                return encoding
+        return "identity"
+
+    def response(self, headers: Headers) -> Response:
+        encoding = self.choose_encoding(headers.get("accept-encoding"))
+        response_headers = {
+            "ETag": self.etags[encoding],
+            "Cache-Control": self.cache_control,
+            "Last-Modified": self.last_modified,
+        }
+        if len(self.bodies) > 1:
+            response_headers["Vary"] = "Accept-Encoding"
+
+        if etag_matches(headers.get("if-none-match"), self.all_etags):
+            _responses_counter.inc(source="memory", encoding="not_modified")
+            return Response(status_code=304, headers=response_headers)
+
+        if encoding != "identity":
+            response_headers["Content-Encoding"] = encoding
+        _responses_counter.inc(source="memory", encoding=encoding)
+        return Response(
+            content=self.bodies[encoding],
+            headers=response_headers,
+            media_type=self.media_type,
+        )
+
+
+def precompress(
+    body: bytes,
+    media_type: str,
+    existing: dict[str, bytes] | None = None,
+) -> dict[str, bytes]:
+    """生成 gzip / br 版本（existing 中已有的编码直接使用），只保留明显变小的版本"""
+    if len(body) < MIN_COMPRESS_SIZE or not media_type.startswith(COMPRESSIBLE_TYPES):
+        return {}
+
+    compressed = dict(existing or {})
+    if "gzip" not in compressed:
+        compressed["gzip"] = gzip.compress(body, GZIP_LEVEL, mtime=0)
+    if "br" not in compressed and brotli is not None:
+        compressed["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+
+    return {
+        encoding: data
+        for encoding, data in compressed.items()
+        if len(data) < len(body) * MIN_COMPRESS_RATIO
+    }
+
+
+def _compress(path: Path, body: bytes, media_type: str) -> dict[str, bytes]:
+    """取得文件的压缩版本：优先使用构建产生的预压缩文件，否则现场压缩"""
+    if len(body) < MIN_COMPRESS_SIZE or not media_type.startswith(COMPRESSIBLE_TYPES):
+        return {}
+
+    existing: dict[str, bytes] = {}
+    mtime = path.stat().st_mtime
+    for suffix, encoding in PRECOMPRESSED_SUFFIXES.items():
+        sibling = path.with_name(path.name + suffix)
+        if sibling.is_file() and sibling.stat().st_mtime >= mtime:
+            existing[encoding] = sibling.read_bytes()
+    return precompress(body, media_type, existing)
+
+
+class StaticDiskFile:
+    """清单中未载入内存的文件（超出上限），请求时从磁盘读取"""
+
+    __slots__ = ("cache_control", "path", "stat")
+
+    def __init__(self, rel_path: str, path: Path, stat: os.stat_result):
+        self.path = path
+        self.stat = stat
+        self.cache_control = cache_control_for(rel_path)
+
+    def response(self, headers: Headers) -> Response:
+        # 使用建清单时的 stat 结果生成 ETag 等响应头（发送前以打开文件后的 fstat 校正）；
+        # 大文件支持 Range 断点续传，并按服务器能力零拷贝或在线程中分块读取
+        response = RangeFileResponse(
+            self.path,
+            stat_result=self.stat,
+            headers={"Cache-Control": self.cache_control},
+        )
+        if etag_matches(headers.get("if-none-match"), (response.headers["etag"],)):
+            _responses_counter.inc(source="disk", encoding="not_modified")
+            return Response(
+                status_code=304,
+                headers={
+                    "ETag": response.headers["etag"],
+                    "Cache-Control": self.cache_control,
+                },
+            )
+        _responses_counter.inc(source="disk", encoding="identity")
+        return response
+
+
+class StaticCache:
+    """
+    前端构建产物的清单与内存缓存
+
+    启动时（或显式 reload / 开发环境文件变化时）一次性索引 root 下的全部文件，
+    每个文件对应清单中的一项：载入内存的 StaticAsset 或磁盘上的 StaticDiskFile。
+    请求时只做一次字典查找；清单之外的路径（包括 ../ 之类）不可能命中，
+    也就不会越出 root。
+    """
+
+    def __init__(self):
+        self.root: Path | None = None
+        self._entries: dict[str, StaticAsset | StaticDiskFile] = {}
+        self._watch_task: asyncio.Task | None = None
+        self.bytes = 0
+        self.compressed_bytes = 0
+        self.disk_files = 0
+        self.load_seconds = 0.0
+        self.loaded_at: datetime | None = None
+
+    def configure(self, root: Path) -> None:
+        self.root = root
+
+    def load(self) -> None:
+        """
+        重建清单并载入文件内容（同步，CPU 密集，应在线程中调用）
+
+        超出单文件或总量上限的文件只记录路径与 stat，请求时从磁盘读取。
+        """
+        if self.root is None or not self.root.is_dir():
+            return
+        started = time.perf_counter()
+        max_bytes = settings.STATIC_CACHE_MAX_BYTES
+        max_file_bytes = settings.STATIC_CACHE_MAX_FILE_BYTES
+        entries: dict[str, StaticAsset | StaticDiskFile] = {}
+        total = compressed_total = disk_files = 0
+
+        for path in sorted(self.root.rglob("*")):
+            if not path.is_file():
+                continue
+            # 预压缩版本随原文件一起载入；没有对应原文件的 .gz / .br（如 archive.tar.gz）按普通文件处理
+            if path.suffix in PRECOMPRESSED_SUFFIXES and path.with_suffix("").is_file():
+                continue
+            rel_path = path.relative_to(self.root).as_posix()
+            stat = path.stat()
+            if stat.st_size > max_file_bytes or total + stat.st_size > max_bytes:
+                entries[rel_path] = StaticDiskFile(rel_path, path, stat)
+                disk_files += 1
+                continue
+
+            body = path.read_bytes()
+            media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+            compressed = _compress(path, body, media_type)
+            entries[rel_path] = StaticAsset(
+                rel_path,
+                body,
+                media_type,
+                stat.st_mtime,
+                compressed,
+            )
+            total += stat.st_size
+            compressed_total += sum(len(data) for data in compressed.values())
+
+        # 整体替换，进行中的请求仍使用旧清单
+        self._entries = entries
+        self.bytes = total
+        self.compressed_bytes = compressed_total
+        self.disk_files = disk_files
+        self.load_seconds = time.perf_counter() - started
+        self.loaded_at = datetime.now(UTC)
+        logger.info(
+            f"🗜️ 静态资源清单已建立: {len(entries)} 个文件, 内存 {total / 1024 / 1024:.1f} MiB "
+            f"(压缩版本 {compressed_total / 1024 / 1024:.1f} MiB, "
+            f"{'gzip+br' if brotli is not None else 'gzip'}), "
+            f"磁盘 {disk_files} 个, 用时 {self.load_seconds:.2f}s",
+        )
+
+    def lookup(self, rel_path: str) -> StaticAsset | StaticDiskFile | None:
+        return self._entries.get(rel_path)
+
+    def response(self, rel_path: str, headers: Headers) -> Response | None:
+        """按清单构造响应，路径不在清单中时返回 None"""
+        entry = self._entries.get(rel_path)
+        if entry is None:
+            return None
+        return entry.response(headers)
+
+    async def reload(self) -> None:
+        """重建清单（构建产物更新后调用）"""
+        await asyncio.to_thread(self.load)
+
+    async def _watch(self) -> None:
+        try:
+            from watchfiles import awatch
+        except ImportError:
+            logger.warning("⚠️ 未安装 watchfiles，静态资源变化后需手动 reload")
+            return
+        async for _changes in awatch(self.root):
+            try:
+                await self.reload()
+            except Exception as e:
+                logger.warning(f"⚠️ 静态资源清单重建失败: {e}")
+
+    def start_watch(self) -> None:
+        """监听 root 变化并自动重建清单（开发环境使用）"""
+        if self.root is None or not self.root.is_dir() or self._watch_task is not None:
+            return
+        self._watch_task = asyncio.create_task(self._watch())
+
+    async def stop_watch(self) -> None:
+        if self._watch_task is None:
+            return
+        self._watch_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._watch_task
+        self._watch_task = None
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "root": str(self.root) if self.root else None,
+            "files": len(self._entries),
+            "memory_files": len(self._entries) - self.disk_files,
+            "disk_files": self.disk_files,
+            "bytes": self.bytes,
+            "compressed_bytes": self.compressed_bytes,
+            "brotli": brotli is not None,
+            "watching": self._watch_task is not None and not self._watch_task.done(),
+            "load_seconds": round(self.load_seconds, 3),
+            "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None,
+        }
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    按 StaticCache 清单服务的 StaticFiles
+
+    沿用 StaticFiles 的路径规范化；文件是否存在只看清单，不访问文件系统。
+    """
+
+    def __init__(self, *, directory: Path, cache: StaticCache, prefix: str):
+        super().__init__(directory=str(directory))
+        self.cache = cache
+        self.prefix = prefix
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405)
+        rel_path = f"{self.prefix}/{path.replace(os.sep, '/')}"
+        response = self.cache.response(rel_path, Headers(scope=scope))
+        if response is None:
+            raise HTTPException(status_code=404)
+        return response
+
+
+static_cache: StaticCache = StaticCache()
@@ -0,0 +1,191 @@
+"""
+进程内请求追踪
+
+TracingMiddleware 为每个 HTTP 请求创建一个 Trace（放在 contextvar 中），请求处理过程中
+用 span() 计时各阶段：
+
+    with span("bcrypt"):
+        ...
+
+已内置的阶段：db（连接锁 / 连接池的持有时间，db_wait 为排队时间）、bcrypt、jwt、
+serialize（响应 JSON 编码）。没有进行中的追踪时 span() 只多一次 contextvar 读取。
+
+- 响应头 Server-Timing 按阶段汇总耗时（浏览器开发者工具的 Timing 面板可直接查看），
+  total 为收到请求到开始响应的耗时；X-Request-ID 返回请求 ID（请求中带合法的 X-Request-ID 时沿用）
+- 请求 ID 通过 logger.contextualize 绑定到 loguru 的 extra.request_id，日志可与追踪对应
+- 按 TRACE_SAMPLE_RATE 采样、以及超过 TRACE_SLOW_MS 的请求保存到有界的内存缓冲，
+  管理员通过 /api/monitor/traces 查看
+"""
+
+import random
+import re
+import time
+import uuid
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from loguru import logger
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.backend.config.settings import settings
+
+REQUEST_ID_HEADER = b"x-request-id"
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+# 单个追踪保存的阶段明细上限（批量导入等请求可能执行大量查询），超出后只累计汇总
+MAX_SPANS = 200
+# 不保存到缓冲区的路径（健康检查轮询、静态资源），仍然输出 Server-Timing
+UNSAMPLED_PREFIXES = ("/health", "/assets")
+
+_current_trace: ContextVar["Trace | None"] = ContextVar("current_trace", default=None)
+
+
+class Trace:
+    """一个请求的追踪：阶段明细与按名称汇总的耗时"""
+
+    __slots__ = ("duration", "id", "method", "path", "spans", "started", "started_at", "status", "totals")
+
+    def __init__(self, request_id: str, method: str, path: str):
+        self.id = request_id
+        self.method = method
+        self.path = path
+        self.status: int | None = None
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.duration: float | None = None
+        self.spans: list[tuple[str, float, float]] = []
+        self.totals: dict[str, list[float]] = {}
+
+    def add(self, name: str, started: float, ended: float) -> None:
+        """记录一个阶段（perf_counter 时间）"""
+        total = self.totals.get(name)
+        if total is None:
+            self.totals[name] = [1, ended - started]
+        else:
+            total[0] += 1
+            total[1] += ended - started
+        if len(self.spans) < MAX_SPANS:
+            self.spans.append((name, started - self.started, ended - started))
+
+    def server_timing(self) -> str:
+        """Server-Timing 头的值（到当前为止）"""
+        parts = [
+            f'{name};dur={seconds * 1000:.1f};desc="x{count:.0f}"' if count > 1 else f"{name};dur={seconds * 1000:.1f}"
+            for name, (count, seconds) in self.totals.items()
+        ]
+        parts.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(parts)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "started_at": self.started_at,
+            "duration_ms": round((self.duration or 0) * 1000, 3),
+            "totals": {
+                name: {"count": int(count), "duration_ms": round(seconds * 1000, 3)}
+                for name, (count, seconds) in self.totals.items()
+            },
+            "spans": [
+                {"name": name, "start_ms": round(start * 1000, 3), "duration_ms": round(duration * 1000, 3)}
+                for name, start, duration in self.spans
+            ],
+        }
+
+
+def current_trace() -> Trace | None:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """计时当前请求的一个阶段（不在请求中时不做任何事）"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, started, time.perf_counter())
+
+
+class TraceBuffer:
+    """采样追踪的有界缓冲（最新的在后）"""
+
+    def __init__(self, capacity: int = settings.TRACE_BUFFER_SIZE):
+        self._traces: deque[Trace] = deque(maxlen=capacity)
+        self.recorded = 0
+
+    def should_keep(self, trace: Trace) -> bool:
+        if trace.path.startswith(UNSAMPLED_PREFIXES):
+            return False
+        if (trace.duration or 0) * 1000 >= settings.TRACE_SLOW_MS:
+            return True
+        return random.random() < settings.TRACE_SAMPLE_RATE
+
+    def add(self, trace: Trace) -> None:
+        self._traces.append(trace)
+        self.recorded += 1
+
+    def snapshot(self, limit: int = 50, min_ms: float = 0) -> list[dict[str, Any]]:
+        """最近的追踪（新的在前），可按最小耗时过滤"""
+        traces = [trace for trace in reversed(self._traces) if (trace.duration or 0) * 1000 >= min_ms]
+        return [trace.snapshot() for trace in traces[:limit]]
+
+
+class TracingMiddleware:
+    """为每个 HTTP 请求创建追踪，输出 Server-Timing 与 X-Request-ID，并绑定日志上下文"""
+
+    def __init__(self, app: ASGIApp, buffer: TraceBuffer, server_timing: bool = True):
+        self.app = app
+        self.buffer = buffer
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for key, value in scope["headers"]:
+            if key == REQUEST_ID_HEADER:
+                request_id = value.decode("latin-1")
+                break
+        if request_id is None or not _VALID_REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+
+        trace = Trace(request_id, scope["method"], scope["path"])
+        streaming = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal streaming
+            if message["type"] == "http.response.start":
+                trace.status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                if self.server_timing:
+                    headers.append("Server-Timing", trace.server_timing())
+                streaming = headers.get("content-type", "").startswith("text/event-stream")
+            await send(message)
+
+        token = _current_trace.set(trace)
+        try:
+            with logger.contextualize(request_id=request_id):
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_trace.reset(token)
+            trace.duration = time.perf_counter() - trace.started
+            # SSE 等长连接的耗时没有参考意义，不保存
+            if not streaming and self.buffer.should_keep(trace):
+                self.buffer.add(trace)
+
+
+# 全局单例
+trace_buffer = TraceBuffer()
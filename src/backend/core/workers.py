@@ -0,0 +1,290 @@
+"""
+Worker 进程状态
+
+多进程模式（src/backend/server.py，WORKERS > 1）下，每个 worker 定期把自身状态
+（已处理请求数、连接数、内存、CPU 时间等）写入 WORKER_STATE_DIR/<pid>.json，
+仪表盘读取全部文件汇总；单进程模式直接返回当前进程的状态。
+
+worker 之间通过文件锁选出一个主 worker，定时快照等全局只应运行一份的后台任务只在
+主 worker 中启动；主 worker 退出后锁被释放，其他 worker 在下一次上报时接管。
+
+导入、备份等长任务的进度通过 SharedJobStore 写入 WORKER_STATE_DIR/jobs，
+查询进度或订阅事件的请求落在其他 worker 上时读取该快照。
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from collections.abc import AsyncIterator, Callable
+from pathlib import Path
+from typing import IO, Any
+
+from src.backend.config.settings import settings
+from src.backend.core.logger import logger
+from src.backend.core.metrics import metrics
+from src.backend.core.scheduler import scheduler
+
+# 由 server.py 为 worker 进程设置，表示一次性的启动工作已由主进程完成
+WORKER_ENV = "NEKRO_SERVER_WORKER"
+PRIMARY_LOCK_FILE = "primary.lock"
+# 超过该倍数的上报间隔未更新的状态文件视为已退出的 worker
+STALE_INTERVALS = 3
+WORKER_REPORT_JOB = "worker_report"
+JOBS_DIR = "jobs"
+# 跨 worker 跟随任务进度时读取快照文件的间隔（秒）
+JOB_POLL_INTERVAL = 0.5
+_VALID_JOB_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+PROCESS_METRICS_JOB = "process_metrics"
+
+_memory_gauge = metrics.gauge("process_resident_memory_bytes", "进程常驻内存")
+_cpu_gauge = metrics.gauge("process_cpu_seconds", "进程累计 CPU 时间（用户 + 系统）")
+_threads_gauge = metrics.gauge("process_threads", "进程线程数")
+_fds_gauge = metrics.gauge("process_open_fds", "进程打开的文件句柄数（Windows 为句柄数）")
+
+
+def _try_lock(handle: IO[bytes]) -> bool:
+    """非阻塞地获取文件锁（进程退出时由系统释放）"""
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+class WorkerState:
+    """当前进程的 worker 状态、上报与主 worker 选举"""
+
+    def __init__(self):
+        self.server: Any = None  # uvicorn.Server，由 server.py 设置
+        self.max_requests: int | None = None
+        self.started_at = time.time()
+        self.primary = False
+        self._lock_handle: IO[bytes] | None = None
+        self._on_primary: Callable[[], None] | None = None
+
+    @property
+    def supervised(self) -> bool:
+        """是否为主进程监管的 worker（多进程模式）"""
+        return os.environ.get(WORKER_ENV) == "1"
+
+    @property
+    def directory(self) -> Path:
+        return Path(settings.WORKER_STATE_DIR)
+
+    def attach(self, server: Any, max_requests: int | None) -> None:
+        """记录本进程运行的 uvicorn.Server（用于读取请求数与连接数）"""
+        self.server = server
+        self.max_requests = max_requests
+
+    def snapshot(self) -> dict[str, Any]:
+        """当前进程的状态"""
+        # psutil 只在上报与仪表盘中使用，用到时再导入
+        import psutil
+
+        process = psutil.Process()
+        cpu = process.cpu_times()
+        state = getattr(self.server, "server_state", None)
+        return {
+            "pid": os.getpid(),
+            "primary": self.primary,
+            "started_at": self.started_at,
+            "updated_at": time.time(),
+            "requests": state.total_requests if state is not None else None,
+            "connections": len(state.connections) if state is not None else None,
+            "max_requests": self.max_requests,
+            "memory_rss": process.memory_info().rss,
+            "cpu_seconds": round(cpu.user + cpu.system, 3),
+        }
+
+    def start(self, on_primary: Callable[[], None]) -> None:
+        """
+        启动状态上报并参与主 worker 选举
+
+        Args:
+            on_primary: 成为主 worker 时调用（启动全局唯一的后台任务）
+        """
+        self._on_primary = on_primary
+        if not self.supervised:
+            # 单进程模式：当前进程就是唯一的 worker
+            self._become_primary()
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._report_tick()
+        scheduler.add_interval(
+            WORKER_REPORT_JOB,
+            self._report_tick,
+            settings.WORKER_STATS_INTERVAL,
+            description="worker 状态上报与主 worker 选举",
+        )
+
+    def _become_primary(self) -> None:
+        self.primary = True
+        if self._on_primary is not None:
+            self._on_primary()
+
+    def _elect(self) -> None:
+        """尝试获取主 worker 锁"""
+        if self.primary:
+            return
+        handle = (self.directory / PRIMARY_LOCK_FILE).open("a+b")
+        if not _try_lock(handle):
+            handle.close()
+            return
+        self._lock_handle = handle
+        logger.info(f"👑 worker {os.getpid()} 成为主 worker")
+        self._become_primary()
+
+    def _report(self) -> None:
+        """原子地写入本进程的状态文件"""
+        path = self.directory / f"{os.getpid()}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.snapshot()), encoding="utf-8")
+        tmp.replace(path)
+
+    def _report_tick(self) -> None:
+        self._elect()
+        self._report()
+
+    async def stop(self) -> None:
+        """停止上报，删除状态文件并释放主 worker 锁（应用关闭时调用）"""
+        await scheduler.remove(WORKER_REPORT_JOB)
+        if self.supervised:
+            with contextlib.suppress(OSError):
+                (self.directory / f"{os.getpid()}.json").unlink()
+        if self._lock_handle is not None:
+            self._lock_handle.close()
+            self._lock_handle = None
+        self.primary = False
+
+    def collect(self) -> list[dict[str, Any]]:
+        """所有 worker 的状态（按 pid 排序），顺带清理已退出 worker 遗留的文件"""
+        current = self.snapshot()
+        if not self.supervised:
+            return [current]
+
+        stale_before = time.time() - settings.WORKER_STATS_INTERVAL * STALE_INTERVALS
+        workers = {current["pid"]: current}
+        for path in self.directory.glob("*.json"):
+            try:
+                state = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if state["updated_at"] < stale_before:
+                with contextlib.suppress(OSError):
+                    path.unlink()
+                continue
+            workers.setdefault(state["pid"], state)
+        return [workers[pid] for pid in sorted(workers)]
+
+    def clear(self) -> None:
+        """删除所有状态文件与任务快照（主进程启动 worker 前调用）"""
+        for path in self.directory.glob("*.json"):
+            with contextlib.suppress(OSError):
+                path.unlink()
+        shutil.rmtree(self.directory / JOBS_DIR, ignore_errors=True)
+
+
+class SharedJobStore:
+    """
+    跨 worker 共享的任务快照
+
+    多进程模式下请求由内核分配到任意 worker，查询任务或订阅进度的请求可能落在没有执行该任务的
+    worker 上。执行任务的 worker 每次推送进度时把快照写入 WORKER_STATE_DIR/jobs/<kind>/<job_id>.json，
+    其他 worker 读取或轮询该文件。单进程模式下不读写文件。
+    """
+
+    def __init__(self, kind: str):
+        self.kind = kind
+
+    @property
+    def enabled(self) -> bool:
+        return worker_state.supervised
+
+    def _path(self, job_id: str) -> Path | None:
+        # job_id 来自 URL，只接受安全字符，防止路径穿越
+        if not _VALID_JOB_ID.match(job_id):
+            return None
+        return worker_state.directory / JOBS_DIR / self.kind / f"{job_id}.json"
+
+    def write(self, job_id: str, snapshot: dict[str, Any]) -> None:
+        """原子地写入任务快照"""
+        path = self._path(job_id) if self.enabled else None
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(snapshot, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+
+    def read(self, job_id: str) -> dict[str, Any] | None:
+        """读取任务快照，不存在时返回 None"""
+        path = self._path(job_id) if self.enabled else None
+        if path is None:
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    async def follow(
+        self,
+        job_id: str,
+        finished: Callable[[dict[str, Any]], bool],
+        idle_timeout: float,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """轮询任务快照，变化时产出；任务结束或超过 idle_timeout 秒没有变化时停止"""
+        last: dict[str, Any] | None = None
+        idle_since = time.monotonic()
+        while True:
+            snapshot = self.read(job_id)
+            if snapshot is not None and snapshot != last:
+                last = snapshot
+                idle_since = time.monotonic()
+                yield snapshot
+                if finished(snapshot):
+                    return
+            elif time.monotonic() - idle_since > idle_timeout:
+                return
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+
+
+def sample_process_metrics() -> None:
+    """采样当前进程的资源占用到 process_* 指标（调度器定时调用）"""
+    import psutil
+
+    process = psutil.Process()
+    with process.oneshot():
+        cpu = process.cpu_times()
+        _memory_gauge.set(process.memory_info().rss)
+        _cpu_gauge.set(round(cpu.user + cpu.system, 3))
+        _threads_gauge.set(process.num_threads())
+        _fds_gauge.set(process.num_handles() if sys.platform == "win32" else process.num_fds())
+
+
+def start_process_metrics() -> None:
+    """注册进程资源指标采样（PROCESS_METRICS_INTERVAL > 0 时）"""
+    if settings.PROCESS_METRICS_INTERVAL > 0:
+        scheduler.add_interval(
+            PROCESS_METRICS_JOB,
+            sample_process_metrics,
+            settings.PROCESS_METRICS_INTERVAL,
+            thread=True,
+            run_immediately=True,
+            description="进程资源指标采样",
+        )
+
+
+# 全局单例
+worker_state = WorkerState()
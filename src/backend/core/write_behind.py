@@ -0,0 +1,223 @@
+"""
+异步写回（write-behind）缓冲
+
+高频遥测数据（登录记录、最后活跃时间、调用统计等）如果在每个请求里单独
+INSERT / UPDATE，会成倍放大写负载（SQLite 下每次提交都要串行经过写连接）。
+WriteBehindBuffer 在内存中累积：
+- 新建的模型实例：flush 时按块 bulk_create
+- 按主键的字段更新：同一行的多次更新合并为一次，flush 时按块 bulk_update
+
+达到批量大小或时间间隔时在一个事务内写入；待写入数量超过上限时，
+写入方会等待当前 flush 完成（背压），避免内存无限增长。
+应用关闭时由 lifespan 调用 write_behind.stop() 刷出剩余数据。
+写入成功后会使该模型的查询缓存失效（bulk 操作不触发模型信号）。
+"""
+
+import asyncio
+import contextlib
+import time
+from typing import Any
+
+from tortoise.models import Model
+from tortoise.transactions import in_transaction
+
+from src.backend.config.settings import settings
+from src.backend.core.logger import logger
+from src.backend.core.metrics import metrics
+from src.backend.core.query_cache import query_caches
+
+_pending_gauge = metrics.gauge("write_behind_pending", "写回缓冲中待写入的行数")
+_flushed_counter = metrics.counter("write_behind_flushed_total", "写回缓冲已写入的行数")
+_failed_counter = metrics.counter("write_behind_failed_total", "写回缓冲写入失败丢弃的行数")
+_backpressure_counter = metrics.counter(
+    "write_behind_backpressure_total",
+    "写入方因缓冲已满而等待 flush 的次数",
+)
+_flush_histogram = metrics.histogram("write_behind_flush_seconds", "单次 flush 耗时")
+
+
+class WriteBehindBuffer:
+    """
+    单个模型的写回缓冲
+
+    Args:
+        name: 缓冲名称（用于指标与日志）
+        model: 写入的模型
+        batch_size: 待写入数量达到该值时触发 flush
+        flush_interval: 最长 flush 间隔（秒）
+        max_pending: 待写入数量上限，超过后写入方等待 flush（背压）
+        chunk_size: 单条 bulk 语句包含的行数
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model: type[Model],
+        *,
+        batch_size: int | None = None,
+        flush_interval: float | None = None,
+        max_pending: int | None = None,
+        chunk_size: int = 100,
+    ):
+        self.name = name
+        self.model = model
+        self.batch_size = batch_size or settings.WRITE_BEHIND_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.WRITE_BEHIND_FLUSH_INTERVAL
+        self.max_pending = max_pending or settings.WRITE_BEHIND_MAX_PENDING
+        self.chunk_size = chunk_size
+
+        self._creates: list[Model] = []
+        self._updates: dict[Any, dict[str, Any]] = {}
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._creates) + len(self._updates)
+
+    def _publish_pending(self) -> None:
+        _pending_gauge.set(self.pending, buffer=self.name)
+
+    async def _after_enqueue(self) -> None:
+        self._publish_pending()
+        if self.pending >= self.max_pending:
+            # 背压：缓冲已满时由写入方直接等待一次 flush
+            _backpressure_counter.inc(buffer=self.name)
+            await self.flush()
+        elif self.pending >= self.batch_size:
+            self._wakeup.set()
+
+    async def add(self, instance: Model) -> None:
+        """排队一条待新建的记录"""
+        self._creates.append(instance)
+        await self._after_enqueue()
+
+    async def update(self, pk: Any, **fields: Any) -> None:
+        """排队一次按主键的字段更新，同一行的多次更新会合并（后写覆盖）"""
+        self._updates.setdefault(pk, {}).update(fields)
+        await self._after_enqueue()
+
+    async def flush(self) -> int:
+        """
+        立即写入当前缓冲的全部数据
+
+        Returns:
+            int: 写入的行数
+        """
+        async with self._flush_lock:
+            creates, self._creates = self._creates, []
+            updates, self._updates = self._updates, {}
+            self._publish_pending()
+            if not creates and not updates:
+                return 0
+
+            started = time.perf_counter()
+            total = len(creates) + len(updates)
+            try:
+                async with in_transaction(self.model._meta.default_connection):  # noqa: SLF001
+                    if creates:
+                        await self.model.bulk_create(creates, batch_size=self.chunk_size)
+                    for field_names, objects in self._group_updates(updates).items():
+                        await self.model.bulk_update(
+                            objects,
+                            fields=list(field_names),
+                            batch_size=self.chunk_size,
+                        )
+            except Exception as e:
+                # 遥测数据允许丢失，记录后丢弃，避免失败数据反复重试拖垮写连接
+                _failed_counter.inc(total, buffer=self.name)
+                logger.error(f"❌ 写回缓冲 [{self.name}] 写入失败，丢弃 {total} 行: {e}")
+                return 0
+
+            # bulk 写入不会触发模型信号，需要手动使查询缓存失效
+            query_caches.invalidate(self.model, updates)
+            if creates:
+                _flushed_counter.inc(len(creates), buffer=self.name, op="create")
+            if updates:
+                _flushed_counter.inc(len(updates), buffer=self.name, op="update")
+            _flush_histogram.observe(time.perf_counter() - started, buffer=self.name)
+            return total
+
+    def _group_updates(
+        self,
+        updates: dict[Any, dict[str, Any]],
+    ) -> dict[tuple[str, ...], list[Model]]:
+        """按更新的字段集合分组，每组一次 bulk_update"""
+        groups: dict[tuple[str, ...], list[Model]] = {}
+        pk_attr = self.model._meta.pk_attr  # noqa: SLF001
+        for pk, fields in updates.items():
+            key = tuple(sorted(fields))
+            # 仅用于携带主键与待更新字段，不会被保存
+            instance = self.model(**{pk_attr: pk, **fields})
+            groups.setdefault(key, []).append(instance)
+        return groups
+
+    async def _run(self) -> None:
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"❌ 写回缓冲 [{self.name}] flush 异常: {e}")
+
+    def start(self) -> None:
+        """启动后台定时 flush"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止后台任务并刷出剩余数据"""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "model": self.model.__name__,
+            "pending": self.pending,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+            "max_pending": self.max_pending,
+        }
+
+
+class WriteBehindRegistry:
+    """写回缓冲注册表，由 lifespan 统一启动与关闭"""
+
+    def __init__(self):
+        self._buffers: dict[str, WriteBehindBuffer] = {}
+        self._started = False
+
+    def register(self, buffer: WriteBehindBuffer) -> WriteBehindBuffer:
+        self._buffers[buffer.name] = buffer
+        if self._started:
+            buffer.start()
+        return buffer
+
+    def start(self) -> None:
+        self._started = True
+        for buffer in self._buffers.values():
+            buffer.start()
+
+    async def flush(self) -> None:
+        for buffer in self._buffers.values():
+            await buffer.flush()
+
+    async def stop(self) -> None:
+        """关闭所有缓冲并刷出剩余数据（应用关闭时调用）"""
+        self._started = False
+        for buffer in self._buffers.values():
+            await buffer.stop()
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        return [buffer.snapshot() for buffer in self._buffers.values()]
+
+
+write_behind: WriteBehindRegistry = WriteBehindRegistry()
@@ -1,7 +1,14 @@
+import time
+
+# 解释器启动完成、开始执行启动器的时间（冷启动统计）
+LAUNCHER_STARTED = time.time()
+
+import itertools
+import multiprocessing
 import os
 import sys
 import threading
-import time
+import urllib.request
 import webbrowser
 from pathlib import Path
 
@@ -35,25 +42,32 @@ if getattr(sys, "frozen", False):
         # print("Warning: 'static' directory not found via get_resource_path")
         pass
 
-import uvicorn
 from loguru import logger
 
+from src.backend import server
 from src.backend.config.settings import settings
-from src.backend.main import app
+from src.backend.core.startup import startup_timer
+
+# 等待服务就绪 / 首个响应 / 浏览器上报首次绘制的上限（秒）
+READY_TIMEOUT = 60.0
+FIRST_RESPONSE_TIMEOUT = 30.0
+FIRST_PAINT_TIMEOUT = 30.0
+# 多进程模式下轮询 /health/ready 的间隔（秒）
+READY_POLL_INTERVAL = 0.05
 
 
 def run_diagnostics():
-    """运行启动前诊断并美化输出"""
+    """运行诊断并美化输出（在浏览器拿到首个响应之后执行，不占用冷启动时间）"""
     base_dir = get_base_dir()
     logger.info(f"🔍 Running startup diagnostics in {base_dir}")
 
     try:
-        # 检查根目录
+        # 检查根目录（只列出前几项，不遍历整个目录）
         if base_dir.exists():
-            items = sorted([p.name for p in base_dir.iterdir()])
+            items = [p.name for p in itertools.islice(base_dir.iterdir(), 6)]
             logger.debug(
                 (
-                    f"📁 Root contents ({len(items)}): {', '.join(items[:5])}..."
+                    f"📁 Root contents: {', '.join(items[:5])}..."
                     if len(items) > 5
                     else f"📁 Root contents: {items}"
                 ),
@@ -62,10 +76,7 @@ def run_diagnostics():
         # 检查 migrations
         migrations_path = get_resource_path("migrations")
         if migrations_path:
-            mig_items = sorted([p.name for p in migrations_path.iterdir()])
-            logger.success(
-                f"✅ 'migrations' folder found at {migrations_path} ({len(mig_items)} files).",
-            )
+            logger.success(f"✅ 'migrations' folder found at {migrations_path}")
         else:
             logger.error("❌ 'migrations' folder NOT found via get_resource_path")
 
@@ -80,14 +91,110 @@ def run_diagnostics():
         logger.error(f"⚠️ Diagnostics failed: {e}")
 
 
-def main():
-    """桌面端启动入口"""
+def process_launch_times() -> tuple[float, float | None]:
+    """
+    返回 (本进程的创建时间, PyInstaller onefile 引导程序的创建时间)
+
+    onefile 模式下引导程序先把打包内容解压到临时目录（sys._MEIPASS），再启动运行 Python 的
+    子进程，两者创建时间之差即为解包耗时；onedir 模式与源码运行时第二项为 None。
+    """
+    try:
+        import psutil
+
+        process = psutil.Process()
+        created = process.create_time()
+        meipass = getattr(sys, "_MEIPASS", None)
+        if meipass and Path(meipass).resolve() != Path(sys.executable).resolve().parent:
+            parent = process.parent()
+            if parent is not None:
+                return created, parent.create_time()
+    except Exception:
+        return LAUNCHER_STARTED, None
+    else:
+        return created, None
+
+
+def fix_sqlite_path() -> None:
+    """打包环境中把相对的 SQLite 路径转为基于 exe 所在目录的绝对路径"""
+    db_url = settings.DATABASE_URL
+    if not db_url.startswith("sqlite://"):
+        return
+    p_db_path = Path(db_url.replace("sqlite://", ""))
+    if p_db_path.is_absolute():
+        return
+    # 转换为基于 exe 所在目录的绝对路径
+    abs_db_path = (get_base_dir() / p_db_path).resolve()
+    # 确保父目录存在
+    abs_db_path.parent.mkdir(parents=True, exist_ok=True)
+    # 更新设置
+    settings.DATABASE_URL = f"sqlite://{abs_db_path}"
+    # 多进程模式下 worker 重新加载配置，通过环境变量传递
+    os.environ["DATABASE_URL"] = settings.DATABASE_URL
+    logger.info(f"🔧 Fixed Database URL for Windows: {settings.DATABASE_URL}")
+
+
+def poll_ready(url: str, timeout: float) -> bool:
+    """轮询 /health/ready 直到返回 200（多进程模式下 worker 在其他进程中启动）"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/health/ready", timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except OSError:
+            pass
+        time.sleep(READY_POLL_INTERVAL)
+    return False
+
+
+def log_cold_start() -> None:
+    """输出冷启动各阶段耗时（相邻里程碑之差）"""
+    breakdown = startup_timer.launch_breakdown()
+    total = sum(seconds for _, seconds in breakdown)
+    details = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in breakdown)
+    database = next((seconds for name, seconds in startup_timer.phases if name == "数据库"), None)
+    extra = []
+    if database is not None:
+        extra.append(f"其中数据库/迁移 {database * 1000:.0f}ms")
+    if startup_timer.first_paint_ms is not None:
+        extra.append(f"页面 FCP {startup_timer.first_paint_ms:.0f}ms")
+    suffix = f"；{'，'.join(extra)}" if extra else ""
+    logger.info(f"⏱️ 冷启动 {total * 1000:.0f}ms（{details}{suffix}）")
+
+
+def open_browser_when_ready(url: str, in_process: bool) -> None:
+    """
+    服务就绪后立即打开浏览器，之后执行诊断并统计冷启动
+
+    单进程模式等待 lifespan 启动完成的信号；多进程模式轮询 /health/ready。
+    """
+    if in_process:
+        ready = startup_timer.wait_ready(READY_TIMEOUT)
+    else:
+        ready = poll_ready(url, READY_TIMEOUT)
+    if not ready:
+        logger.warning(f"⚠️ 服务在 {READY_TIMEOUT:g}s 内未就绪，仍然打开浏览器")
 
-    # 在生产模式下，运行诊断
+    startup_timer.milestone("打开浏览器")
+    # ?launch 让页面上报首次绘制耗时（前端路由使用 hash，查询参数不影响页面）
+    webbrowser.open(f"{url}/?launch" if in_process else url)
+
+    if in_process:
+        startup_timer.wait_first_response(FIRST_RESPONSE_TIMEOUT)
     if getattr(sys, "frozen", False):
         run_diagnostics()
+    if in_process and startup_timer.wait_first_paint(FIRST_PAINT_TIMEOUT):
+        log_cold_start()
+
+
+def main():
+    """桌面端启动入口"""
+    created, bootloader = process_launch_times()
+    startup_timer.track_launch(bootloader or created)
+    if bootloader is not None:
+        startup_timer.milestone("解包", created)
+    startup_timer.milestone("解释器启动", LAUNCHER_STARTED)
 
-    # 启动浏览器
     host = settings.HOST
     port = settings.PORT
 
@@ -97,36 +204,26 @@ def main():
 
     logger.info(f"🚀 Starting Desktop App at {url}")
 
-    # 延迟打开浏览器，确保服务已启动
-    def open_browser():
-        time.sleep(2)  # 等待 2 秒
-        webbrowser.open(url)
+    # 修正 SQLite 路径 (Windows 打包环境)
+    if getattr(sys, "frozen", False) and "sqlite" in settings.DATABASE_URL:
+        fix_sqlite_path()
+
+    # WORKERS > 1 时以多进程模式运行（见 src/backend/server.py），应用在 worker 进程中导入
+    in_process = server.worker_count() == 1
+    if in_process:
+        # 在这里导入应用以计入冷启动统计，uvicorn 随后直接复用已导入的模块
+        import src.backend.main  # noqa: F401
+
+        startup_timer.milestone("导入")
 
-    threading.Thread(target=open_browser, daemon=True).start()
+    threading.Thread(target=open_browser_when_ready, args=(url, in_process), daemon=True).start()
 
     # 启动服务
     # 注意：在 PyInstaller 打包应用中，reload 必须为 False
-
-    # 修正 SQLite 路径 (Windows 打包环境)
-    if getattr(sys, "frozen", False) and "sqlite" in settings.DATABASE_URL:
-        db_url = settings.DATABASE_URL
-        if db_url.startswith("sqlite://"):
-            db_path = db_url.replace("sqlite://", "")
-            p_db_path = Path(db_path)
-            if not p_db_path.is_absolute():
-                # 转换为基于 exe 所在目录的绝对路径
-                base_dir = get_base_dir()
-                abs_db_path = (base_dir / p_db_path).resolve()
-                # 确保父目录存在
-                abs_db_path.parent.mkdir(parents=True, exist_ok=True)
-                # 更新设置
-                settings.DATABASE_URL = f"sqlite://{abs_db_path}"
-                logger.info(
-                    f"🔧 Fixed Database URL for Windows: {settings.DATABASE_URL}",
-                )
-
-    uvicorn.run(app, host=host, port=port, reload=False)
+    server.run(host=host, port=port)
 
 
 if __name__ == "__main__":
+    # PyInstaller 打包后使用进程池（批量密码哈希）需要此调用
+    multiprocessing.freeze_support()
     main()
@@ -4,29 +4,57 @@ FastAPI应用入口
 
 import asyncio
 import os
-import signal
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
-from starlette.responses import FileResponse
 
 from src.backend.config.database import close_db, init_db
 from src.backend.config.settings import settings
+from src.backend.core.compression import CompressionMiddleware
 from src.backend.core.exceptions import (
     APIError,
     global_exception_handler,
     validation_exception_handler,
 )
-from src.backend.core.logger import logger
-from src.backend.core.sse import log_stream_manager
+from src.backend.core.features import feature_registry
+from src.backend.core.hashing import shutdown_hash_pool
+from src.backend.core.health import health_monitor
+from src.backend.core.logger import logger, setup_file_logging
+from src.backend.core.openapi import generate_openapi_json, openapi_cache
+from src.backend.core.query_cache import query_caches
+from src.backend.core.scheduler import scheduler
+from src.backend.core.serialization import FastJSONResponse
+from src.backend.core.shutdown import DrainMiddleware, shutdown_coordinator
+from src.backend.core.sqlite_backup import backups
+from src.backend.core.sse import log_stream_manager, reconnect_all
+from src.backend.core.startup import FirstResponseMiddleware, startup_timer
+from src.backend.core.static_cache import CachedStaticFiles, static_cache
+from src.backend.core.tracing import TracingMiddleware, trace_buffer
+from src.backend.core.workers import start_process_metrics, worker_state
+from src.backend.core.write_behind import write_behind
 from src.backend.router import api_router
 
 
+async def create_default_admin() -> None:
+    """创建默认管理员用户（仅在首次启动时）"""
+    from src.backend.core.security import get_password_hash
+    from src.features.user.backend.models import User
+
+    admin_user = await User.filter(username="admin").first()
+    if not admin_user:
+        await User.create(
+            username="admin",
+            hashed_password=get_password_hash("admin"),
+            email="admin@example.com",
+            nickname="Administrator",
+            role="admin",
+        )
+        logger.info("✅ 创建默认管理员账号: admin/admin")
+
+
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     """应用生命周期管理"""
@@ -34,70 +62,91 @@ async def lifespan(_app: FastAPI):
     loop = asyncio.get_running_loop()
     log_stream_manager.set_loop(loop)
 
-    # Hack: 注册信号处理器以在 Uvicorn 重载/退出时强制关闭 SSE 连接
-    # Uvicorn 在 reload 时会发送 SIGINT 或 SIGTERM 信号。
-    # 默认情况下 Uvicorn 会等待所有连接关闭，而 SSE 是长连接，导致 reload 卡死。
-    # 我们需要拦截信号，主动断开 SSE 连接。
-    original_sigint = signal.getsignal(signal.SIGINT)
-    original_sigterm = signal.getsignal(signal.SIGTERM)
-
-    def force_shutdown_sse(signum, frame):
-        # 在信号处理器中，我们不能直接 await，但可以调度任务到 loop
-        # 使用 call_soon_threadsafe 确保线程安全
-        if loop.is_running():
-            loop.call_soon_threadsafe(
-                lambda: asyncio.create_task(log_stream_manager.shutdown()),
-            )
-
-        # 调用原始处理器（如果有）以确保 Uvicorn 也能收到信号
-        if signum == signal.SIGINT and callable(original_sigint):
-            original_sigint(signum, frame)
-        elif signum == signal.SIGTERM and callable(original_sigterm):
-            original_sigterm(signum, frame)
-
-    # 使用 signal.signal 替换处理器，这样可以确保覆盖 Uvicorn 可能的设置
-    # (注意：如果 Uvicorn 使用 loop.add_signal_handler，这可能需要在 loop 层面处理，但 signal.signal 是底层的)
-    try:
-        signal.signal(signal.SIGINT, force_shutdown_sse)
-        signal.signal(signal.SIGTERM, force_shutdown_sse)
-    except ValueError:
-        # 如果不是在主线程运行，signal.signal 会抛出 ValueError
-        pass
+    # 关闭协调器：uvicorn 开始退出时（见 server.py）通知 SSE 客户端重连并排空进行中的请求
+    shutdown_coordinator.attach(loop)
+    shutdown_coordinator.on_drain("SSE 重连通知", reconnect_all)
 
     logger.info(f"🚀 启动 {settings.APP_NAME}...")
+    startup_timer.begin()
+
+    with startup_timer.phase("文件日志"):
+        setup_file_logging()
 
-    # 生成 OpenAPI 规范（开发模式）
-    if settings.ENVIRONMENT == "development":
-        from src.backend.core.openapi import generate_openapi_json
+    # 多进程模式下，迁移、默认管理员、OpenAPI 生成已由主进程执行一次（见 server.py）
+    run_once = not worker_state.supervised
 
-        generate_openapi_json(_app)
+    # 开发模式：路由或模型变化时重新生成 openapi.json（供前端生成类型）
+    # 生产环境在第一次请求 /openapi.json 时载入（需要先导入延迟挂载的功能模块）
+    if settings.ENVIRONMENT == "development" and run_once:
+        with startup_timer.phase("OpenAPI"):
+            generate_openapi_json(_app)
 
     # 初始化数据库
-    await init_db()
+    with startup_timer.phase("数据库"):
+        await init_db(migrate=run_once)
+    shutdown_coordinator.register("数据库", close_db)
     logger.info("✅ 数据库连接成功")
 
-    # 创建默认管理员用户（仅在首次启动时）
-    from src.backend.core.security import get_password_hash
-    from src.features.user.backend.models import User
+    # 校准 bcrypt cost（CPU 密集，放到线程中执行；多进程模式下主进程校准后通过 BCRYPT_ROUNDS 传入）
+    from src.backend.core.security import calibrate_bcrypt_rounds
+
+    with startup_timer.phase("bcrypt 校准"):
+        await asyncio.to_thread(calibrate_bcrypt_rounds)
+    shutdown_coordinator.register("密码哈希进程池", shutdown_hash_pool)
+
+    if run_once:
+        with startup_timer.phase("默认管理员"):
+            await create_default_admin()
+
+    from src.features.user.backend.service import refresh_password_cost_metrics
+
+    # 统计已存储密码哈希的 cost 分布
+    with startup_timer.phase("密码 cost 统计"):
+        await refresh_password_cost_metrics()
+
+    with startup_timer.phase("后台任务"):
+        # 周期任务调度器：WAL checkpoint、worker 状态上报、定时快照、依赖探测等由各模块注册
+        scheduler.start()
+        shutdown_coordinator.register("调度器", scheduler.stop)
+        if settings.QUERY_CACHE_TTL > 0:
+            scheduler.add_interval(
+                "query_cache_purge",
+                query_caches.purge_expired,
+                settings.QUERY_CACHE_TTL,
+                description="清理过期的查询缓存条目",
+            )
+        start_process_metrics()
 
-    admin_user = await User.filter(username="admin").first()
-    if not admin_user:
-        await User.create(
-            username="admin",
-            hashed_password=get_password_hash("admin"),
-            email="admin@example.com",
-            nickname="Administrator",
-            role="admin",
-        )
-        logger.info("✅ 创建默认管理员账号: admin/admin")
+        # 启动写回缓冲的后台 flush（关闭时刷出剩余数据）
+        write_behind.start()
+        shutdown_coordinator.register("写回缓冲", write_behind.stop)
+
+        # 状态上报与主 worker 选举；定时数据库快照（BACKUP_INTERVAL > 0 时）只在主 worker 中运行
+        worker_state.start(on_primary=backups.start_schedule)
+        shutdown_coordinator.register("worker 状态", worker_state.stop)
+        shutdown_coordinator.register("数据库快照", backups.stop)
+
+    # 建立前端静态资源清单并预压缩（CPU 密集，放到线程中执行）
+    with startup_timer.phase("静态资源清单"):
+        await static_cache.reload()
+        if settings.ENVIRONMENT == "development":
+            static_cache.start_watch()
+            shutdown_coordinator.register("静态资源监听", static_cache.stop_watch)
+
+    # 依赖探测：第一轮同步完成，之后在后台定时执行，/health/ready 只读取缓存结果
+    with startup_timer.phase("健康检查"):
+        await health_monitor.start()
+        shutdown_coordinator.register("健康检查", health_monitor.stop)
+
+    startup_timer.finish()
+    shutdown_coordinator.mark_ready()
+    logger.info(f"✅ 启动完成，用时 {startup_timer.summary()}")
 
     yield
 
-    # 清理资源
+    # 排空进行中的请求，再按注册的逆序释放资源（先停止写入方，最后关闭数据库）
     logger.info(f"👋 关闭 {settings.APP_NAME}...")
-    await log_stream_manager.shutdown()  # 关闭 SSE 连接
-    await close_db()
-    logger.info("✅ 数据库连接已关闭")
+    await shutdown_coordinator.run()
 
 
 app = FastAPI(
@@ -105,11 +154,17 @@ app = FastAPI(
     description=settings.APP_DESCRIPTION,
     version=settings.VERSION,
     lifespan=lifespan,
+    # 响应统一由 orjson / pydantic_core 编码（见 core/serialization.py）
+    default_response_class=FastJSONResponse,
 )
 
 # 保存settings到app.state，供异常处理器使用
 app.state.settings = settings
 
+# 生产环境由内存中的预压缩规范响应 /openapi.json（第一次请求时载入）
+if settings.ENVIRONMENT != "development":
+    openapi_cache.install(app)
+
 # CORS配置
 app.add_middleware(
     CORSMiddleware,
@@ -119,16 +174,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 响应压缩（跳过 SSE 与已压缩的静态资源）
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        maximum_size=settings.COMPRESSION_MAX_SIZE,
+    )
+
+# 首个响应完成时通知启动计时（桌面启动器据此推迟诊断、统计冷启动）
+app.add_middleware(FirstResponseMiddleware, timer=startup_timer)
+
+# 请求追踪：Server-Timing 响应头、采样缓冲，请求 ID 绑定到日志上下文
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware, buffer=trace_buffer, server_timing=settings.TRACE_SERVER_TIMING)
+
+# 进行中请求计数（最外层），关闭时据此排空
+app.add_middleware(DrainMiddleware, coordinator=shutdown_coordinator)
+
 
 # 异常处理器
 async def api_error_handler(_request: Request, exc: Exception):
     """APIError异常处理器"""
     if isinstance(exc, APIError):
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=exc.status_code,
             content=exc.detail,
         )
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=500,
         content={"detail": "Internal Server Error"},
     )
@@ -139,16 +212,34 @@ app.add_exception_handler(APIError, api_error_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(Exception, global_exception_handler)
 
-# 注册统一路由
+# 注册统一路由，并挂载自动发现的功能模块（/api/<prefix>）
 app.include_router(api_router)
+feature_registry.mount(app, prefix=api_router.prefix)
 
 
 @app.get("/health")
 async def health_check():
-    """健康检查"""
+    """健康检查（开始关闭后返回 503，负载均衡据此停止转发新请求）"""
+    if shutdown_coordinator.draining:
+        return FastJSONResponse(
+            status_code=503,
+            content={"status": "shutting_down", "version": settings.VERSION},
+        )
     return {"status": "healthy", "version": settings.VERSION}
 
 
+@app.get("/health/live")
+async def liveness_check():
+    """存活检查：进程与事件循环正常即返回 200，不访问任何依赖"""
+    return {"status": "alive", "version": settings.VERSION}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """就绪检查：启动完成、未在关闭且后台依赖探测通过时返回 200，否则 503（只读取缓存结果）"""
+    return health_monitor.readiness()
+
+
 # 静态文件服务逻辑优化
 # 1. 获取静态文件目录
 static_path_env = os.getenv("STATIC_FILES_DIR")
@@ -169,30 +260,34 @@ logger.info(
 
 # 2. 注册静态文件路由
 if static_dir.exists():
+    # 启动时建立清单并载入内存（见 lifespan），请求直接从清单返回
+    static_cache.configure(static_dir)
+
     # A. 挂载 assets 目录 (JS/CSS/Images)
-    # Vite 构建产物通常在 assets 子目录下
+    # Vite 构建产物通常在 assets 子目录下，文件名带内容哈希，可长期缓存
     assets_dir = static_dir / "assets"
     if assets_dir.exists():
-        app.mount("/assets", StaticFiles(directory=str(assets_dir)), name="assets")
+        app.mount(
+            "/assets",
+            CachedStaticFiles(directory=assets_dir, cache=static_cache, prefix="assets"),
+            name="assets",
+        )
         logger.info(f"✅ Mounted /assets to {assets_dir}")
 
     # B. SPA 路由处理 (Catch-all)
     # 必须放在最后，拦截所有非 API 请求并返回 index.html 或静态文件
     @app.get("/{full_path:path}")
-    async def serve_spa(full_path: str):
+    async def serve_spa(full_path: str, request: Request):
         """服务 SPA 前端应用"""
-        # 1. 尝试直接访问文件 (如 robots.txt, favicon.ico)
-        file_path = static_dir / full_path
-        if file_path.exists() and file_path.is_file():
-            return FileResponse(file_path)
-
-        # 2. 默认返回 index.html (SPA 路由)
-        # 对于任何不存在的路径，都返回 index.html 让前端路由处理
-        index_path = static_dir / "index.html"
-        if index_path.exists():
-            return FileResponse(index_path)
-
-        return JSONResponse(
+        # 1. 静态文件 (如 robots.txt, favicon.ico)：只查启动时建立的清单，不访问文件系统
+        # 2. 其余路径返回 index.html，交给前端路由处理
+        response = static_cache.response(full_path, request.headers)
+        if response is None:
+            response = static_cache.response("index.html", request.headers)
+        if response is not None:
+            return response
+
+        return FastJSONResponse(
             status_code=404,
             content={
                 "error": "Frontend not found",
@@ -219,11 +314,6 @@ else:
 
 
 if __name__ == "__main__":
-    import uvicorn
+    from src.backend.server import run
 
-    uvicorn.run(
-        "src.backend.main:app",
-        host=settings.HOST,
-        port=settings.PORT,
-        reload=True,
-    )
+    run(reload=True)
@@ -1,18 +1,11 @@
 from fastapi import APIRouter
 
 from src.backend.config.settings import settings
-from src.features.dashboard.backend.router import router as dashboard_router
-from src.features.monitor.backend.router import router as monitor_router
-from src.features.user.backend.router import router as auth_router
 
 # 创建主 API 路由
+# 各功能模块的路由由注册表自动发现并挂载到 /api 下（见 src/backend/core/features.py）
 api_router = APIRouter(prefix="/api")
 
-# 挂载各功能模块路由
-api_router.include_router(auth_router, prefix="/auth", tags=["认证"])
-api_router.include_router(dashboard_router, prefix="/dashboard", tags=["仪表盘"])
-api_router.include_router(monitor_router, prefix="/monitor", tags=["系统监控"])
-
 
 @api_router.get("/info", tags=["系统信息"])
 async def api_info():
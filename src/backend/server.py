@@ -0,0 +1,178 @@
+"""
+生产服务器入口（单进程 / 多进程）
+
+WORKERS=1（默认）时在当前进程运行 uvicorn；WORKERS > 1（0 表示按可用 CPU 核数）时由主进程
+监管多个 worker 进程，共享同一个监听 socket：
+- 只需执行一次的启动工作在主进程中完成：生成 SECRET_KEY、校准 bcrypt cost、建表 / 数据库迁移、
+  创建默认管理员（开发环境还会生成 openapi.json）；SECRET_KEY 与 BCRYPT_ROUNDS 通过环境变量
+  传给 worker，worker 的 lifespan 跳过这些步骤
+- worker 崩溃或健康检查超时（WORKER_HEALTHCHECK_TIMEOUT）时自动重启
+- 处理 WORKER_MAX_REQUESTS 个请求后 worker 优雅退出并由主进程重新拉起，限制内存增长；
+  WORKER_MAX_REQUESTS_JITTER 错开各 worker 的重启时间
+- SIGHUP 重启全部 worker，SIGTTIN / SIGTTOU 增减一个 worker（uvicorn 的进程监管）
+
+退出（SIGINT / SIGTERM、达到最大请求数、--reload 重新加载）时由关闭协调器
+（src/backend/core/shutdown.py）通知 SSE 客户端重连并排空进行中的请求，
+超过 SHUTDOWN_DRAIN_TIMEOUT 后强制关闭剩余连接。
+
+用法:
+    python -m src.backend.server [--host 0.0.0.0] [--port 9871] [--reload]
+"""
+
+import argparse
+import asyncio
+import functools
+import math
+import os
+import random
+import socket
+from typing import Any
+
+import uvicorn
+from uvicorn.supervisors import ChangeReload, Multiprocess
+
+from src.backend.config.settings import settings
+from src.backend.core.logger import logger
+from src.backend.core.shutdown import shutdown_coordinator
+from src.backend.core.startup import startup_timer
+from src.backend.core.workers import WORKER_ENV, worker_state
+
+APP = "src.backend.main:app"
+
+
+class Server(uvicorn.Server):
+    """
+    退出时通知关闭协调器的 uvicorn.Server
+
+    uvicorn 在收到信号或达到 limit_max_requests 时置位 should_exit，随后停止接收新连接、
+    等待进行中的请求完成；在置位的同时开始排空，SSE 长连接才能及时结束，而不必覆盖
+    uvicorn 的信号处理器。
+
+    lifespan 启动完成并开始监听后通知 startup_timer（桌面启动器据此打开浏览器）。
+    """
+
+    async def startup(self, sockets: list[socket.socket] | None = None) -> None:
+        await super().startup(sockets=sockets)
+        if not self.should_exit:
+            startup_timer.mark_serving()
+
+    @property
+    def should_exit(self) -> bool:
+        return self._should_exit
+
+    @should_exit.setter
+    def should_exit(self, value: bool) -> None:
+        self._should_exit = value
+        if value:
+            shutdown_coordinator.request()
+
+
+def make_config(host: str, port: int, **kwargs: Any) -> uvicorn.Config:
+    """uvicorn 配置：强制关闭剩余连接前的等待时间与排空期限一致"""
+    timeout = settings.SHUTDOWN_DRAIN_TIMEOUT
+    return uvicorn.Config(
+        APP,
+        host=host,
+        port=port,
+        timeout_graceful_shutdown=math.ceil(timeout) if timeout > 0 else None,
+        **kwargs,
+    )
+
+
+def worker_count() -> int:
+    """WORKERS 为 0 时使用当前进程可用的 CPU 核数（容器中受 CPU 亲和性限制）"""
+    if settings.WORKERS > 0:
+        return settings.WORKERS
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def serve_worker(config: uvicorn.Config, sockets: list[socket.socket] | None = None) -> None:
+    """worker 进程入口：设置本进程的最大请求数（带随机抖动）后运行 uvicorn"""
+    if settings.WORKER_MAX_REQUESTS > 0:
+        config.limit_max_requests = settings.WORKER_MAX_REQUESTS + random.randint(
+            0,
+            max(settings.WORKER_MAX_REQUESTS_JITTER, 0),
+        )
+    server = Server(config)
+    worker_state.attach(server, config.limit_max_requests)
+    server.run(sockets=sockets)
+
+
+async def prepare() -> None:
+    """只需执行一次的启动工作（多进程模式下在主进程中执行）"""
+    from src.backend.config.database import close_db, init_db
+    from src.backend.core.openapi import generate_openapi_json
+    from src.backend.main import app, create_default_admin
+
+    if settings.ENVIRONMENT == "development":
+        generate_openapi_json(app)
+    await init_db()
+    try:
+        await create_default_admin()
+    finally:
+        await close_db()
+
+
+def run_multiprocess(host: str, port: int, workers: int) -> None:
+    from src.backend.core.security import calibrate_bcrypt_rounds
+
+    # settings 导入时已完成 SECRET_KEY 检查（必要时生成并写入 .env.local）
+    rounds = calibrate_bcrypt_rounds()
+    asyncio.run(prepare())
+
+    # worker 由 spawn 启动，继承主进程的环境变量；环境变量的优先级高于 .env 文件
+    os.environ["SECRET_KEY"] = settings.SECRET_KEY
+    os.environ["BCRYPT_ROUNDS"] = str(rounds)
+    os.environ[WORKER_ENV] = "1"
+
+    worker_state.directory.mkdir(parents=True, exist_ok=True)
+    worker_state.clear()
+
+    config = make_config(
+        host,
+        port,
+        workers=workers,
+        timeout_worker_healthcheck=settings.WORKER_HEALTHCHECK_TIMEOUT,
+    )
+    sock = config.bind_socket()
+    logger.info(
+        f"🧵 启动 {workers} 个 worker 进程 (max_requests={settings.WORKER_MAX_REQUESTS or '不限'}"
+        f", jitter={settings.WORKER_MAX_REQUESTS_JITTER})",
+    )
+    Multiprocess(config, target=functools.partial(serve_worker, config), sockets=[sock]).run()
+
+
+def run_reload(host: str, port: int) -> None:
+    """开发模式：代码变化时重启子进程（单进程，忽略 WORKERS）"""
+    config = make_config(host, port, reload=True)
+    sock = config.bind_socket()
+    ChangeReload(config, target=Server(config).run, sockets=[sock]).run()
+
+
+def run(host: str | None = None, port: int | None = None, *, reload: bool = False) -> None:
+    """按 WORKERS 以单进程或多进程模式运行服务器"""
+    host = host or settings.HOST
+    port = port or settings.PORT
+    if reload:
+        run_reload(host, port)
+        return
+    workers = worker_count()
+    if workers > 1:
+        run_multiprocess(host, port, workers)
+        return
+
+    # 单进程：进程退出即服务停止，不应用 WORKER_MAX_REQUESTS
+    server = Server(make_config(host, port))
+    worker_state.attach(server, None)
+    server.run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="启动后端服务器")
+    parser.add_argument("--host", help="监听地址（默认 HOST）")
+    parser.add_argument("--port", type=int, help="监听端口（默认 PORT）")
+    parser.add_argument("--reload", action="store_true", help="代码变化时自动重启（开发模式）")
+    args = parser.parse_args()
+    run(args.host, args.port, reload=args.reload)
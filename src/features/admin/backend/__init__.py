@@ -0,0 +1,6 @@
+"""管理功能模块"""
+
+PREFIX = "/admin"
+TAGS = ["管理"]
+# 备份、批量操作等低频接口，生产环境首次请求时再导入
+LAZY = True
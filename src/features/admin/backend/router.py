@@ -0,0 +1,152 @@
+"""
+管理模块 API 路由
+提供通用的流式表导出、数据库在线备份、静态资源清单等管理接口
+"""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from src.backend.core.dependencies import CurrentAdminId
+from src.backend.core.exceptions import BusinessError, ResourceNotFoundError
+from src.backend.core.export import (
+    ExportFormat,
+    export_response,
+    export_tables,
+    stream_export,
+)
+from src.backend.core.file_delivery import RangeFileResponse
+from src.backend.core.logger import logger
+from src.backend.core.sqlite_backup import backups, stream_file
+from src.backend.core.sse import event_source_response
+from src.backend.core.static_cache import static_cache
+
+from .schemas import (
+    BackupJobInfo,
+    BackupListResponse,
+    ExportTableInfo,
+    StaticManifestInfo,
+)
+
+router = APIRouter()
+
+
+@router.get("/exports", response_model=list[ExportTableInfo])
+async def list_export_tables(_admin_id: CurrentAdminId):
+    """列出可导出的表（由各 feature 注册）"""
+    return export_tables.snapshot()
+
+
+@router.get("/exports/{name}")
+async def export_table(
+    name: str,
+    admin_id: CurrentAdminId,
+    fmt: Annotated[ExportFormat, Query(alias="format")] = "ndjson",
+    gzip: bool = False,
+):
+    """
+    流式导出整张表（管理员）
+
+    按主键 keyset 分块读取并编码，内存占用与表的行数无关；
+    gzip=true 时在线压缩为 .gz 下载
+    """
+    table = export_tables.get(name)
+    if table is None:
+        raise ResourceNotFoundError("导出表")
+
+    logger.info(f"📤 管理员 {admin_id} 导出表 {name} ({fmt}{', gzip' if gzip else ''})")
+    return export_response(
+        stream_export(table.model, table.fields, fmt, compress=gzip),
+        name,
+        fmt,
+        compress=gzip,
+    )
+
+
+@router.get("/backups", response_model=BackupListResponse)
+async def list_backups(_admin_id: CurrentAdminId):
+    """列出已有快照与最近的备份任务"""
+    return BackupListResponse(
+        supported=backups.supported,
+        directory=str(backups.directory),
+        snapshots=backups.snapshots(),
+        jobs=backups.jobs(),
+    )
+
+
+@router.post("/backups", response_model=BackupJobInfo, status_code=202)
+async def create_backup(admin_id: CurrentAdminId):
+    """
+    启动一次数据库在线备份（仅 SQLite）
+
+    备份在后台逐步复制，不阻塞读写；已有备份在运行时返回该任务。
+    进度可订阅 GET /backups/jobs/{job_id}/events
+    """
+    if not backups.supported:
+        raise BusinessError("BACKUP_UNSUPPORTED", "仅支持 SQLite 文件数据库的在线备份")
+    job = backups.start()
+    logger.info(f"💾 管理员 {admin_id} 触发数据库快照 [{job.job_id}]")
+    return job.snapshot()
+
+
+@router.get("/backups/jobs/{job_id}", response_model=BackupJobInfo)
+async def get_backup_job(job_id: str, _admin_id: CurrentAdminId):
+    """查询备份任务进度"""
+    snapshot = backups.find(job_id)
+    if snapshot is None:
+        raise ResourceNotFoundError("备份任务")
+    return snapshot
+
+
+@router.get("/backups/jobs/{job_id}/events")
+async def backup_job_events(job_id: str, _admin_id: CurrentAdminId):
+    """订阅备份进度 (SSE)，任务结束后自动关闭"""
+    if backups.find(job_id) is None:
+        raise ResourceNotFoundError("备份任务")
+    return event_source_response(backups.follow(job_id))
+
+
+@router.get("/backups/files/{name}")
+async def download_backup(
+    name: str,
+    _admin_id: CurrentAdminId,
+    gzip: bool = False,
+):
+    """
+    下载快照
+
+    gzip=true 时在线压缩为 .gz 下载（已压缩的快照原样返回）；
+    原样下载支持 Range 断点续传
+    """
+    path = backups.find_snapshot(name)
+    if path is None:
+        raise ResourceNotFoundError("快照")
+
+    compress = gzip and not path.name.endswith(".gz")
+    filename = f"{path.name}.gz" if compress else path.name
+    if filename.endswith(".gz"):
+        media_type = "application/gzip"
+    else:
+        media_type = "application/vnd.sqlite3"
+    if not compress:
+        return RangeFileResponse(path, media_type=media_type, filename=filename)
+    return StreamingResponse(
+        stream_file(path, compress=compress),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/static", response_model=StaticManifestInfo)
+async def get_static_manifest(_admin_id: CurrentAdminId):
+    """查看前端静态资源清单"""
+    return static_cache.snapshot()
+
+
+@router.post("/static/reload", response_model=StaticManifestInfo)
+async def reload_static_manifest(admin_id: CurrentAdminId):
+    """重建前端静态资源清单（替换构建产物后调用，无需重启）"""
+    await static_cache.reload()
+    logger.info(f"🗜️ 管理员 {admin_id} 重建了静态资源清单")
+    return static_cache.snapshot()
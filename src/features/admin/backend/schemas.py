@@ -0,0 +1,60 @@
+"""
+管理模块数据模型
+"""
+
+from pydantic import BaseModel, Field
+
+
+class ExportTableInfo(BaseModel):
+    """可导出的表"""
+
+    name: str = Field(..., description="表名（导出接口中使用）")
+    model: str = Field(..., description="模型名")
+    fields: list[str] = Field(..., description="导出的字段")
+
+
+class BackupJobInfo(BaseModel):
+    """备份任务状态"""
+
+    job_id: str
+    reason: str = Field(..., description="manual | scheduled")
+    status: str = Field(..., description="pending | running | completed | failed")
+    pages_done: int
+    pages_total: int
+    progress: float = Field(..., description="0-1")
+    file: str | None = Field(None, description="生成的快照文件名")
+    size: int | None = Field(None, description="快照大小（字节）")
+    error: str | None = None
+    elapsed_seconds: float
+
+
+class BackupFileInfo(BaseModel):
+    """已生成的快照"""
+
+    name: str
+    size: int
+    created_at: str
+
+
+class BackupListResponse(BaseModel):
+    """快照与最近的备份任务"""
+
+    supported: bool = Field(..., description="当前数据库是否支持在线备份（仅 SQLite）")
+    directory: str
+    snapshots: list[BackupFileInfo]
+    jobs: list[BackupJobInfo]
+
+
+class StaticManifestInfo(BaseModel):
+    """前端静态资源清单"""
+
+    root: str | None = Field(None, description="静态资源目录，未找到构建产物时为空")
+    files: int
+    memory_files: int = Field(..., description="载入内存的文件数")
+    disk_files: int = Field(..., description="超出上限、从磁盘读取的文件数")
+    bytes: int = Field(..., description="载入内存的原始字节数")
+    compressed_bytes: int = Field(..., description="预压缩版本的字节数")
+    brotli: bool
+    watching: bool = Field(..., description="是否监听文件变化自动重建")
+    load_seconds: float
+    loaded_at: str | None
@@ -1,2 +1,4 @@
 """仪表盘功能模块"""
 
+PREFIX = "/dashboard"
+TAGS = ["仪表盘"]
@@ -7,13 +7,22 @@ import platform
 from datetime import datetime
 from pathlib import Path
 
-import psutil
 from fastapi import APIRouter, Request
 from tortoise import Tortoise
 
+from src.backend.core.db_pool import db_stats
 from src.backend.core.dependencies import CurrentUserId
-
-from .schemas import AppOverviewResponse, SystemInfoResponse, SystemResource
+from src.backend.core.workers import worker_state
+
+from .schemas import (
+    AppOverviewResponse,
+    ConnectionPoolStats,
+    DatabasePoolResponse,
+    SystemInfoResponse,
+    SystemResource,
+    WorkersResponse,
+    WorkerStats,
+)
 
 router = APIRouter()
 
@@ -79,6 +88,9 @@ async def get_system_info(_user_id: CurrentUserId):
     """
     获取系统状态信息 (真实数据)
     """
+    # psutil 只有该接口使用，首次请求时再导入
+    import psutil
+
     # CPU
     cpu_percent = psutil.cpu_percent(interval=None)
     cpu_count = psutil.cpu_count(logical=True)
@@ -131,3 +143,45 @@ async def get_system_info(_user_id: CurrentUserId):
         version="v1.0.0",
         os=f"{platform.system()} {platform.release()}",
     )
+
+
+@router.get("/database", response_model=DatabasePoolResponse)
+async def get_database_pool(_user_id: CurrentUserId):
+    """
+    获取数据库连接池使用情况（使用中 / 空闲 / 排队 / 获取等待时间）
+    """
+    conn = Tortoise.get_connection("default")
+    return DatabasePoolResponse(
+        engine=conn.capabilities.dialect,
+        connections=[
+            ConnectionPoolStats.model_validate(stats) for stats in db_stats.snapshot()
+        ],
+    )
+
+
+@router.get("/workers", response_model=WorkersResponse)
+async def get_workers(_user_id: CurrentUserId):
+    """
+    获取服务进程状态（多进程模式下汇总各 worker 上报的请求数、内存与 CPU 时间）
+    """
+    now = datetime.now().timestamp()
+    workers = [
+        WorkerStats(
+            pid=state["pid"],
+            primary=state["primary"],
+            started_at=datetime.fromtimestamp(state["started_at"]),
+            uptime_seconds=now - state["started_at"],
+            requests=state["requests"],
+            connections=state["connections"],
+            max_requests=state["max_requests"],
+            memory_rss=state["memory_rss"],
+            cpu_seconds=state["cpu_seconds"],
+        )
+        for state in worker_state.collect()
+    ]
+    return WorkersResponse(
+        mode="multi" if worker_state.supervised else "single",
+        workers=workers,
+        total_requests=sum(worker.requests or 0 for worker in workers),
+        total_memory_rss=sum(worker.memory_rss for worker in workers),
+    )
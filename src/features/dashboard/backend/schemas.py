@@ -3,6 +3,8 @@
 定义请求和响应的数据结构
 """
 
+from datetime import datetime
+
 from pydantic import BaseModel
 
 
@@ -34,3 +36,47 @@ class SystemInfoResponse(BaseModel):
     uptime_seconds: float  # 新增：秒数，方便前端格式化
     version: str
     os: str
+
+
+class ConnectionPoolStats(BaseModel):
+    """单个数据库连接（池）的使用情况"""
+
+    name: str
+    role: str  # "writer" | "reader" | "pool"
+    size: int
+    in_use: int
+    idle: int
+    waiting: int
+    acquired_total: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+class DatabasePoolResponse(BaseModel):
+    """数据库连接池状态响应"""
+
+    engine: str
+    connections: list[ConnectionPoolStats]
+
+
+class WorkerStats(BaseModel):
+    """单个 worker 进程的状态"""
+
+    pid: int
+    primary: bool  # 是否运行定时快照等全局唯一的后台任务
+    started_at: datetime
+    uptime_seconds: float
+    requests: int | None  # 已处理请求数（未通过 server.py 启动时为 None）
+    connections: int | None
+    max_requests: int | None  # 达到后 worker 重启，None 表示不限制
+    memory_rss: int  # 字节
+    cpu_seconds: float
+
+
+class WorkersResponse(BaseModel):
+    """服务进程状态响应（多进程模式下汇总所有 worker）"""
+
+    mode: str  # "single" | "multi"
+    workers: list[WorkerStats]
+    total_requests: int
+    total_memory_rss: int
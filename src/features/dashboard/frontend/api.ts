@@ -27,6 +27,42 @@ export interface SystemInfo {
   os: string
 }
 
+export interface ConnectionPoolStats {
+  name: string
+  role: string
+  size: number
+  in_use: number
+  idle: number
+  waiting: number
+  acquired_total: number
+  avg_wait_ms: number
+  max_wait_ms: number
+}
+
+export interface DatabasePool {
+  engine: string
+  connections: ConnectionPoolStats[]
+}
+
+export interface WorkerStats {
+  pid: number
+  primary: boolean
+  started_at: string
+  uptime_seconds: number
+  requests: number | null
+  connections: number | null
+  max_requests: number | null
+  memory_rss: number
+  cpu_seconds: number
+}
+
+export interface Workers {
+  mode: string
+  workers: WorkerStats[]
+  total_requests: number
+  total_memory_rss: number
+}
+
 /**
  * 仪表盘 API
  */
@@ -46,4 +82,20 @@ export const dashboardAPI = {
     const response = await httpClient.get<SystemInfo>('/dashboard/system')
     return response.data
   },
+
+  /**
+   * 获取数据库连接池使用情况
+   */
+  async getDatabasePool() {
+    const response = await httpClient.get<DatabasePool>('/dashboard/database')
+    return response.data
+  },
+
+  /**
+   * 获取服务进程状态（多进程模式下汇总所有 worker）
+   */
+  async getWorkers() {
+    const response = await httpClient.get<Workers>('/dashboard/workers')
+    return response.data
+  },
 }
@@ -34,7 +34,13 @@ import {
 import { motion } from 'framer-motion'
 
 import { useUserStore } from '@/frontend/shared/stores/user'
-import { dashboardAPI, type AppOverview, type SystemInfo } from '@/features/dashboard/frontend'
+import {
+  dashboardAPI,
+  type AppOverview,
+  type DatabasePool,
+  type SystemInfo,
+  type Workers,
+} from '@/features/dashboard/frontend'
 import { containerVariants, itemVariants, scaleVariants } from '@/frontend/core/animation'
 import { systemColors } from '@/frontend/core/theme/macOS'
 
@@ -261,8 +267,150 @@ const InfoRow = ({
   </Box>
 )
 
+const roleLabels: Record<string, string> = {
+  writer: '写',
+  reader: '只读',
+  pool: '连接池',
+}
+
+const DatabasePoolCard = ({ pool, loading }: { pool: DatabasePool | null; loading: boolean }) => {
+  const theme = useTheme()
+
+  return (
+    <GlassCard sx={{ p: 3 }}>
+      <Box
+        sx={{ display: 'flex', alignItems: 'center', justifyContent: 'space-between', mb: 2 }}
+      >
+        <Typography variant="subtitle1" fontWeight={700}>
+          数据库连接
+        </Typography>
+        {pool && (
+          <Chip
+            label={pool.engine}
+            size="small"
+            variant="outlined"
+            sx={{ fontWeight: 600, height: 24 }}
+          />
+        )}
+      </Box>
+      {loading && !pool ? (
+        <Skeleton height={80} />
+      ) : (
+        <Stack
+          spacing={1.5}
+          divider={<Box sx={{ borderBottom: `1px dashed ${theme.palette.divider}` }} />}
+        >
+          {pool?.connections.map(conn => {
+            const percent = conn.size ? (conn.in_use / conn.size) * 100 : 0
+            return (
+              <Box key={conn.name}>
+                <Box
+                  sx={{
+                    display: 'flex',
+                    alignItems: 'center',
+                    justifyContent: 'space-between',
+                    mb: 0.5,
+                  }}
+                >
+                  <Box sx={{ display: 'flex', alignItems: 'center', gap: 1 }}>
+                    <Typography variant="body2" fontWeight={600}>
+                      {conn.name}
+                    </Typography>
+                    <Chip
+                      label={roleLabels[conn.role] || conn.role}
+                      size="small"
+                      sx={{ height: 20, fontSize: 11 }}
+                    />
+                  </Box>
+                  <Typography variant="caption" color="text.secondary">
+                    {`使用 ${conn.in_use}/${conn.size} · 空闲 ${conn.idle} · 排队 ${conn.waiting}` +
+                      ` · 平均等待 ${conn.avg_wait_ms.toFixed(2)} ms` +
+                      ` · 最大 ${conn.max_wait_ms.toFixed(2)} ms`}
+                  </Typography>
+                </Box>
+                <LinearProgress
+                  variant="determinate"
+                  value={percent}
+                  color={conn.waiting > 0 ? 'warning' : 'primary'}
+                  sx={{ height: 6, borderRadius: 3 }}
+                />
+              </Box>
+            )
+          })}
+        </Stack>
+      )}
+    </GlassCard>
+  )
+}
+
+const WorkersCard = ({ workers, loading }: { workers: Workers | null; loading: boolean }) => {
+  const theme = useTheme()
+
+  return (
+    <GlassCard sx={{ p: 3 }}>
+      <Box
+        sx={{ display: 'flex', alignItems: 'center', justifyContent: 'space-between', mb: 2 }}
+      >
+        <Typography variant="subtitle1" fontWeight={700}>
+          服务进程
+        </Typography>
+        {workers && (
+          <Typography variant="caption" color="text.secondary">
+            {`${workers.mode === 'multi' ? `${workers.workers.length} 个 worker` : '单进程'}` +
+              ` · 请求 ${workers.total_requests}` +
+              ` · 内存 ${formatBytes(workers.total_memory_rss)}`}
+          </Typography>
+        )}
+      </Box>
+      {loading && !workers ? (
+        <Skeleton height={80} />
+      ) : (
+        <Stack
+          spacing={1.5}
+          divider={<Box sx={{ borderBottom: `1px dashed ${theme.palette.divider}` }} />}
+        >
+          {workers?.workers.map(worker => (
+            <Box
+              key={worker.pid}
+              sx={{ display: 'flex', alignItems: 'center', justifyContent: 'space-between' }}
+            >
+              <Box sx={{ display: 'flex', alignItems: 'center', gap: 1 }}>
+                <Typography variant="body2" fontWeight={600}>
+                  PID {worker.pid}
+                </Typography>
+                {worker.primary && (
+                  <Chip label="主" size="small" sx={{ height: 20, fontSize: 11 }} />
+                )}
+              </Box>
+              <Typography variant="caption" color="text.secondary">
+                {`请求 ${worker.requests ?? '-'}` +
+                  (worker.max_requests ? `/${worker.max_requests}` : '') +
+                  ` · 连接 ${worker.connections ?? '-'}` +
+                  ` · 内存 ${formatBytes(worker.memory_rss)}` +
+                  ` · CPU ${worker.cpu_seconds.toFixed(1)} s` +
+                  ` · 运行 ${formatUptime(worker.uptime_seconds)}`}
+              </Typography>
+            </Box>
+          ))}
+        </Stack>
+      )}
+    </GlassCard>
+  )
+}
+
 // --- Helpers ---
 
+function formatBytes(bytes: number): string {
+  const units = ['B', 'KB', 'MB', 'GB']
+  let value = bytes
+  let unit = 0
+  while (value >= 1024 && unit < units.length - 1) {
+    value /= 1024
+    unit += 1
+  }
+  return `${value.toFixed(1)} ${units[unit]}`
+}
+
 function formatUptime(seconds: number): string {
   const days = Math.floor(seconds / (3600 * 24))
   const hours = Math.floor((seconds % (3600 * 24)) / 3600)
@@ -279,6 +427,8 @@ export default function Dashboard() {
   const [currentTime, setCurrentTime] = useState(new Date())
   const [overview, setOverview] = useState<AppOverview | null>(null)
   const [systemInfo, setSystemInfo] = useState<SystemInfo | null>(null)
+  const [databasePool, setDatabasePool] = useState<DatabasePool | null>(null)
+  const [workers, setWorkers] = useState<Workers | null>(null)
   const [loading, setLoading] = useState(true)
   const [autoRefresh, setAutoRefresh] = useState(true)
 
@@ -292,12 +442,16 @@ export default function Dashboard() {
     })
 
     try {
-      const [overviewData, systemData] = await Promise.all([
+      const [overviewData, systemData, poolData, workersData] = await Promise.all([
         dashboardAPI.getOverview(),
         dashboardAPI.getSystemInfo(),
+        dashboardAPI.getDatabasePool(),
+        dashboardAPI.getWorkers(),
       ])
       setOverview(overviewData)
       setSystemInfo(systemData)
+      setDatabasePool(poolData)
+      setWorkers(workersData)
     } catch (error) {
       console.error('加载数据失败:', error)
     } finally {
@@ -556,6 +710,12 @@ export default function Dashboard() {
           </Stack>
         </Grid2>
       </Grid2>
+
+      {/* Database Pool (Bottom Row) */}
+      <DatabasePoolCard pool={databasePool} loading={loading} />
+
+      {/* Server Workers */}
+      <WorkersCard workers={workers} loading={loading} />
     </Stack>
   )
 }
@@ -0,0 +1,6 @@
+"""系统监控功能模块"""
+
+PREFIX = "/monitor"
+TAGS = ["系统监控"]
+# 只在查看日志 / 指标时使用，生产环境首次请求时再导入
+LAZY = True
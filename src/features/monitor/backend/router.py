@@ -1,13 +1,17 @@
 """
 监控模块 API 路由
-提供实时日志流等
+提供实时日志流、运行时指标、查询缓存统计、启动耗时、后台任务、请求追踪等
 """
 
-from fastapi import APIRouter, Request
-from sse_starlette.sse import EventSourceResponse
+from fastapi import APIRouter, Body, Query, Request, Response
 
-from src.backend.core.dependencies import CurrentUserId
-from src.backend.core.sse import log_stream_manager
+from src.backend.core.dependencies import CurrentAdminId, CurrentUserId
+from src.backend.core.metrics import metrics
+from src.backend.core.query_cache import query_caches
+from src.backend.core.scheduler import scheduler
+from src.backend.core.sse import event_source_response, log_stream_manager
+from src.backend.core.startup import startup_timer
+from src.backend.core.tracing import trace_buffer
 
 router = APIRouter()
 
@@ -18,4 +22,63 @@ async def live_logs(request: Request, _user: CurrentUserId):
     获取实时日志流 (SSE)
     需要鉴权
     """
-    return EventSourceResponse(log_stream_manager.stream())
+    return event_source_response(log_stream_manager.stream())
+
+
+@router.get("/metrics")
+async def get_metrics(_user: CurrentUserId):
+    """
+    获取进程内运行时指标
+    需要鉴权
+    """
+    return metrics.snapshot()
+
+
+@router.get("/caches")
+async def get_query_caches(_user: CurrentUserId):
+    """
+    获取查询缓存统计（命中率、条目数、估算内存等）
+    需要鉴权
+    """
+    return query_caches.snapshot()
+
+
+@router.get("/jobs")
+async def get_jobs(_user: CurrentUserId):
+    """
+    获取后台周期任务的调度与运行统计（下次运行时间、耗时分位数、失败 / 超时 / 跳过次数）
+    需要鉴权
+    """
+    return scheduler.snapshot()
+
+
+@router.get("/startup")
+async def get_startup_timings(_user: CurrentUserId):
+    """
+    获取本次启动各阶段的耗时
+    需要鉴权
+    """
+    return startup_timer.snapshot()
+
+
+@router.post("/startup/paint", status_code=204)
+async def report_first_paint(paint_ms: float = Body(..., embed=True, ge=0)):
+    """
+    浏览器上报首次绘制耗时（桌面启动器打开的页面，见 src/main.tsx）
+    无需鉴权：只在启动器开启冷启动统计时接受第一次上报
+    """
+    startup_timer.mark_first_paint(paint_ms)
+    return Response(status_code=204)
+
+
+@router.get("/traces")
+async def get_traces(
+    _admin_id: CurrentAdminId,
+    limit: int = Query(50, ge=1, le=500),
+    min_ms: float = Query(0, ge=0, description="只返回耗时不低于该值的请求"),
+):
+    """
+    获取最近采样的请求追踪（新的在前，含各阶段耗时）
+    需要管理员权限
+    """
+    return trace_buffer.snapshot(limit, min_ms)
@@ -1,2 +1,4 @@
 """认证功能模块"""
 
+PREFIX = "/auth"
+TAGS = ["认证"]
@@ -0,0 +1,350 @@
+"""
+用户批量导入 / 导出
+
+- 导入：流式读取 NDJSON / CSV 请求体，按批次去重、并行哈希、分块 bulk_create
+- 导出：注册到通用流式导出（按主键 keyset 分块读取并编码）
+- 进度：每个导入任务对应一个 SSE 频道；多进程模式下进度快照通过 SharedJobStore 共享，
+  订阅与查询可以落在任意 worker 上
+"""
+
+import codecs
+import csv
+import json
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from typing import Any
+
+from pydantic import ValidationError
+from tortoise.expressions import Q
+from tortoise.transactions import in_transaction
+
+from src.backend.core.export import export_tables
+from src.backend.core.logger import logger
+from src.backend.core.query_cache import query_caches
+from src.backend.core.security import get_password_hashes
+from src.backend.core.serialization import dumps_str
+from src.backend.core.sse import SSEEvent, SSEManager, sse_event
+from src.backend.core.workers import SharedJobStore
+
+from .models import User
+from .schemas import BulkImportResult, BulkImportRow
+from .service import record_new_password_hash
+
+# 每批处理的行数（去重查询、哈希、插入都按批进行）
+IMPORT_BATCH_SIZE = 500
+# 单条 INSERT 语句包含的最大行数
+INSERT_CHUNK_SIZE = 100
+# 每个任务最多保留的错误条数
+MAX_ERRORS = 100
+# 最多保留的任务数
+MAX_JOBS = 32
+# 预先订阅创建、但一直未开始导入的任务的保留时间（秒）
+PENDING_JOB_TTL = 300
+# 单行最大字符数，超出的行记为失败并丢弃
+MAX_LINE_LENGTH = 64 * 1024
+
+EXPORT_FIELDS = (
+    "id",
+    "username",
+    "email",
+    "nickname",
+    "role",
+    "is_active",
+    "created_at",
+)
+export_tables.register("users", User, EXPORT_FIELDS)
+import_job_store = SharedJobStore("import")
+FINISHED_STATUSES = ("completed", "failed")
+
+
+class ImportJob:
+    """批量导入任务状态"""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.status = "pending"
+        self.processed = 0
+        self.created = 0
+        self.skipped = 0
+        self.failed = 0
+        self.errors: list[dict[str, Any]] = []
+        self.created_at = time.monotonic()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.sse_manager = SSEManager()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def add_error(self, line: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append({"line": line, "message": message})
+
+    def snapshot(self) -> BulkImportResult:
+        elapsed = (self.finished_at or time.monotonic()) - (
+            self.started_at or time.monotonic()
+        )
+        return BulkImportResult(
+            job_id=self.job_id,
+            status=self.status,
+            processed=self.processed,
+            created=self.created,
+            skipped=self.skipped,
+            failed=self.failed,
+            errors=self.errors,
+            elapsed_seconds=round(elapsed, 3),
+        )
+
+    async def publish(self) -> None:
+        """向订阅者推送当前进度（并写入共享快照），任务结束时关闭所有订阅"""
+        snapshot = self.snapshot().model_dump()
+        import_job_store.write(self.job_id, snapshot)
+        await self.sse_manager.broadcast(snapshot, event="progress")
+        if self.finished:
+            await self.sse_manager.shutdown()
+
+    async def stream(self) -> AsyncIterator[SSEEvent]:
+        """进度事件流：先发送当前快照，再推送后续进度"""
+        yield sse_event(self.snapshot().model_dump_json(), "progress")
+        if self.finished:
+            return
+        if import_job_store.enabled:
+            # 多进程模式：导入请求可能由其他 worker 执行，跟随共享快照
+            async for snapshot in import_job_store.follow(
+                self.job_id,
+                lambda snapshot: snapshot["status"] in FINISHED_STATUSES,
+                PENDING_JOB_TTL,
+            ):
+                yield sse_event(dumps_str(snapshot), "progress")
+            return
+        async for message in self.sse_manager.subscribe():
+            yield message
+
+
+class ImportJobRegistry:
+    """
+    导入任务注册表（有界）
+
+    超出容量时按创建顺序淘汰已结束和未开始的任务；未开始的任务超过 PENDING_JOB_TTL
+    也会被淘汰并关闭其订阅。执行中的任务不会被淘汰。
+    """
+
+    def __init__(self, capacity: int = MAX_JOBS):
+        self.capacity = capacity
+        self._jobs: OrderedDict[str, ImportJob] = OrderedDict()
+
+    def get(self, job_id: str) -> ImportJob | None:
+        return self._jobs.get(job_id)
+
+    async def get_or_create(self, job_id: str | None = None) -> ImportJob:
+        job_id = job_id or uuid.uuid4().hex
+        job = self._jobs.get(job_id)
+        if job is None:
+            await self._evict()
+            job = ImportJob(job_id)
+            self._jobs[job_id] = job
+        return job
+
+    async def _evict(self) -> None:
+        """为新任务腾出位置，并清理过期的未开始任务"""
+        expire_before = time.monotonic() - PENDING_JOB_TTL
+        for job_id, job in list(self._jobs.items()):
+            pending = job.status == "pending"
+            expired = pending and job.created_at < expire_before
+            full = len(self._jobs) >= self.capacity
+            if expired or (full and (pending or job.finished)):
+                del self._jobs[job_id]
+                if pending:
+                    await job.sse_manager.shutdown()
+
+
+import_jobs = ImportJobRegistry()
+
+
+async def _iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str | None]:
+    """
+    将字节流切分为文本行（增量 UTF-8 解码，内存只保留当前未完成的行）
+
+    超过 MAX_LINE_LENGTH 的行不再缓存，丢弃到行尾后产出 None
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    overflow = False
+    async for chunk in stream:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            if overflow or len(line) > MAX_LINE_LENGTH:
+                overflow = False
+                yield None
+            else:
+                yield line.rstrip("\r")
+        if len(pending) > MAX_LINE_LENGTH:
+            overflow = True
+            pending = ""
+    pending += decoder.decode(b"", final=True)
+    if overflow or len(pending) > MAX_LINE_LENGTH:
+        yield None
+    elif pending:
+        yield pending.rstrip("\r")
+
+
+async def _iter_records(
+    stream: AsyncIterator[bytes],
+    fmt: str,
+) -> AsyncIterator[tuple[int, dict[str, Any] | str]]:
+    """
+    逐行解析导入数据
+
+    Yields:
+        (行号, 记录字典) 或 (行号, 错误信息)
+
+    Note:
+        CSV 按行解析，不支持字段内换行
+    """
+    header: list[str] | None = None
+    line_no = 0
+    async for line in _iter_lines(stream):
+        line_no += 1
+        if line is None:
+            yield line_no, f"行过长（超过 {MAX_LINE_LENGTH} 个字符）"
+            continue
+        if not line.strip():
+            continue
+
+        if fmt == "ndjson":
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, f"JSON 解析失败: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_no, "每行必须是 JSON 对象"
+                continue
+            yield line_no, record
+            continue
+
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield line_no, f"列数不匹配: 期望 {len(header)} 列，实际 {len(values)} 列"
+            continue
+        yield line_no, {k: v for k, v in zip(header, values) if v != ""}
+
+
+async def _import_batch(
+    batch: list[tuple[int, BulkImportRow]],
+    job: ImportJob,
+) -> None:
+    """处理一批记录：批量去重 -> 并行哈希 -> 事务内分块插入"""
+    # 1. 批内去重 + 一次查询检查已存在的用户名/邮箱
+    usernames = {row.username for _, row in batch}
+    emails = {row.email or f"{row.username}@example.com" for _, row in batch}
+    existing = await User.filter(
+        Q(username__in=usernames) | Q(email__in=emails),
+    ).values_list("username", "email")
+    taken_usernames = {username for username, _ in existing}
+    taken_emails = {email for _, email in existing}
+
+    pending: list[tuple[int, BulkImportRow, str]] = []
+    for line_no, row in batch:
+        email = row.email or f"{row.username}@example.com"
+        if row.username in taken_usernames or email in taken_emails:
+            job.skipped += 1
+            continue
+        taken_usernames.add(row.username)
+        taken_emails.add(email)
+        pending.append((line_no, row, email))
+
+    if not pending:
+        return
+
+    # 2. 进程池并行哈希
+    hashes = await get_password_hashes([row.password for _, row, _ in pending])
+
+    users = [
+        User(
+            username=row.username,
+            hashed_password=hashed,
+            email=email,
+            nickname=row.nickname or row.username,
+            role=row.role,
+            is_active=row.is_active,
+        )
+        for (_, row, email), hashed in zip(pending, hashes)
+    ]
+
+    # 3. 事务内分块插入
+    try:
+        async with in_transaction(User._meta.default_connection):  # noqa: SLF001
+            await User.bulk_create(users, batch_size=INSERT_CHUNK_SIZE)
+    except Exception as e:
+        # 并发导入等情况下仍可能触发唯一约束，整批回滚并记录
+        logger.warning(f"批量导入插入失败，已回滚 {len(users)} 行: {e}")
+        for line_no, _, _ in pending:
+            job.add_error(line_no, f"插入失败: {e}")
+        return
+
+    query_caches.invalidate(User)
+    job.created += len(users)
+    for hashed in hashes:
+        record_new_password_hash(hashed)
+
+
+async def import_users(
+    stream: AsyncIterator[bytes],
+    fmt: str,
+    job: ImportJob,
+) -> ImportJob:
+    """
+    流式导入用户
+
+    Args:
+        stream: 请求体字节流
+        fmt: ndjson | csv
+        job: 导入任务（用于记录进度并推送 SSE）
+    """
+    job.status = "running"
+    job.started_at = time.monotonic()
+    await job.publish()
+
+    batch: list[tuple[int, BulkImportRow]] = []
+    try:
+        async for line_no, record in _iter_records(stream, fmt):
+            job.processed += 1
+            if isinstance(record, str):
+                job.add_error(line_no, record)
+                continue
+            try:
+                batch.append((line_no, BulkImportRow.model_validate(record)))
+            except ValidationError as e:
+                job.add_error(line_no, e.errors()[0]["msg"])
+                continue
+
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await _import_batch(batch, job)
+                batch = []
+                await job.publish()
+
+        if batch:
+            await _import_batch(batch, job)
+        job.status = "completed"
+    except Exception as e:
+        logger.exception(f"批量导入失败: {e}")
+        job.status = "failed"
+        job.add_error(job.processed, f"导入中断: {e}")
+    finally:
+        job.finished_at = time.monotonic()
+        await job.publish()
+        logger.info(
+            f"📥 批量导入结束 [{job.job_id}]: 处理 {job.processed}, 创建 {job.created}, "
+            f"跳过 {job.skipped}, 失败 {job.failed}",
+        )
+
+    return job
@@ -0,0 +1,11 @@
+"""
+用户查询缓存
+按主键读取当前用户（/auth/me 等）走进程内缓存，用户保存 / 删除时自动失效
+"""
+
+from src.backend.core.query_cache import query_caches
+
+from .models import User
+
+user_cache = query_caches.create("user")
+query_caches.watch(user_cache, User)
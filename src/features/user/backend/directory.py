@@ -0,0 +1,146 @@
+"""
+用户目录查询
+
+- 按主键 keyset 分页：游标编码上一页最后一条的 id，任意页的代价都与第一页相同
+- role / is_active 过滤命中 (role, is_active, id) / (is_active, id) 复合索引
+- 用户名 / 邮箱前缀搜索在 SQLite 上改写为范围查询，可以使用唯一索引（LIKE 'q%' 无法使用）
+- 稀疏字段：只查询并返回请求的列
+"""
+
+import base64
+import binascii
+from typing import Any
+
+from tortoise.expressions import Q
+
+from src.backend.config.settings import settings
+from src.backend.core.exceptions import ValidationError
+
+from .models import User
+
+# 可选择返回的字段（不包含密码哈希）
+DIRECTORY_FIELDS = (
+    "id",
+    "username",
+    "email",
+    "nickname",
+    "role",
+    "is_active",
+    "last_login_at",
+    "created_at",
+    "updated_at",
+)
+DEFAULT_FIELDS = ("id", "username", "email", "nickname", "role", "is_active")
+
+MAX_CODE_POINT = 0x10FFFF
+SURROGATES = range(0xD800, 0xE000)
+
+
+def encode_cursor(last_id: int) -> str:
+    """将上一页最后一条的 id 编码为不透明游标"""
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """解析游标，返回上一页最后一条的 id"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValidationError("无效的分页游标", {"cursor": cursor}) from e
+
+
+def parse_fields(fields: str | None) -> list[str]:
+    """
+    解析逗号分隔的字段列表
+
+    id 总会被包含（生成下一页游标需要）
+    """
+    if not fields:
+        return list(DEFAULT_FIELDS)
+
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in DIRECTORY_FIELDS]
+    if unknown:
+        raise ValidationError(
+            f"不支持的字段: {', '.join(unknown)}",
+            {"allowed": list(DIRECTORY_FIELDS)},
+        )
+    return ["id", *dict.fromkeys(name for name in requested if name != "id")]
+
+
+def prefix_upper_bound(prefix: str) -> str | None:
+    """
+    按码位顺序大于所有以 prefix 开头的字符串的最小字符串
+
+    末尾字符加一（跳过代理区）；末尾已是最大码位时去掉它再处理前一个字符，
+    全部都是最大码位时没有上界，返回 None
+    """
+    chars = list(prefix)
+    while chars:
+        code = ord(chars.pop()) + 1
+        if code in SURROGATES:
+            code = SURROGATES.stop
+        if code <= MAX_CODE_POINT:
+            return "".join(chars) + chr(code)
+    return None
+
+
+def prefix_filter(field: str, prefix: str) -> Q:
+    """
+    前缀匹配（区分大小写）
+
+    SQLite 默认的 BINARY 排序规则按码位比较，改写为 [prefix, 上界) 范围查询以使用索引；
+    PostgreSQL 在非 C 排序规则下范围与前缀并不等价，使用 LIKE 'q%'（通配符由 Tortoise 转义）
+    """
+    if not settings.DATABASE_URL.startswith("sqlite://"):
+        return Q(**{f"{field}__startswith": prefix})
+    upper = prefix_upper_bound(prefix)
+    if upper is None:
+        return Q(**{f"{field}__gte": prefix})
+    return Q(**{f"{field}__gte": prefix, f"{field}__lt": upper})
+
+
+async def list_users(
+    *,
+    limit: int,
+    cursor: str | None = None,
+    role: str | None = None,
+    is_active: bool | None = None,
+    q: str | None = None,
+    fields: list[str] | None = None,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """
+    查询一页用户
+
+    Args:
+        limit: 每页条数
+        cursor: 上一页返回的游标，None 表示第一页
+        role: 按角色过滤
+        is_active: 按激活状态过滤
+        q: 用户名或邮箱前缀
+        fields: 返回的字段
+
+    Returns:
+        (当前页数据, 下一页游标)，没有下一页时游标为 None
+    """
+    query = User.all()
+    if cursor:
+        query = query.filter(id__gt=decode_cursor(cursor))
+    if role is not None:
+        query = query.filter(role=role)
+    if is_active is not None:
+        query = query.filter(is_active=is_active)
+    if q:
+        query = query.filter(prefix_filter("username", q) | prefix_filter("email", q))
+
+    # 多取一条判断是否还有下一页
+    rows = (
+        await query.order_by("id")
+        .limit(limit + 1)
+        .values(*(fields or DEFAULT_FIELDS))
+    )
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1]["id"])
@@ -17,13 +17,39 @@ class User(Model):
     nickname = fields.CharField(max_length=50, null=True, description="昵称")
     role = fields.CharField(max_length=20, default="user", description="角色")
     is_active = fields.BooleanField(default=True, description="是否激活")
+    last_login_at = fields.DatetimeField(null=True, description="最后登录时间")
     created_at = fields.DatetimeField(auto_now_add=True, description="创建时间")
     updated_at = fields.DatetimeField(auto_now=True, description="更新时间")
 
     class Meta:
         table = "users"
         table_description = "用户表"
+        # 用户目录按 role / is_active 过滤并按 id 做 keyset 分页
+        indexes = (
+            ("role", "is_active", "id"),
+            ("is_active", "id"),
+        )
 
     def __str__(self):
         return f"User(id={self.id}, username={self.username})"
 
+
+
+class LoginAudit(Model):
+    """登录审计记录（通过写回缓冲批量写入）"""
+
+    id = fields.BigIntField(pk=True, description="记录ID")
+    user_id = fields.IntField(null=True, description="用户ID（登录失败且用户不存在时为空）")
+    username = fields.CharField(max_length=50, description="登录使用的用户名")
+    success = fields.BooleanField(description="是否登录成功")
+    ip = fields.CharField(max_length=45, null=True, description="客户端IP")
+    user_agent = fields.CharField(max_length=255, null=True, description="客户端UA")
+    created_at = fields.DatetimeField(auto_now_add=True, description="登录时间")
+
+    class Meta:
+        table = "login_audits"
+        table_description = "登录审计表"
+        indexes = (("user_id", "created_at"),)
+
+    def __str__(self):
+        return f"LoginAudit(user={self.username}, success={self.success})"
@@ -3,28 +3,50 @@
 提供登录、登出、获取用户信息等接口
 """
 
-from fastapi import APIRouter
+import asyncio
+from typing import Annotated, Literal
 
-from src.backend.core.dependencies import CurrentUserId
-from src.backend.core.exceptions import AuthenticationError, ResourceAlreadyExistsError
+from fastapi import APIRouter, Query, Request
+
+from src.backend.core.dependencies import CurrentAdminId, CurrentUserId
+from src.backend.core.exceptions import (
+    AuthenticationError,
+    ResourceAlreadyExistsError,
+    ResourceNotFoundError,
+)
+from src.backend.core.export import ExportFormat, export_response, stream_export
 from src.backend.core.logger import logger
 from src.backend.core.security import (
     create_access_token,
     get_password_hash,
     verify_password,
 )
+from src.backend.core.sse import event_source_response
 
+from .bulk import EXPORT_FIELDS, import_job_store, import_jobs, import_users
+from .cache import user_cache
+from .directory import list_users, parse_fields
 from .models import User
-from .schemas import LoginRequest, LoginResponse, UserResponse
+from .schemas import (
+    BulkImportResult,
+    LoginRequest,
+    LoginResponse,
+    UserDirectoryPage,
+    UserResponse,
+)
+from .service import record_new_password_hash, rehash_password_if_needed
+from .telemetry import record_login
 
 router = APIRouter()
 
 
 @router.post("/login", response_model=LoginResponse)
-async def login(data: LoginRequest):
+async def login(data: LoginRequest, request: Request):
     """
     用户登录
 
+    登录审计与最后登录时间通过写回缓冲异步批量写入
+
     Args:
         data: 登录请求数据（用户名、密码）
 
@@ -39,13 +61,20 @@ async def login(data: LoginRequest):
 
     if not user:
         logger.warning(f"登录失败：用户不存在 - {data.username}")
+        await record_login(request, data.username, None, success=False)
         raise AuthenticationError("用户名或密码错误")
 
-    # 验证密码
-    if not verify_password(data.password, user.hashed_password):
+    # 验证密码（bcrypt 在线程中执行，不阻塞事件循环）
+    if not await asyncio.to_thread(verify_password, data.password, user.hashed_password):
         logger.warning(f"登录失败：密码错误 - {data.username}")
+        await record_login(request, data.username, user, success=False)
         raise AuthenticationError("用户名或密码错误")
 
+    # cost 与当前目标不一致时透明重哈希
+    await rehash_password_if_needed(user, data.password)
+
+    await record_login(request, data.username, user, success=True)
+
     # 创建token
     token = create_access_token(data={"sub": str(user.id)})
 
@@ -78,7 +107,10 @@ async def get_current_user(user_id: CurrentUserId):
     Raises:
         AuthenticationError: 用户不存在或已被禁用
     """
-    user = await User.filter(id=user_id, is_active=True).first()
+    user = await user_cache.fetch(
+        User.filter(id=user_id, is_active=True).first(),
+        row=(User, user_id),
+    )
 
     if not user:
         logger.warning(f"获取用户信息失败：用户不存在或已禁用 - ID: {user_id}")
@@ -125,7 +157,7 @@ async def register(data: LoginRequest):
         raise ResourceAlreadyExistsError("用户", "用户名已存在")
 
     # 创建用户
-    hashed_password = get_password_hash(data.password)
+    hashed_password = await asyncio.to_thread(get_password_hash, data.password)
     user = await User.create(
         username=data.username,
         hashed_password=hashed_password,
@@ -133,6 +165,7 @@ async def register(data: LoginRequest):
         nickname=data.username,
         role="user",
     )
+    record_new_password_hash(hashed_password)
 
     logger.info(f"新用户注册成功: {user.username} (ID: {user.id})")
 
@@ -143,3 +176,105 @@ async def register(data: LoginRequest):
         nickname=user.nickname or user.username,
         role=user.role,
     )
+
+
+@router.get("/users", response_model=UserDirectoryPage)
+async def list_user_directory(
+    _admin_id: CurrentAdminId,
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+    role: str | None = None,
+    is_active: bool | None = None,
+    q: Annotated[str | None, Query(max_length=100)] = None,
+    fields: str | None = None,
+):
+    """
+    用户目录（管理员）
+
+    - 游标分页：将返回的 next_cursor 作为下一次请求的 cursor，任意页耗时一致
+    - 过滤：role、is_active
+    - 搜索：q 为用户名或邮箱前缀（区分大小写）
+    - 稀疏字段：fields 为逗号分隔的字段名，如 `fields=username,email`（总会包含 id）
+    """
+    items, next_cursor = await list_users(
+        limit=limit,
+        cursor=cursor,
+        role=role,
+        is_active=is_active,
+        q=q,
+        fields=parse_fields(fields),
+    )
+    return UserDirectoryPage(items=items, next_cursor=next_cursor)
+
+
+@router.post("/users/import", response_model=BulkImportResult)
+async def bulk_import_users(
+    request: Request,
+    _admin_id: CurrentAdminId,
+    fmt: Annotated[Literal["ndjson", "csv"], Query(alias="format")] = "ndjson",
+    job_id: str | None = None,
+):
+    """
+    批量导入用户（管理员）
+
+    请求体为 NDJSON（每行一个对象）或带表头的 CSV，字段：
+    username, password, email, nickname, role, is_active。
+    已存在的用户名/邮箱会被跳过。
+
+    可先订阅 `/users/import/{job_id}/events` 再携带相同 job_id 发起导入以获取实时进度。
+
+    Returns:
+        BulkImportResult: 导入结果汇总
+    """
+    job = await import_jobs.get_or_create(job_id)
+    # 多进程模式下同一 job_id 可能已在其他 worker 上执行过
+    if job.status != "pending" or import_job_store.read(job.job_id) is not None:
+        raise ResourceAlreadyExistsError("导入任务", f"导入任务 {job.job_id} 已执行")
+
+    await import_users(request.stream(), fmt, job)
+    return job.snapshot()
+
+
+@router.get("/users/import/{job_id}/events")
+async def bulk_import_events(job_id: str, _admin_id: CurrentAdminId):
+    """
+    批量导入进度流 (SSE)
+
+    任务不存在时会预先创建，便于在发起导入前订阅；创建后一直未开始导入的任务
+    会在一段时间后过期，订阅随之关闭
+    """
+    job = await import_jobs.get_or_create(job_id)
+    return event_source_response(job.stream())
+
+
+@router.get("/users/import/{job_id}", response_model=BulkImportResult)
+async def bulk_import_status(job_id: str, _admin_id: CurrentAdminId):
+    """获取批量导入任务状态"""
+    job = import_jobs.get(job_id)
+    if job is None or job.status == "pending":
+        # 多进程模式下任务可能在其他 worker 上执行
+        snapshot = import_job_store.read(job_id)
+        if snapshot is not None:
+            return snapshot
+    if job is None:
+        raise ResourceNotFoundError("导入任务")
+    return job.snapshot()
+
+
+@router.get("/users/export")
+async def bulk_export_users(
+    _admin_id: CurrentAdminId,
+    fmt: Annotated[ExportFormat, Query(alias="format")] = "ndjson",
+    gzip: bool = False,
+):
+    """
+    流式导出用户（管理员）
+
+    不包含密码哈希，内存占用与用户总数无关；gzip=true 时在线压缩为 .gz 下载
+    """
+    return export_response(
+        stream_export(User, EXPORT_FIELDS, fmt, compress=gzip),
+        "users",
+        fmt,
+        compress=gzip,
+    )
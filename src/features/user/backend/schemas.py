@@ -2,7 +2,9 @@
 认证相关的Pydantic模型
 定义请求和响应的数据结构
 """
-from pydantic import BaseModel
+from typing import Any
+
+from pydantic import BaseModel, Field
 
 
 class LoginRequest(BaseModel):
@@ -32,3 +34,41 @@ class LoginResponse(BaseModel):
     token_type: str = "bearer"
     user: UserResponse
 
+
+
+class BulkImportRow(BaseModel):
+    """批量导入的单行数据"""
+
+    username: str = Field(min_length=1, max_length=50)
+    password: str = Field(min_length=1)
+    email: str | None = Field(default=None, max_length=100)
+    nickname: str | None = Field(default=None, max_length=50)
+    role: str = Field(default="user", max_length=20)
+    is_active: bool = True
+
+
+class BulkImportError(BaseModel):
+    """批量导入错误"""
+
+    line: int
+    message: str
+
+
+class BulkImportResult(BaseModel):
+    """批量导入结果 / 进度"""
+
+    job_id: str
+    status: str  # "pending" | "running" | "completed" | "failed"
+    processed: int
+    created: int
+    skipped: int
+    failed: int
+    errors: list[BulkImportError] = []
+    elapsed_seconds: float = 0
+
+
+class UserDirectoryPage(BaseModel):
+    """用户目录分页结果"""
+
+    items: list[dict[str, Any]]  # 仅包含 fields 指定的字段
+    next_cursor: str | None = None  # 为空表示没有下一页
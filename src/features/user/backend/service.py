@@ -0,0 +1,105 @@
+"""
+用户业务逻辑
+密码哈希 cost 统计与透明重哈希、管理员校验的角色读取
+"""
+
+import asyncio
+
+from tortoise import Tortoise
+
+from src.backend.core.dependencies import set_role_loader
+from src.backend.core.logger import logger
+from src.backend.core.metrics import metrics
+from src.backend.core.security import (
+    get_bcrypt_rounds,
+    get_hash_rounds,
+    get_password_hash,
+    needs_rehash,
+)
+
+from .cache import user_cache
+from .models import User
+
+password_cost_gauge = metrics.gauge(
+    "user_password_hash_cost",
+    "已存储密码哈希的 bcrypt cost 分布（按 cost 统计用户数）",
+)
+password_rehash_counter = metrics.counter(
+    "user_password_rehash_total",
+    "登录时透明重哈希的次数",
+)
+bcrypt_target_gauge = metrics.gauge(
+    "bcrypt_target_rounds",
+    "当前用于新哈希的 bcrypt cost",
+)
+
+
+async def refresh_password_cost_metrics() -> None:
+    """
+    从数据库重新统计密码哈希 cost 分布
+
+    bcrypt 哈希格式为 $2b$NN$...，cost 位于第 5-6 个字符，
+    直接在数据库中分组计数，避免把所有哈希加载到内存。
+    """
+    conn = Tortoise.get_connection("default")
+    table = User._meta.db_table  # noqa: SLF001
+    rows = await conn.execute_query_dict(
+        f'SELECT SUBSTR("hashed_password", 5, 2) AS "cost", COUNT(*) AS "total" '
+        f'FROM "{table}" GROUP BY SUBSTR("hashed_password", 5, 2)',
+    )
+
+    password_cost_gauge.clear()
+    for row in rows:
+        cost = str(row["cost"])
+        password_cost_gauge.inc(
+            row["total"],
+            cost=int(cost) if cost.isdigit() else "unknown",
+        )
+    bcrypt_target_gauge.set(get_bcrypt_rounds())
+
+
+def record_new_password_hash(hashed_password: str) -> None:
+    """新写入一个密码哈希时更新 cost 分布"""
+    password_cost_gauge.inc(cost=get_hash_rounds(hashed_password) or "unknown")
+
+
+async def rehash_password_if_needed(user: User, plain_password: str) -> bool:
+    """
+    登录成功后，若存储哈希的 cost 与当前目标不一致则透明重哈希
+
+    Args:
+        user: 已通过密码校验的用户
+        plain_password: 明文密码
+
+    Returns:
+        bool: 是否进行了重哈希
+    """
+    if not needs_rehash(user.hashed_password):
+        return False
+
+    old_cost = get_hash_rounds(user.hashed_password) or "unknown"
+    # bcrypt 计算耗时数百毫秒，放到线程中执行，避免登录时阻塞事件循环
+    user.hashed_password = await asyncio.to_thread(get_password_hash, plain_password)
+    await user.save(update_fields=["hashed_password"])
+
+    new_cost = get_hash_rounds(user.hashed_password) or "unknown"
+    password_cost_gauge.dec(cost=old_cost)
+    password_cost_gauge.inc(cost=new_cost)
+    password_rehash_counter.inc(from_cost=old_cost, to_cost=new_cost)
+
+    logger.info(
+        f"🔐 已重哈希用户密码: {user.username} (cost {old_cost} -> {new_cost})",
+    )
+    return True
+
+
+async def load_active_role(user_id: int) -> str | None:
+    """读取启用用户的角色，供管理员权限校验使用（与 /auth/me 共用缓存条目）"""
+    user = await user_cache.fetch(
+        User.filter(id=user_id, is_active=True).first(),
+        row=(User, user_id),
+    )
+    return user.role if user else None
+
+
+set_role_loader(load_active_role)
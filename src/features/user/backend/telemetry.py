@@ -0,0 +1,45 @@
+"""
+用户登录遥测
+登录审计与最后登录时间通过写回缓冲批量写入，不在登录请求中单独提交
+"""
+
+from fastapi import Request
+from tortoise import timezone
+
+from src.backend.core.write_behind import WriteBehindBuffer, write_behind
+
+from .models import LoginAudit, User
+
+login_audit_buffer = write_behind.register(WriteBehindBuffer("login_audit", LoginAudit))
+last_login_buffer = write_behind.register(WriteBehindBuffer("user_last_login", User))
+
+
+async def record_login(
+    request: Request,
+    username: str,
+    user: User | None,
+    success: bool,
+) -> None:
+    """
+    记录一次登录尝试
+
+    Args:
+        request: 当前请求（读取客户端 IP 与 UA）
+        username: 登录使用的用户名
+        user: 对应的用户，不存在时为 None
+        success: 是否登录成功
+    """
+    now = timezone.now()
+    await login_audit_buffer.add(
+        LoginAudit(
+            user_id=user.id if user else None,
+            username=username[:50],
+            success=success,
+            ip=request.client.host if request.client else None,
+            user_agent=(request.headers.get("user-agent") or "")[:255] or None,
+            created_at=now,
+        ),
+    )
+    if success and user:
+        user.last_login_at = now
+        await last_login_buffer.update(user.id, last_login_at=now)
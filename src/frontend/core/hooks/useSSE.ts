@@ -12,6 +12,16 @@ export interface LogEntry {
   line: number
 }
 
+// 服务器关闭前要求重连（reconnect 事件或 503 + Retry-After），不计入重试次数
+class ReconnectRequested extends Error {
+  delay?: number
+
+  constructor(delay?: number) {
+    super('Server requested reconnect')
+    this.delay = delay
+  }
+}
+
 interface UseSSEOptions {
   onMessage?: (data: LogEntry) => void
   onError?: (error: unknown) => void
@@ -24,6 +34,7 @@ export function useLogStream(url: string, options: UseSSEOptions = {}) {
   const [error, setError] = useState<Error | null>(null)
   const ctrlRef = useRef<AbortController | null>(null)
   const retryCountRef = useRef(0)
+  const reconnectRef = useRef(false)
 
   // 保持 options 引用最新，避免闭包陷阱
   const optionsRef = useRef(options)
@@ -59,6 +70,9 @@ export function useLogStream(url: string, options: UseSSEOptions = {}) {
           setIsConnected(true)
           setError(null)
           retryCountRef.current = 0 // 重置重试计数
+        } else if (response.status === 503 && response.headers.has('Retry-After')) {
+          // 服务器正在关闭，按 Retry-After 稍后重连
+          throw new ReconnectRequested(Number(response.headers.get('Retry-After')) * 1000)
         } else if (response.status >= 400 && response.status < 500 && response.status !== 429) {
           // 客户端错误（如 401, 403, 404），不再重试
           const body = await response.text().catch(() => 'Unknown error')
@@ -73,6 +87,11 @@ export function useLogStream(url: string, options: UseSSEOptions = {}) {
       },
 
       onmessage(msg) {
+        // 服务器即将关闭：随后连接会被关闭，按事件中的 retry 间隔重连
+        if (msg.event === 'reconnect') {
+          reconnectRef.current = true
+          return
+        }
         // 处理心跳或自定义事件
         if (msg.event === 'log') {
           try {
@@ -86,11 +105,20 @@ export function useLogStream(url: string, options: UseSSEOptions = {}) {
 
       onclose() {
         // 连接关闭（例如服务器关闭连接），这里不抛出错误，让它自然结束或重连
-        // 如果需要自动重连，可以抛出错误
+        // 服务器发送过 reconnect 事件时抛出错误以触发重连（间隔由事件中的 retry 字段设置）
         console.log('SSE Connection closed by server')
+        if (reconnectRef.current) {
+          reconnectRef.current = false
+          throw new ReconnectRequested()
+        }
       },
 
       onerror(err) {
+        if (err instanceof ReconnectRequested) {
+          setIsConnected(false)
+          // 返回 undefined 时使用服务器通过 retry 字段设置的间隔
+          return err.delay
+        }
         console.error('SSE error:', err)
         // 如果是致命错误（我们在 onopen 中抛出的），不再重试
         if (err instanceof Error && err.message.startsWith('Fatal')) {
@@ -8,3 +8,5 @@ export * from './time'
 // 流式处理工具
 export * from './stream'
 
+// 冷启动统计
+export * from './launch'
@@ -0,0 +1,23 @@
+import { config } from '../../config/env'
+
+/**
+ * 桌面启动器打开的页面（地址带 ?launch）上报首次绘制耗时，用于冷启动统计
+ *
+ * 上报后从地址中移除 ?launch，刷新页面不会重复上报
+ */
+export function reportLaunchPaint(): void {
+  if (!new URLSearchParams(window.location.search).has('launch')) return
+  if (typeof PerformanceObserver === 'undefined') return
+
+  const observer = new PerformanceObserver(list => {
+    const paint = list.getEntriesByName('first-contentful-paint')[0]
+    if (!paint) return
+    observer.disconnect()
+    const body = new Blob([JSON.stringify({ paint_ms: paint.startTime })], {
+      type: 'application/json',
+    })
+    navigator.sendBeacon(`${config.apiBaseUrl}/monitor/startup/paint`, body)
+    window.history.replaceState(null, '', window.location.pathname + window.location.hash)
+  })
+  observer.observe({ type: 'paint', buffered: true })
+}
@@ -6,9 +6,12 @@ import '@fontsource/inter/600.css'
 import '@fontsource/inter/700.css'
 import './assets/index.css'
 import App from './App.tsx'
+import { reportLaunchPaint } from './frontend/utils'
 
 createRoot(document.getElementById('root')!).render(
   <StrictMode>
     <App />
   </StrictMode>
 )
+
+reportLaunchPaint()